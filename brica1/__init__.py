@@ -10,13 +10,18 @@ A scalable, general purpose computing platform for cognitive architectures.
 
 """
 
-__all__ = ["component", "connection", "module", "port", "ros", "scheduler", "supervisor", "unit", "utils"]
+__all__ = ["arena", "component", "connection", "distributed", "module", "port", "profiler", "ros", "scheduler", "snapshot", "supervisor", "unit", "utils", "vectorized"]
 
+from .arena import *
 from .component import *
 from .connection import *
+from .distributed import *
 from .module import *
 from .port import *
+from .profiler import *
 from .scheduler import *
+from .snapshot import *
 from .supervisor import *
 from .unit import *
 from .utils import *
+from .vectorized import *
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+"""
+arena.py
+=====
+
+This module contains the `PortArena` which packs the fixed numeric ports of
+an agent into a few contiguous buffers, so connections between them are
+synced with vectorized gathers instead of per-port calls.
+
+"""
+
+__all__ = ["PortArena", "ArenaConnection"]
+
+import numpy
+
+# BriCA imports
+from .component import Component
+from .connection import Connection
+
+# Kinds of dtypes which can be packed: booleans, integers, floats, complex.
+NUMERIC_KINDS = 'biufc'
+
+
+def packable(port):
+    """ Check whether the buffer of a `Port` can be moved into an arena.
+
+    Args:
+      port (Port): a `Port` to check.
+
+    Returns:
+      bool: True if the port is fixed and owns a plain numeric array.
+
+    """
+
+    buffer = port.buffer
+
+    return (port.fixed and port.segment is None and
+            type(buffer) is numpy.ndarray and buffer.base is None and
+            buffer.dtype.kind in NUMERIC_KINDS)
+
+
+class ArenaConnection(Connection):
+    """
+    An `ArenaConnection` replaces a `Connection` between two ports packed in
+    a `PortArena`. Its `sync()` does nothing, as the data is copied by
+    `PortArena.sync()`.
+    """
+
+    __slots__ = ()
+
+    def sync(self):
+        """ Do nothing; the `PortArena` syncs the packed ports.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        pass
+
+
+class PortArena(object):
+    """
+    A `PortArena` packs fixed numeric ports into one contiguous buffer per
+    dtype and syncs all connections between them at once.
+
+    Only plain `Connection`s between fixed ports of the same shape and dtype
+    whose buffers own their data are packed. Both components must use the
+    default `input()` and `output()` and must not `fire_on_change`, as the
+    versions of packed in-ports are not updated by `sync()`. The buffer of
+    each packed port is replaced with a view of the arena, and the
+    connection with an `ArenaConnection`. Other connections are left as they
+    are.
+
+    Within a buffer the out-ports come first, followed by the in-ports in
+    the order of their connections, so `sync()` is a single gather (or a
+    slice copy) per dtype. `index` maps each packed `Port` to its offset.
+
+    In-ports get their own copy of the data instead of sharing the buffer of
+    the out-port, so `sync()` must be called before the input phase of every
+    step. The arena must be recreated after changing ports or connections.
+    """
+
+    def __init__(self, components):
+        """ Create a new `PortArena` instance and pack the ports.
+
+        Args:
+          components (list): `Component`s whose ports are packed.
+
+        Returns:
+          PortArena: a new `PortArena` instance.
+
+        """
+
+        super(PortArena, self).__init__()
+        self.ports = []
+        self.links = []
+        self.index = {}
+        self.groups = []
+
+        eligible = [component for component in components
+                    if type(component).input is Component.input and
+                    type(component).output is Component.output and
+                    not component.fire_on_change]
+
+        out_ports = set(id(out_port) for component in eligible
+                        for out_port in component.out_ports.values())
+
+        links = {}
+        targets = set()
+
+        for component in eligible:
+            for in_port in component.in_ports.values():
+                connection = in_port.connection
+
+                if type(connection) is not Connection:
+                    continue
+
+                from_port = connection.from_port
+
+                if (id(from_port) not in out_ports or
+                        id(from_port) in targets or id(in_port) in targets or
+                        not packable(from_port) or not packable(in_port) or
+                        from_port.shape != in_port.shape or
+                        from_port.dtype != in_port.dtype):
+                    continue
+
+                targets.add(id(in_port))
+                links.setdefault(from_port.dtype, []).append(
+                    ArenaConnection(from_port, in_port))
+
+        for dtype, group in links.items():
+            self.pack(dtype, group)
+
+        for connection in self.links:
+            connection.to_port.connection = connection
+
+    def pack(self, dtype, group):
+        """ Pack the ports of connections sharing a dtype into one buffer.
+
+        Args:
+          dtype (numpy.dtype): the dtype of all ports.
+          group (list): `ArenaConnection`s to pack.
+
+        Returns:
+          None.
+
+        """
+
+        index = self.index
+        ports = []
+        offset = 0
+
+        for connection in group:
+            from_port = connection.from_port
+            if from_port not in index:
+                index[from_port] = offset
+                ports.append(from_port)
+                offset += from_port.buffer.size
+
+        split = offset
+        sources = []
+
+        for connection in group:
+            start = index[connection.from_port]
+            size = connection.to_port.buffer.size
+            sources.append(numpy.arange(start, start + size))
+            index[connection.to_port] = offset
+            ports.append(connection.to_port)
+            offset += size
+
+        data = numpy.empty(offset, dtype=dtype)
+
+        for port in ports:
+            start = index[port]
+            view = data[start:start + port.buffer.size].reshape(port.shape)
+            numpy.copyto(view, port.buffer)
+            port.buffer = view
+
+        sources = numpy.concatenate(sources).astype(numpy.intp)
+
+        if numpy.array_equal(sources, numpy.arange(split)):
+            sources = slice(0, split)
+
+        self.groups.append((data[:split], sources, data[split:]))
+        self.ports.extend(ports)
+        self.links.extend(group)
+
+    def sync(self):
+        """ Copy the buffers of all packed out-ports to their in-ports.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        for sources, index, targets in self.groups:
+            if type(index) is slice:
+                targets[...] = sources
+            else:
+                numpy.take(sources, index, out=targets)
+
+    def release(self):
+        """ Give the packed ports private buffers and restore connections.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        for port in self.ports:
+            port.buffer = numpy.array(port.buffer)
+
+        for connection in self.links:
+            to_port = connection.to_port
+            if to_port.connection is connection:
+                to_port.connection = Connection(connection.from_port, to_port)
+
+        self.ports = []
+        self.links = []
+        self.index = {}
+        self.groups = []
@@ -10,6 +10,9 @@ to the respective `Port`s inside the `GymAgent`.
 
 """
 
+import multiprocessing
+import traceback
+
 import numpy as np
 try:
     import gym
@@ -17,7 +20,78 @@ except ModuleNotFoundError:
     import gymnasium as gym
 import brica1
 
-__all__ = ['EnvComponent', 'GymAgent']
+__all__ = [
+    'EnvComponent', 'GymAgent', 'VecEnvComponent', 'VecGymAgent',
+    'LockstepEnvComponent', 'LockstepGymAgent', 'EpisodeRunner'
+]
+
+
+def reset_env(env):
+    """Reset an env and return the observation for both reset() APIs."""
+    result = env.reset()
+    if len(result) == 2 and type(result[1]) is dict:
+        return result[0]
+    return result
+
+
+def step_env(env, action):
+    """Step an env and return (observation, reward, terminated, truncated,
+    info) for both step() APIs."""
+    result = env.step(action)
+    if len(result) > 4:
+        return result
+    observation, reward, done, info = result
+    return observation, reward, done, False, info
+
+
+def to_action(env, action, action_dim):
+    """Convert an action port value to an action of the env.
+
+    Discrete actions are converted to int, as action ports may be float and
+    Discrete.contains() rejects float actions.
+    """
+    if isinstance(env.action_space, gym.spaces.Box) or action_dim > 1:
+        return action
+    if action.size == 1:
+        return int(action.flat[0])
+    # one-hot vector to int
+    if action.max() == 0.0:
+        return 0
+    return int(np.argmax(action)) + 1
+
+
+def step_auto_reset(env, action, action_dim):
+    """Step an env and reset it when the episode ends.
+
+    The observation of the last step is kept in info['final_observation'].
+    """
+    observation, reward, terminated, truncated, info = step_env(
+        env, to_action(env, action, action_dim))
+    done = terminated or truncated
+    if done:
+        info = dict(info or {}, final_observation=observation)
+        observation = reset_env(env)
+    return observation, reward, done, info
+
+
+def run_env_worker(pipe, env_fn, action_dim):
+    """Serve the commands of a VecEnvComponent in a worker process."""
+    env = env_fn()
+    while True:
+        command, action = pipe.recv()
+        try:
+            if command == 'step':
+                result = step_auto_reset(env, action, action_dim)
+            elif command == 'reset':
+                result = reset_env(env)
+            else:
+                break
+        except Exception:
+            pipe.send((False, traceback.format_exc()))
+        else:
+            pipe.send((True, result))
+    env.close()
+    pipe.close()
 
 
 class EnvComponent(brica1.Component):
@@ -38,11 +112,7 @@ class EnvComponent(brica1.Component):
         self.flush = False
         self.action_dim = action_dim
 
-        result = env.reset()
-        if  len(result) ==2 and type(result[1]) is dict:
-            self.results['observation'] = result[0]
-        else:
-            self.results['observation'] = result
+        self.results['observation'] = reset_env(env)
         self.results['token_out'] = np.array([self.cnt])
         self.results['done'] = np.array([0])
         self.results['reward'] = np.array([0.0])
@@ -52,21 +122,10 @@ class EnvComponent(brica1.Component):
             return
         if self.inputs['token_in'][0] == self.cnt:
             if self.cnt != 0:
-                if isinstance(self.env.action_space, gym.spaces.Box) or self.action_dim > 1:
-                    action = self.inputs['action']
-                else:
-                    if self.inputs['action'].size == 1:
-                        action = self.inputs['action'][0]
-                    else:   # one-hot vector to int
-                        if self.inputs['action'].max() == 0.0:
-                            action = 0
-                        else:
-                            action = np.argmax(self.inputs['action']) + 1
-                result = self.env.step(action)
-                if len(result) > 4:
-                    observation, reward, done, truncated, info = result
-                else:
-                    observation, reward, done, info = result
+                action = to_action(self.env, self.inputs['action'],
+                                   self.action_dim)
+                observation, reward, done, truncated, info = step_env(
+                    self.env, action)
                 self.info = info
                 self.results['observation'] = observation
                 self.results['reward'] = np.array([reward])
@@ -82,11 +141,7 @@ class EnvComponent(brica1.Component):
         self.cnt = 0
         self.flush = False
         self.done = False
-        result = self.env.reset()
-        if  len(result) ==2 and type(result[1]) is dict:
-            self.results['observation'] = result[0]
-        else:
-            self.results['observation'] = result
+        self.results['observation'] = reset_env(self.env)
         self.results['done'] = np.array([0])
         self.results['reward'] = np.array([0.0])
         self.results['token_out'] = np.array([0])
@@ -126,6 +181,260 @@ class GymAgent(brica1.Agent):
         brica1.utils.connect((self, 'token_out'), (self.env, 'token_in'))
 
 
+class VecEnvComponent(brica1.Component):
+    """Steps K envs once per fire() with batched arrays.
+
+    `env_fns` are callables creating the envs. With `processes=True` each
+    env runs in a forked worker process and the envs are stepped in
+    parallel. The 'action' in-port takes a (K, action_dim) array, and the
+    'observation', 'reward', and 'done' out-ports hold (K, ...) arrays. Envs
+    are reset automatically when an episode ends; `infos` holds the info of
+    the last step of each env.
+    """
+
+    def __init__(self, env_fns, action_dim=1, processes=False):
+        super(VecEnvComponent, self).__init__()
+
+        self.num_envs = len(env_fns)
+        self.action_dim = action_dim
+        self.envs = []
+        self.pipes = []
+        self.workers = []
+
+        if processes:
+            context = multiprocessing.get_context('fork')
+            for env_fn in env_fns:
+                pipe, child = context.Pipe()
+                worker = context.Process(target=run_env_worker,
+                                         args=(child, env_fn, action_dim))
+                worker.daemon = True
+                worker.start()
+                child.close()
+                self.pipes.append(pipe)
+                self.workers.append(worker)
+        else:
+            self.envs = [env_fn() for env_fn in env_fns]
+
+        observation = np.stack(self.call('reset', [None] * self.num_envs))
+        self.infos = [None] * self.num_envs
+
+        self.make_in_port('action', shape=(self.num_envs, action_dim),
+                          dtype=np.float32)
+        self.make_out_port('observation', shape=observation.shape,
+                           dtype=observation.dtype)
+        self.make_out_port('reward', self.num_envs, dtype=np.float64)
+        self.make_out_port('done', self.num_envs, dtype=np.short)
+
+        self.get_out_port('observation').buffer = observation
+        self.get_result_buffer('observation', observation.shape,
+                               observation.dtype)[...] = observation
+
+    def call(self, command, actions):
+        """Run 'step' or 'reset' on every env and return the results."""
+        if not self.pipes:
+            if command == 'reset':
+                return [reset_env(env) for env in self.envs]
+            return [step_auto_reset(env, action, self.action_dim)
+                    for env, action in zip(self.envs, actions)]
+
+        for pipe, action in zip(self.pipes, actions):
+            pipe.send((command, action))
+
+        results = []
+        for pipe in self.pipes:
+            ok, result = pipe.recv()
+            if not ok:
+                raise RuntimeError("An env worker failed:\n" + result)
+            results.append(result)
+        return results
+
+    def fire(self):
+        observation = self.results['observation']
+        reward = self.get_result_buffer('reward', self.num_envs, np.float64)
+        done = self.get_result_buffer('done', self.num_envs, np.short)
+
+        results = self.call('step', list(self.inputs['action']))
+
+        for i, (obs, rew, end, info) in enumerate(results):
+            observation[i] = obs
+            reward[i] = rew
+            done[i] = end
+            self.infos[i] = info
+
+    def reset(self):
+        super(VecEnvComponent, self).reset()
+        observation = self.results['observation']
+        observation[...] = np.stack(self.call('reset',
+                                              [None] * self.num_envs))
+        self.get_result_buffer('reward', self.num_envs, np.float64)[...] = 0
+        self.get_result_buffer('done', self.num_envs, np.short)[...] = 0
+        self.get_out_port('observation').update(observation)
+        self.infos = [None] * self.num_envs
+
+    def close(self):
+        for pipe in self.pipes:
+            pipe.send(('close', None))
+            pipe.close()
+        for worker in self.workers:
+            worker.join()
+        for env in self.envs:
+            env.close()
+        self.pipes = []
+        self.workers = []
+        self.envs = []
+
+
+class VecGymAgent(brica1.Agent):
+    """Connects a batched model to a VecEnvComponent without tokens.
+
+    The model gets (K, ...) 'observation', 'reward', and 'done' arrays and
+    outputs a (K, action_dim) 'action' array. The env-to-model connections
+    are delay edges, so with a `TopologicalSyncScheduler` every scheduler
+    step is one step of all envs.
+    """
+
+    def __init__(self, model, env_fns, action_dim=1, processes=False):
+        super(VecGymAgent, self).__init__()
+
+        self.env = VecEnvComponent(env_fns, action_dim, processes)
+        self.add_component('env', self.env)
+
+        if isinstance(model, brica1.Component):
+            self.add_component('model', model)
+        if isinstance(model, brica1.Module):
+            self.add_submodule('model', model)
+
+        for id in ('observation', 'reward', 'done'):
+            self.make_in_port(id, 1)
+            brica1.utils.alias_in_port((model, id), (self, id))
+            brica1.utils.connect((self.env, id), (self, id), delay=True)
+
+        self.make_out_port('action', action_dim)
+        brica1.utils.alias_out_port((model, 'action'), (self, 'action'))
+        brica1.utils.connect((self, 'action'), (self.env, 'action'))
+
+    def close(self):
+        self.env.close()
+
+
+class LockstepEnvComponent(brica1.Component):
+    """Steps an env on every fire() without the token protocol.
+
+    `done` is set when the episode terminates or is truncated; the env is
+    not reset automatically.
+    """
+
+    def __init__(self, env, obs_dim=1, action_dim=1):
+        super(LockstepEnvComponent, self).__init__()
+
+        self.env = env
+        self.action_dim = action_dim
+
+        self.make_in_port('action', action_dim)
+        self.make_out_port('observation', obs_dim)
+        self.make_out_port('reward', 1, dtype=np.float64)
+        self.make_out_port('done', 1)
+
+        self.reset()
+
+    def fire(self):
+        action = to_action(self.env, self.inputs['action'], self.action_dim)
+        observation, reward, terminated, truncated, info = step_env(
+            self.env, action)
+        self.info = info
+        self.done = int(terminated or truncated)
+        self.results['observation'] = observation
+        self.get_result_buffer('reward', 1, np.float64)[0] = reward
+        self.get_result_buffer('done', 1, np.short)[0] = self.done
+
+    def reset(self):
+        super(LockstepEnvComponent, self).reset()
+        self.done = 0
+        self.info = None
+
+        observation = reset_env(self.env)
+        self.results['observation'] = observation
+        self.get_out_port('observation').buffer = observation
+
+        for id, dtype in (('reward', np.float64), ('done', np.short)):
+            buffer = self.get_result_buffer(id, 1, dtype)
+            buffer[...] = 0
+            self.get_out_port(id).update(buffer)
+
+
+class LockstepGymAgent(brica1.Agent):
+    """A GymAgent without tokens, stepping the env once per scheduler step.
+
+    The env-to-model connections are delay edges, so a
+    `TopologicalSyncScheduler` fires the model and then the env on every
+    step (see `EpisodeRunner`).
+    """
+
+    def __init__(self, model, env, obs_dim=1, action_dim=1):
+        super(LockstepGymAgent, self).__init__()
+
+        self.env = LockstepEnvComponent(env, obs_dim, action_dim)
+        self.add_component('env', self.env)
+
+        if isinstance(model, brica1.Component):
+            self.add_component('model', model)
+        if isinstance(model, brica1.Module):
+            self.add_submodule('model', model)
+
+        self.make_in_port('observation', obs_dim)
+        self.make_in_port('reward', 1)
+        self.make_in_port('done', 1)
+        self.make_out_port('action', action_dim)
+
+        for id in ('observation', 'reward', 'done'):
+            brica1.utils.alias_in_port((model, id), (self, id))
+            brica1.utils.connect((self.env, id), (self, id), delay=True)
+
+        brica1.utils.alias_out_port((model, 'action'), (self, 'action'))
+        brica1.utils.connect((self, 'action'), (self.env, 'action'))
+
+
+class EpisodeRunner(object):
+    """Runs episodes of a LockstepGymAgent and records the trajectories."""
+
+    def __init__(self, agent, max_steps=None):
+        self.agent = agent
+        self.max_steps = max_steps
+        self.scheduler = brica1.TopologicalSyncScheduler(agent)
+        self.scheduler.update()
+
+    def run_episode(self):
+        """Run an episode and return a dict of arrays stacked over steps.
+
+        'observation' holds the observations the actions were chosen from,
+        followed by 'action', 'reward', and 'done' of each step.
+        """
+        env = self.agent.env
+        env.reset()
+
+        observations, actions, rewards, dones = [], [], [], []
+
+        while not env.done and (self.max_steps is None or
+                                len(rewards) < self.max_steps):
+            observations.append(np.array(env.get_out_port('observation')
+                                         .buffer))
+            self.scheduler.step()
+            actions.append(env.inputs['action'])
+            rewards.append(env.results['reward'][0])
+            dones.append(env.done)
+
+        return {
+            'observation': np.stack(observations),
+            'action': np.stack(actions),
+            'reward': np.array(rewards),
+            'done': np.array(dones, dtype=bool),
+        }
+
+    def run(self, n_episodes):
+        """Run `n_episodes` episodes and return a list of trajectories."""
+        return [self.run_episode() for _ in range(n_episodes)]
+
+
 class ComponentCaller(type):
     def __new__(mcs, name, base, attr):
         # suppress Component.fire()
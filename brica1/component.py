@@ -11,25 +11,104 @@ are collectively reffered to as `Unit`s.
 """
 
 __all__ = [
-    "Component", "ComponentSet", "ConstantComponent", "PipeComponent",
-    "NullComponent"
+    "Component", "AsyncComponent", "ComponentSet", "ConstantComponent",
+    "PipeComponent", "NullComponent"
 ]
 
 from abc import ABCMeta, abstractmethod
 from copy import deepcopy
+from itertools import chain
+
+import numpy
 
 # BriCA imports
+from .port import DELIVERY_COPY, DELIVERY_VIEW
 from .unit import Unit
 
 
+class Results(dict):
+    """
+    `Results` is the dict of results of a `Component` which remembers the IDs
+    assigned since the last `Component.output()` in `assigned`.
+
+    Every method adding or replacing an entry (item assignment, `update()`,
+    `setdefault()` of a missing ID, and `|=`) marks the ID as assigned, and
+    removing an entry unmarks it. Mutating a value in place does not.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """ Create a new `Results` instance with all entries assigned.
+
+        Args:
+          Same as `dict`.
+
+        Returns:
+          Results: a new `Results` instance.
+
+        """
+
+        super(Results, self).__init__(*args, **kwargs)
+        self.assigned = set(self)
+
+    def __setitem__(self, identifier, value):
+        dict.__setitem__(self, identifier, value)
+        self.assigned.add(identifier)
+
+    def __delitem__(self, identifier):
+        dict.__delitem__(self, identifier)
+        self.assigned.discard(identifier)
+
+    def update(self, *args, **kwargs):
+        for identifier, value in dict(*args, **kwargs).items():
+            self[identifier] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def setdefault(self, identifier, default=None):
+        if identifier not in self:
+            self[identifier] = default
+        return dict.__getitem__(self, identifier)
+
+    def pop(self, identifier, *args):
+        self.assigned.discard(identifier)
+        return dict.pop(self, identifier, *args)
+
+    def popitem(self):
+        item = dict.popitem(self)
+        self.assigned.discard(item[0])
+        return item
+
+    def clear(self):
+        dict.clear(self)
+        self.assigned.clear()
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),), self.__dict__)
+
+
 class Component(Unit):
     """
     `Component` is an abstract class for implementation units. Subclasses must
     override the `fire()` method to specify its implementation. See the sample
     implementations, `ConstantComponent`, `NullComponent`, and `PipeComponent`
     for reference.
+
+    When `fire_on_change` is set, schedulers only call `train()` and `fire()`
+    on steps where the `version` of an in-port has changed (and on the first
+    step), and `output()` leaves the out-ports untouched on other steps.
+
+    `output()` writes every result on every step, except for components
+    which set `track_results`. Their `results` are a `Results` dict, and only
+    results assigned since the last call and results obtained from
+    `get_result_buffer()` are written. A result which is mutated in place
+    without being assigned again is then not written, so its out-port keeps
+    its `version` and components which `fire_on_change` are not fired.
     """
 
+    track_results = False
+
     __metaclass__ = ABCMeta
 
     def __init__(self):
@@ -51,7 +130,11 @@ class Component(Unit):
         self.sleep = 0
         self.inputs = {}
         self.states = {}
-        self.results = {}
+        self.results = Results() if self.track_results else {}
+        self.inplace_results = set()
+        self.fire_on_change = False
+        self.inputs_changed = True
+        self.input_versions = None
 
     @abstractmethod
     def fire(self):
@@ -92,19 +175,21 @@ class Component(Unit):
 
         pass
 
-    def set_state(self, identifier, value):
+    def set_state(self, identifier, value, move=False):
         """ Set a state value for the given ID.
 
         Args:
           identifier (str): a string ID.
-          vvalue (any): a state value to set.
+          value (any): a state value to set.
+          move (bool): take ownership of `value` instead of copying it. The
+            caller must not mutate `value` afterwards.
 
         Returns:
           None.
 
         """
 
-        self.states[identifier] = deepcopy(value)
+        self.states[identifier] = value if move else deepcopy(value)
 
     def get_state(self, identifier):
         """ Get a state value for the given ID.
@@ -132,19 +217,99 @@ class Component(Unit):
 
         del self.states[identifier]
 
-    def set_result(self, identifier, value):
+    def set_result(self, identifier, value, move=False):
         """ Set a result value for the given ID.
 
         Args:
           identifier (str): a string ID.
           value (any): a result value to set.
+          move (bool): take ownership of `value` instead of copying it. The
+            caller must not mutate `value` afterwards.
+
+        Returns:
+          None.
+
+        """
+
+        self.inplace_results.discard(identifier)
+        self.results[identifier] = value if move else deepcopy(value)
+
+    def publish(self, identifier, value):
+        """ Publish a result value for the given ID without copying it.
+
+        The ownership of `value` is transferred to this `Component` and
+        eventually to the out-port, so the caller must not mutate `value`
+        afterwards.
+
+        Args:
+          identifier (str): a string ID.
+          value (any): a result value to publish.
+
+        Returns:
+          None.
+
+        """
+
+        self.set_result(identifier, value, move=True)
+
+    def get_result_buffer(self, identifier, shape, dtype):
+        """ Get a preallocated result buffer for the given ID.
+
+        The buffer is allocated on the first call (or when `shape` or `dtype`
+        changes) and reused afterwards, so it may be written in place, e.g.
+        with the `out` argument of NumPy functions. Results written in place
+        are copied into the out-port buffer by `output()` instead of being
+        handed over, so the buffer is never shared with other components.
+
+        Args:
+          identifier (str): a string ID.
+          shape (tuple): a shape of the buffer.
+          dtype (numpy.dtype): a data type of the buffer.
+
+        Returns:
+          numpy.ndarray: a result buffer for the given ID.
+
+        """
+
+        try:
+            shape = tuple(shape)
+        except TypeError:
+            shape = (shape,)
+
+        results = self.results
+        buffer = results.get(identifier)
+
+        if (identifier not in self.inplace_results or
+                not isinstance(buffer, numpy.ndarray) or
+                buffer.shape != shape or buffer.dtype != numpy.dtype(dtype)):
+            buffer = numpy.zeros(shape, dtype=dtype)
+            results[identifier] = buffer
+            self.inplace_results.add(identifier)
+            if type(results) is Results:
+                # In-place results are written by `output()` on every step.
+                results.assigned.discard(identifier)
+
+        return buffer
+
+    def update_result(self, identifier, value):
+        """ Update a result value for the given ID in place.
+
+        `value` is copied into the preallocated result buffer when it has the
+        same shape and dtype, so no memory is allocated. Otherwise a new
+        result buffer is allocated. See `get_result_buffer()`.
+
+        Args:
+          identifier (str): a string ID.
+          value (numpy.ndarray): a result value to copy from.
 
         Returns:
           None.
 
         """
 
-        self.results[identifier] = deepcopy(value)
+        value = numpy.asarray(value)
+        buffer = self.get_result_buffer(identifier, value.shape, value.dtype)
+        numpy.copyto(buffer, value)
 
     def get_result(self, identifier):
         """ Get a result value for the given ID.
@@ -170,13 +335,145 @@ class Component(Unit):
 
         """
 
+        self.inplace_results.discard(identifier)
         del self.results[identifier]
 
+    def get_input(self, identifier):
+        """ Get an input value for the given ID.
+
+        Args:
+          identifier (str): a string ID.
+
+        Returns:
+          any: an input value for the given ID.
+
+        """
+
+        return self.inputs[identifier]
+
+    def get_mutable_input(self, identifier):
+        """ Get a writable input value for the given ID.
+
+        Inputs delivered as read-only views (see `Port`) are copied on the
+        first call and the copy replaces the view in `inputs`, so the buffer
+        of the in-port is never mutated.
+
+        Args:
+          identifier (str): a string ID.
+
+        Returns:
+          any: a writable input value for the given ID.
+
+        """
+
+        value = self.inputs[identifier]
+
+        if isinstance(value, numpy.ndarray) and not value.flags.writeable:
+            value = value.copy()
+            self.inputs[identifier] = value
+
+        return value
+
+    def is_ready(self):
+        """ Check whether `fire()` should be called on this step.
+
+        Args:
+          None.
+
+        Returns:
+          bool: False if `fire_on_change` is set and no input has changed.
+
+        """
+
+        return self.inputs_changed or not self.fire_on_change
+
+    def deliver_inputs(self, in_ports=None):
+        """ Store the buffers of the in-ports in `inputs`.
+
+        `inputs_changed` is set if the version of any in-port changed since
+        the last call. Read-only views of unchanged buffers are kept as they
+        are, and nothing is delivered when the component is not ready.
+
+        Args:
+          in_ports (dict): the in-ports to deliver, defaults to `in_ports`.
+
+        Returns:
+          None.
+
+        """
+
+        versions = self.input_versions
+        changed = versions is None
+
+        if changed:
+            versions = self.input_versions = {}
+
+        if in_ports is None:
+            in_ports = self.in_ports
+
+        if not changed and self.fire_on_change:
+            for identifier, in_port in in_ports.items():
+                if versions.get(identifier) != in_port.version:
+                    break
+            else:
+                self.inputs_changed = False
+                return
+
+        inputs = self.inputs
+
+        for identifier, in_port in in_ports.items():
+            version = in_port.version
+
+            if versions.get(identifier) != version:
+                versions[identifier] = version
+                changed = True
+            elif in_port.delivery != DELIVERY_COPY and identifier in inputs:
+                value = inputs[identifier]
+                if isinstance(value, numpy.ndarray):
+                    if not value.flags.writeable:
+                        continue
+                elif in_port.delivery == DELIVERY_VIEW:
+                    continue
+
+            previous = inputs.get(identifier)
+
+            if in_port.fixed and self.holds(previous):
+                previous = None
+
+            inputs[identifier] = in_port.deliver(previous)
+
+        self.inputs_changed = changed
+
+    def holds(self, value):
+        """ Check whether `results` or `states` hold an array.
+
+        Fixed in-ports with `DELIVERY_COPY` copy into the array delivered on
+        the previous step, unless this method returns True for it.
+
+        Args:
+          value (any): a value to check.
+
+        Returns:
+          bool: True if `value` or a view of it is in `results` or `states`.
+
+        """
+
+        if not isinstance(value, numpy.ndarray):
+            return False
+
+        for held in chain(self.results.values(), self.states.values()):
+            if held is value or getattr(held, 'base', None) is value:
+                return True
+
+        return False
+
     def input(self, time):
         """ Obtain inputs from outputs of other Modules.
 
         This method collects the outputs of connected modules and sets the
-        values to the in-ports. It is usually called by the scheduler.
+        values to the in-ports. The buffers are stored in `inputs` according
+        to the delivery policy of each in-port. It is usually called by the
+        scheduler.
 
         Args:
           time (int): the scheduler's current time.
@@ -186,10 +483,12 @@ class Component(Unit):
 
         """
 
-        for identifier, in_port in self.in_ports.items():
+        for in_port in self.in_ports.values():
             in_port.sync()
-            in_port.invoke_callbacks()
-            self.inputs[identifier] = deepcopy(in_port.buffer)
+            if in_port.callbacks:
+                in_port.invoke_callbacks()
+
+        self.deliver_inputs()
 
         assert self.last_input_time <= time, ("collect_input() captured a time"
                                               " travel")
@@ -209,15 +508,61 @@ class Component(Unit):
 
         """
 
-        for identifier, out_port in self.out_ports.items():
-            if identifier in self.results:
-                out_port.buffer = self.results[identifier]
+        if self.is_ready():
+            tracked = self.track_results
+
+            if tracked:
+                results = self.assigned_results()
+                assigned = results.assigned
+            else:
+                results = self.results
+                assigned = ()
+
+            inplace_results = self.inplace_results
+
+            for identifier, out_port in self.out_ports.items():
+                if identifier not in results:
+                    continue
+                if identifier in assigned:
+                    inplace_results.discard(identifier)
+                    out_port.write(results[identifier])
+                elif identifier in inplace_results:
+                    out_port.update(results[identifier])
+                elif tracked:
+                    continue
+                else:
+                    out_port.write(results[identifier])
                 out_port.invoke_callbacks()
 
+            if tracked:
+                assigned.clear()
+
         assert self.last_output_time <= time, ("update_output() captured a"
                                                " time travel")
         self.last_output_time = time
 
+    def assigned_results(self):
+        """ Get `results`, as a `Results` instance if `track_results` is set.
+
+        A plain dict assigned to `results` of a component which sets
+        `track_results` is converted with all entries assigned, so it is
+        written as a whole by `output()`.
+
+        Args:
+          None.
+
+        Returns:
+          dict: the results of this `Component`.
+
+        """
+
+        results = self.results
+
+        if self.track_results and type(results) is not Results:
+            results = self.results = Results(results)
+
+        return results
+
     def reset(self):
         """ Reset the component state
 
@@ -235,6 +580,34 @@ class Component(Unit):
         self.last_output_time = 0
         self.offset = 0
         self.interval = 1000
+        self.inputs_changed = True
+        self.input_versions = None
+
+
+class AsyncComponent(Component):
+    """
+    `AsyncComponent` is an abstract class for implementation units whose
+    `fire()` is a coroutine. Subclasses must override `fire()` with an
+    `async def` method following the same contract as `Component.fire()`.
+
+    `AsyncComponent`s must be scheduled by `AsyncScheduler`, which awaits
+    the `fire()` of all components of a step concurrently. Other schedulers
+    and `ComponentSet` reject them with a `TypeError`.
+    """
+
+    @abstractmethod
+    async def fire(self):
+        """ Perform a calculation asynchronously.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        pass
 
 
 class FunctorComponent(Component):
@@ -259,6 +632,9 @@ class FunctorComponent(Component):
         self.use_state = use_state
 
     def fire(self):
+        # The returned results replace any buffers written in place.
+        self.inplace_results.clear()
+
         if self.use_state:
             self.results, self.states = self.function(self.inputs, self.states)
         else:
@@ -296,8 +672,15 @@ class ComponentSet(Component):
         Returns:
           None.
 
+        Raises:
+          TypeError: if `component` is an `AsyncComponent`.
+
         """
 
+        if isinstance(component, AsyncComponent):
+            raise TypeError("A ComponentSet cannot fire the AsyncComponent"
+                            " {!r}".format(component))
+
         self.components[identifier] = component
         self.priorities[identifier] = priority
 
@@ -331,7 +714,8 @@ class ComponentSet(Component):
         for identifier in order:
             component = self.components[identifier]
             component.input(self.last_input_time)
-            component.fire()
+            if component.is_ready():
+                component.fire()
             component.output(self.last_output_time)
 
 
@@ -339,9 +723,13 @@ class ConstantComponent(Component):
     """
     `ConstantComponent` copies states to out ports.
 
-    Use `set_state` to define the output of this Module.
+    Use `set_state` to define the output of this Module. It sets
+    `track_results`, so a state is written to the out-port again only after
+    it is set with `set_state` or replaced in `states`.
     """
 
+    track_results = True
+
     def __init__(self):
         """ Create a new `ConstantComponent` instance.
 
@@ -355,6 +743,23 @@ class ConstantComponent(Component):
 
         super(ConstantComponent, self).__init__()
 
+    def set_state(self, identifier, value, move=False):
+        """ Set a state value for the given ID to output on the next step.
+
+        Args:
+          identifier (str): a string ID.
+          value (any): a state value to set.
+          move (bool): take ownership of `value` instead of copying it. The
+            caller must not mutate `value` afterwards.
+
+        Returns:
+          None.
+
+        """
+
+        super(ConstantComponent, self).set_state(identifier, value, move)
+        self.results[identifier] = self.states[identifier]
+
     def fire(self):
         """ Copy state contents to results.
 
@@ -366,8 +771,9 @@ class ConstantComponent(Component):
 
         """
 
-        for identifier in self.states.keys():
-            self.results[identifier] = self.states[identifier]
+        for identifier, value in self.states.items():
+            if self.results.get(identifier) is not value:
+                self.results[identifier] = value
 
 
 class PipeComponent(Component):
@@ -8,12 +8,40 @@ This module contains the class `Connection`.
 
 """
 
+__all__ = [
+    "Connection", "DelayedConnection", "BroadcastConnection",
+    "FanInConnection"
+]
+
+from copy import deepcopy
+
+import numpy
+
+# Reductions merging the sources of a `FanInConnection`.
+REDUCTIONS = ('sum', 'mean', 'max', 'concatenate', 'stack')
+
 
 class Connection(object):
     """
     A `Connection` connects two `Port`s and can be `sync`ed in one direction.
+
+    The `version` of `from_port` at the last sync is remembered, so syncing
+    an unchanged port does nothing. `to_port` takes over the version of the
+    value it receives, and shares it unless it is fixed (see
+    `Port.receive()`).
+
+    A `shared` connection delivers a value which is shared with other
+    connections and must not be copied by `Port.deliver()`. A `private`
+    connection delivers a value which is stored by ports only, and which
+    `Port.deliver()` may therefore hand out as a view.
+
+    Connections are slotted, as large agents create one per in-port.
     """
 
+    __slots__ = ('from_port', 'to_port', 'version')
+
+    shared = False
+
     def __init__(self, from_port, to_port):
         """ Create a Connection instance.
 
@@ -29,6 +57,19 @@ class Connection(object):
         super(Connection, self).__init__()
         self.from_port = from_port
         self.to_port = to_port
+        self.version = None
+
+    @property
+    def from_ports(self):
+        """ The list of `Port`s this `Connection` syncs from. """
+
+        return [self.from_port]
+
+    @property
+    def private(self):
+        """ Whether the synced value is stored by ports only. """
+
+        return self.from_port.fixed
 
     def sync(self):
         """ Sync the value from `from_port` to `to_port`.
@@ -41,4 +82,285 @@ class Connection(object):
 
         """
 
-        self.to_port.buffer = self.from_port.buffer
+        from_port = self.from_port
+
+        if from_port.version != self.version:
+            self.version = from_port.version
+            self.to_port.receive(from_port.buffer, self.version)
+
+
+class DelayedConnection(Connection):
+    """
+    A `DelayedConnection` is a `Connection` which may be latched to deliver
+    the value of `from_port` at the time of latching.
+
+    Schedulers which fire components in dependency order within a single step
+    latch delayed connections at the beginning of the step and release them
+    at the end, so the connection delivers the value of the previous step and
+    may close a cycle. When not latched it behaves like a `Connection`.
+    """
+
+    __slots__ = ('latched', 'value', 'latched_version')
+
+    def __init__(self, from_port, to_port):
+        """ Create a DelayedConnection instance.
+
+        Args:
+          from_port (Port): a `Port` to sync from.
+          to_port (Port): a `Port` to sync to.
+
+        Returns:
+          DelayedConnection: a new DelayedConnection instance.
+        """
+
+        super(DelayedConnection, self).__init__(from_port, to_port)
+        self.latched = False
+        self.value = None
+        self.latched_version = None
+
+    def latch(self):
+        """ Hold a copy of the current value of `from_port`.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        self.value = deepcopy(self.from_port.buffer)
+        self.latched_version = self.from_port.version
+        self.latched = True
+
+    def release(self):
+        """ Stop holding the latched value.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        self.value = None
+        self.latched_version = None
+        self.latched = False
+
+    @property
+    def private(self):
+        """ Whether the synced value is stored by ports only. """
+
+        return self.latched or self.from_port.fixed
+
+    def sync(self):
+        """ Sync the latched value, or the value of `from_port`, to `to_port`.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        if self.latched:
+            version, value = self.latched_version, self.value
+        else:
+            version, value = self.from_port.version, self.from_port.buffer
+
+        to_port = self.to_port
+
+        # The latched copy and the live buffer share a version, so switching
+        # between them does not count as a change. A fixed `to_port` holds a
+        # copy, which is the same for both.
+        if version != self.version or (not to_port.fixed and
+                                       to_port.buffer is not value):
+            self.version = version
+            to_port.receive(value, version)
+
+
+class BroadcastConnection(Connection):
+    """
+    A `BroadcastConnection` delivers a frozen snapshot of `from_port` (see
+    `Port.freeze()`) which is shared by all connections from the same port.
+
+    The snapshot is taken once per version of `from_port`, so fanning out a
+    large array to many in-ports costs a single copy. `numpy.ndarray`
+    snapshots are read-only and are handed to `Component.inputs` without
+    further copies regardless of the delivery policy of the in-port. Fixed
+    in-ports copy the snapshot into their own buffer instead (see
+    `Port.receive()`).
+    """
+
+    __slots__ = ()
+
+    shared = True
+
+    private = True
+
+    def sync(self):
+        """ Sync the snapshot of `from_port` to `to_port`.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        from_port = self.from_port
+
+        if from_port.version != self.version:
+            self.version = from_port.version
+            self.to_port.receive(from_port.freeze(), self.version)
+
+
+def reuse(array, shape, dtype):
+    """ Reuse an array if it has the given shape and dtype.
+
+    Args:
+      array (numpy.ndarray): an array to reuse, or None.
+      shape (tuple): a required shape.
+      dtype (numpy.dtype): a required data type.
+
+    Returns:
+      numpy.ndarray: `array`, or a new uninitialized array.
+
+    """
+
+    if array is None or array.shape != shape or array.dtype != dtype:
+        array = numpy.empty(shape, dtype=dtype)
+
+    return array
+
+
+class FanInConnection(Connection):
+    """
+    A `FanInConnection` merges the buffers of several `Port`s into `to_port`
+    with a reduction:
+
+      * 'sum', 'mean', 'max': reduce element-wise over the sources.
+      * 'concatenate': concatenate the sources along the first axis.
+      * 'stack': stack the sources along a new first axis.
+
+    The result is computed into a preallocated array (the buffer of
+    `to_port` if it is fixed) whenever the version of any source changes.
+    Element-wise reductions accumulate the sources one by one into that
+    array without intermediate copies.
+    """
+
+    __slots__ = ('reduce', 'sources', 'versions', 'value')
+
+    private = True
+
+    def __init__(self, to_port, reduce):
+        """ Create a FanInConnection instance.
+
+        Args:
+          to_port (Port): a `Port` to sync to.
+          reduce (str): one of `REDUCTIONS`.
+
+        Returns:
+          FanInConnection: a new FanInConnection instance.
+        """
+
+        if reduce not in REDUCTIONS:
+            raise ValueError("Unknown reduction: {}".format(reduce))
+
+        super(FanInConnection, self).__init__(None, to_port)
+        self.reduce = reduce
+        self.sources = []
+        self.versions = None
+        self.value = None
+
+    @property
+    def from_ports(self):
+        """ The list of `Port`s this `Connection` syncs from. """
+
+        return self.sources
+
+    def add(self, from_port):
+        """ Add a `Port` to sync from.
+
+        Args:
+          from_port (Port): a `Port` to sync from.
+
+        Returns:
+          None.
+
+        """
+
+        self.sources.append(from_port)
+        self.versions = None
+
+    def merge(self, buffers):
+        """ Reduce the source buffers into the preallocated array.
+
+        Args:
+          buffers (list): the buffers of the sources.
+
+        Returns:
+          numpy.ndarray: the reduced value.
+
+        """
+
+        to_port = self.to_port
+        shape = numpy.shape(buffers[0])
+        dtype = numpy.result_type(*buffers)
+        reduce = self.reduce
+
+        if reduce == 'stack':
+            shape = (len(buffers),) + shape
+        elif reduce == 'concatenate':
+            shape = (sum(numpy.shape(buffer)[0] for buffer in buffers),) + \
+                shape[1:]
+        elif reduce == 'mean' and dtype.kind not in 'fc':
+            dtype = numpy.dtype(numpy.float64)
+
+        if to_port.fixed:
+            if shape != to_port.shape:
+                raise ValueError("Port expects a value of shape {} but got {}"
+                                 .format(to_port.shape, shape))
+            out = to_port.buffer
+        else:
+            out = self.value = reuse(self.value, shape, dtype)
+
+        if reduce == 'stack':
+            numpy.stack(buffers, out=out)
+        elif reduce == 'concatenate':
+            numpy.concatenate(buffers, out=out)
+        else:
+            accumulate = numpy.maximum if reduce == 'max' else numpy.add
+            numpy.copyto(out, buffers[0], casting='same_kind')
+
+            for buffer in buffers[1:]:
+                accumulate(out, buffer, out=out)
+
+            if reduce == 'mean':
+                # Integer buffers of fixed ports truncate like numpy.mean.
+                numpy.divide(out, len(buffers), out=out, casting='unsafe')
+
+        return out
+
+    def sync(self):
+        """ Sync the reduced value of all sources to `to_port`.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        versions = [from_port.version for from_port in self.sources]
+
+        if not versions or versions == self.versions:
+            return
+
+        self.versions = versions
+        self.to_port.buffer = self.merge(
+            [from_port.buffer for from_port in self.sources])
@@ -0,0 +1,473 @@
+# -*- coding: utf-8 -*-
+
+"""
+distributed.py
+=====
+
+This module contains the `ProcessScheduler` which runs groups of `Component`s
+in worker processes. Port buffers crossing process boundaries are exchanged
+through shared memory instead of being pickled.
+
+"""
+
+__all__ = ["ProcessScheduler"]
+
+import multiprocessing
+import traceback
+
+import numpy
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+# BriCA imports
+from .scheduler import Scheduler
+from .supervisor import NullSupervisor
+
+
+def write_shared(port, array):
+    """ Copy the buffer of a `Port` into a shared array.
+
+    Args:
+      port (Port): a `Port` to copy from.
+      array (numpy.ndarray): a shared array to copy to.
+
+    Returns:
+      None.
+
+    """
+
+    value = port.buffer
+
+    if (not isinstance(value, numpy.ndarray) or value.shape != array.shape or
+            value.dtype != array.dtype):
+        raise ValueError("A shared port must keep the shape {} and dtype {}"
+                         " of its buffer".format(array.shape, array.dtype))
+
+    numpy.copyto(array, value)
+
+
+def run_worker(pipe, components, imports, exports, versions):
+    """ Serve the commands of a `ProcessScheduler` in a worker process.
+
+    Args:
+      pipe (Connection): a pipe to the scheduler.
+      components (list): `Component`s run by this worker.
+      imports (list): (`Port`, shared array, index) tuples of ports owned by
+        other workers. The buffer of each port is replaced by the shared
+        array.
+      exports (list): (`Port`, shared array, index) tuples of ports owned by
+        this worker. The buffer of each port is copied to the shared array
+        when its version changes.
+      versions (numpy.ndarray): a shared array counting the writes to each
+        shared array, indexed by the tuples above.
+
+    Returns:
+      None.
+
+    """
+
+    for port, array, index in imports:
+        port.buffer = array
+
+    imported = dict((index, versions[index]) for port, array, index
+                    in imports)
+    exported = dict((index, None) for port, array, index in exports)
+
+    while True:
+        command, time = pipe.recv()
+
+        try:
+            if command == 'fire':
+                # Imported buffers are written by other processes.
+                for port, array, index in imports:
+                    if versions[index] != imported[index]:
+                        imported[index] = versions[index]
+                        port.touch()
+
+                for component in components:
+                    component.input(time)
+
+                for component in components:
+                    if component.is_ready():
+                        component.train()
+                        component.fire()
+            elif command == 'output':
+                for component in components:
+                    component.output(time)
+
+                for port, array, index in exports:
+                    if port.version != exported[index]:
+                        write_shared(port, array)
+                        exported[index] = port.version
+                        versions[index] += 1
+            else:
+                break
+        except Exception:
+            pipe.send(traceback.format_exc())
+        else:
+            pipe.send(None)
+
+    pipe.close()
+
+
+class ProcessScheduler(Scheduler):
+    """
+    `ProcessScheduler` is a `Scheduler` implementation for virtual time in a
+    synced manner which runs groups of components in worker processes.
+
+    By default each top-level `Module` of the agent forms a group, and the
+    components added directly to the agent form another one. The semantics
+    of `VirtualTimeSyncScheduler` are kept: all workers call `input()`,
+    `train()`, and `fire()`, and only after all of them are done the workers
+    call `output()`.
+
+    Out-ports read by another group are placed in shared memory, and must be
+    `fixed` (e.g. `make_out_port(id, length, dtype=..., fixed=True)`), as the
+    shared memory is sized from their shape and dtype before the first step.
+    A shared array is only copied when the version of its out-port changes,
+    and in-ports reading it only see a new version in that case. The states
+    of the components live in the workers; only the shared out-ports and
+    those given to `export()` are visible in the main process. Snapshots of
+    the agent can therefore only be saved or restored with this scheduler
+    before its first step (see `save_state()`).
+
+    Worker processes are forked, so this scheduler requires a platform
+    supporting the 'fork' start method.
+    """
+
+    def __init__(self, agent, supervisor=NullSupervisor, interval=1,
+                 groups=None):
+        """ Create a new `ProcessScheduler` Instance.
+
+        Args:
+          interval (int): interval in milliseconds between each step
+          groups (list): a list of lists of `Component`s to run in each
+            worker process. Defaults to the top-level `Module`s.
+
+        Returns:
+          ProcessScheduler: A new `ProcessScheduler` instance.
+
+        """
+
+        if shared_memory is None:
+            raise RuntimeError("ProcessScheduler requires"
+                               " multiprocessing.shared_memory")
+
+        super(ProcessScheduler, self).__init__(
+            agent,
+            supervisor=NullSupervisor,
+        )
+        self.interval = interval
+        self.groups = groups
+        self.exports = []
+        self.workers = []
+        self.pipes = []
+        self.segments = []
+        self.shared = []
+        self.started = False
+
+    def export(self, unit, id):
+        """ Make an out-port visible from the main process.
+
+        Must be called before the first `step()`.
+
+        Args:
+          unit (Unit): a `Unit` having the out-port.
+          id (str): an out-port ID.
+
+        Returns:
+          None.
+
+        """
+
+        self.exports.append(unit.get_out_port(id))
+
+    def get_groups(self):
+        """ Get the groups of components run by each worker.
+
+        Args:
+          None.
+
+        Returns:
+          list: a list of lists of `Component`s.
+
+        """
+
+        if self.groups is not None:
+            candidates = self.groups
+        else:
+            candidates = [list(self.agent.components.values())]
+            candidates.extend(submodule.get_all_components()
+                              for submodule in self.agent.submodules.values())
+
+        groups = []
+        seen = set()
+
+        for candidate in candidates:
+            group = []
+            for component in candidate:
+                if id(component) not in seen:
+                    seen.add(id(component))
+                    group.append(component)
+            if group:
+                groups.append(group)
+
+        rest = [component for component in self.components
+                if id(component) not in seen]
+        if rest:
+            groups.append(rest)
+
+        return groups
+
+    def allocate(self, port):
+        """ Allocate a shared array for the buffer of a `Port`.
+
+        Args:
+          port (Port): a `Port` to share.
+
+        Returns:
+          numpy.ndarray: a shared array holding a copy of the buffer.
+
+        """
+
+        if not port.fixed:
+            raise ValueError("A port shared between processes must be fixed")
+
+        value = port.buffer
+        segment = shared_memory.SharedMemory(create=True,
+                                             size=max(value.nbytes, 1))
+        self.segments.append(segment)
+
+        array = numpy.ndarray(value.shape, dtype=value.dtype,
+                              buffer=segment.buf)
+        numpy.copyto(array, value)
+        return array
+
+    def allocate_versions(self, size):
+        """ Allocate a shared array counting the writes to shared arrays.
+
+        Args:
+          size (int): the number of shared arrays.
+
+        Returns:
+          numpy.ndarray: a zero-filled shared array of int64.
+
+        """
+
+        segment = shared_memory.SharedMemory(create=True,
+                                             size=max(size, 1) * 8)
+        self.segments.append(segment)
+
+        versions = numpy.ndarray(size, dtype=numpy.int64, buffer=segment.buf)
+        versions[...] = 0
+        return versions
+
+    def start(self):
+        """ Allocate shared ports and start the worker processes.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        groups = self.get_groups()
+        self.started = True
+
+        owners = {}
+        for index, group in enumerate(groups):
+            for component in group:
+                for out_port in component.out_ports.values():
+                    owners.setdefault(id(out_port), index)
+
+        shared = {}
+        imports = [[] for _ in groups]
+        exports = [[] for _ in groups]
+
+        def share(port, owner):
+            if id(port) not in shared:
+                shared[id(port)] = (self.allocate(port), len(shared))
+                exports[owner].append((port,) + shared[id(port)])
+            return shared[id(port)]
+
+        for index, group in enumerate(groups):
+            for component in group:
+                for in_port in component.in_ports.values():
+                    connection = in_port.connection
+                    if connection is None:
+                        continue
+
+                    for from_port in connection.from_ports:
+                        owner = owners.get(id(from_port))
+                        if owner is None or owner == index:
+                            continue
+
+                        imports[index].append(
+                            (from_port,) + share(from_port, owner))
+
+        for port in self.exports:
+            if id(port) in owners:
+                share(port, owners[id(port)])
+
+        versions = self.allocate_versions(len(shared))
+
+        context = multiprocessing.get_context('fork')
+
+        for index, group in enumerate(groups):
+            pipe, child = context.Pipe()
+            worker = context.Process(
+                target=run_worker,
+                args=(child, group, imports[index], exports[index],
+                      versions),
+            )
+            worker.daemon = True
+            worker.start()
+            child.close()
+            self.pipes.append(pipe)
+            self.workers.append(worker)
+
+        for group_exports in exports:
+            for port, array, index in group_exports:
+                port.buffer = array
+                self.shared.append((port, array))
+
+    def check_local(self):
+        """ Check that the components have not been run in the workers.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        Raises:
+          ValueError: if the worker processes have been started, as the
+            components in the main process no longer hold their state.
+
+        """
+
+        if self.started:
+            raise ValueError("The states of the components of a started"
+                             " ProcessScheduler live in its worker processes")
+
+    def save_state(self, paths):
+        """ Get the state of the `Scheduler` for a snapshot.
+
+        Args:
+          paths (dict): component paths keyed by the `id()` of components.
+
+        Returns:
+          dict: a picklable state.
+
+        Raises:
+          ValueError: if the worker processes have been started.
+
+        """
+
+        self.check_local()
+        return super(ProcessScheduler, self).save_state(paths)
+
+    def load_state(self, state, components):
+        """ Restore a state returned by `save_state()`.
+
+        The workers are started with the restored components on the next
+        step.
+
+        Args:
+          state (dict): a saved state.
+          components (dict): components keyed by their paths.
+
+        Returns:
+          None.
+
+        Raises:
+          ValueError: if the worker processes have been started.
+
+        """
+
+        self.check_local()
+        super(ProcessScheduler, self).load_state(state, components)
+
+    def send(self, command, time):
+        """ Send a command to all workers and wait for them to finish.
+
+        Args:
+          command (str): a command to send.
+          time (int): the scheduler's current time.
+
+        Returns:
+          None.
+
+        """
+
+        for pipe in self.pipes:
+            pipe.send((command, time))
+
+        errors = [error for error in (pipe.recv() for pipe in self.pipes)
+                  if error is not None]
+
+        if errors:
+            raise RuntimeError("A worker process failed:\n" + errors[0])
+
+    def step(self):
+        """ Step by the internal interval.
+
+        Args:
+          None.
+
+        Returns:
+          int: the current time of the `Scheduler`.
+
+        """
+
+        if not self.workers:
+            self.start()
+
+        self.supervisor.step()
+        self.send('fire', self.current_time)
+
+        self.current_time = self.current_time + self.interval
+
+        self.send('output', self.current_time)
+
+        return self.current_time
+
+    def close(self):
+        """ Stop the worker processes and free the shared memory.
+
+        Shared out-ports keep a private copy of their last value.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        for pipe in self.pipes:
+            pipe.send(('close', None))
+            pipe.close()
+
+        for worker in self.workers:
+            worker.join()
+
+        for port, array in self.shared:
+            port.buffer = array.copy()
+
+        self.shared = []
+        self.pipes = []
+        self.workers = []
+
+        for segment in self.segments:
+            segment.close()
+            segment.unlink()
+
+        self.segments = []
+
+        super(ProcessScheduler, self).close()
@@ -14,6 +14,7 @@ __all__ = ["Module", "Agent"]
 
 # BriCA imports
 from .component import Component
+from .snapshot import load_snapshot, save_snapshot
 from .unit import Unit
 
 
@@ -38,6 +39,71 @@ class Module(Unit):
         super(Module, self).__init__()
         self.components = {}
         self.submodules = {}
+        self.parents = []
+        self.index = None
+
+    def invalidate_index(self):
+        """ Invalidate the cached component index of this `Module`.
+
+        The index of every parent `Module` is invalidated as well. This is
+        called automatically when components or submodules are added or
+        removed, and must be called manually when `components` or
+        `submodules` are modified directly.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        self.index = None
+
+        for parent in self.parents:
+            parent.invalidate_index()
+
+    def get_index(self):
+        """ Get the component index of this `Module`.
+
+        The index is built by a depth-first traversal in insertion order:
+        the components of this `Module` come first, followed by those of each
+        submodule. Each `Component` and `Module` appears once. The index is
+        cached until invalidated.
+
+        Args:
+          None.
+
+        Returns:
+          tuple: a tuple of (path, `Component`) pairs, a tuple of the
+            `Component`s, and a tuple of the submodules.
+
+        """
+
+        if self.index is not None:
+            return self.index
+
+        named_components = []
+        submodules = []
+        seen = set()
+
+        def visit(module, prefix):
+            for name, component in module.components.items():
+                if id(component) not in seen:
+                    seen.add(id(component))
+                    named_components.append((prefix + name, component))
+
+            for name, submodule in module.submodules.items():
+                if id(submodule) not in seen:
+                    seen.add(id(submodule))
+                    submodules.append(submodule)
+                    visit(submodule, prefix + name + ".")
+
+        visit(self, "")
+
+        components = tuple(component for _, component in named_components)
+        self.index = (tuple(named_components), components, tuple(submodules))
+        return self.index
 
     def add_submodule(self, id, submodule):
         """ Add a `Module` to this `Module`.
@@ -59,7 +125,12 @@ class Module(Unit):
             raise LookupError("There is already a component of the same name")
             return
 
+        if id in self.submodules:
+            self.remove_submodule(id)
+
         self.submodules[id] = submodule
+        submodule.parents.append(self)
+        self.invalidate_index()
 
     def get_submodule(self, id):
         """ Get a `Module` for a given `id`.
@@ -84,6 +155,8 @@ class Module(Unit):
     def get_all_submodules(self):
         """ Get all `Module`s recursively.
 
+        The `Module`s are ordered as in `get_index()`.
+
         Args:
           None.
 
@@ -92,12 +165,7 @@ class Module(Unit):
 
         """
 
-        array = list(self.submodules.values())
-
-        for submodule in array:
-            array.extend(submodule.get_all_submodules())
-
-        return list(set(array))
+        return list(self.get_index()[2])
 
     def remove_submodule(self, id):
         """ Remove a module from this `Module`.
@@ -110,7 +178,9 @@ class Module(Unit):
 
         """
 
-        del self.submodules[id]
+        submodule = self.submodules.pop(id)
+        submodule.parents.remove(self)
+        self.invalidate_index()
 
     def add_component(self, id, component):
         """ Add a `Component` to this `Module`.
@@ -133,6 +203,7 @@ class Module(Unit):
             return
 
         self.components[id] = component
+        self.invalidate_index()
 
     def get_component(self, id):
         """ Get a `Component` for a given `id`.
@@ -150,6 +221,9 @@ class Module(Unit):
     def get_all_components(self):
         """ Get all `Component`s of all `Module`s.
 
+        The `Component`s are ordered as in `get_index()`, so the order is
+        reproducible across runs.
+
         Args:
           None.
 
@@ -158,12 +232,23 @@ class Module(Unit):
 
         """
 
-        array = list(self.components.values())
+        return list(self.get_index()[1])
+
+    def get_all_named_components(self):
+        """ Get all `Component`s of all `Module`s with their paths.
+
+        A path joins the IDs from this `Module` to the `Component` with dots,
+        e.g. `"submodule.component"`.
 
-        for submodule in self.get_all_submodules():
-            array.extend(submodule.get_all_components())
+        Args:
+          None.
 
-        return list(set(array))
+        Returns:
+          array: a array of (path, `Component`) pairs.
+
+        """
+
+        return list(self.get_index()[0])
 
     def remove_component(self, id):
         """ Remove a component from this `Module`.
@@ -177,6 +262,7 @@ class Module(Unit):
         """
 
         del self.components[id]
+        self.invalidate_index()
 
 
 class Agent(Module):
@@ -196,3 +282,35 @@ class Agent(Module):
 
         """
         super(Agent, self).__init__()
+
+    def snapshot(self, path, scheduler=None):
+        """ Save the state of this `Agent` to a file.
+
+        See `brica1.snapshot.save_snapshot()`.
+
+        Args:
+          path (str): a file path to write to.
+          scheduler (Scheduler): a `Scheduler` of this `Agent` to save.
+
+        Returns:
+          None.
+
+        """
+
+        save_snapshot(self, path, scheduler)
+
+    def restore(self, path, scheduler=None):
+        """ Restore the state of this `Agent` from a file.
+
+        See `brica1.snapshot.load_snapshot()`.
+
+        Args:
+          path (str): a snapshot file path.
+          scheduler (Scheduler): a `Scheduler` of this `Agent` to restore.
+
+        Returns:
+          None.
+
+        """
+
+        load_snapshot(self, path, scheduler)
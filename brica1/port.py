@@ -8,43 +8,224 @@ This module contains the class `Port`.
 
 """
 
+__all__ = ["Port", "DELIVERY_COPY", "DELIVERY_VIEW", "DELIVERY_COW"]
+
+from copy import deepcopy
+from itertools import count
+
+import numpy
+
 # BriCA imports
-from .connection import Connection
+from .connection import BroadcastConnection, Connection, DelayedConnection
+from .connection import FanInConnection, REDUCTIONS
+
+# Delivery policies deciding how an in-port buffer is handed to `fire()`.
+DELIVERY_COPY = 'copy'
+DELIVERY_VIEW = 'view'
+DELIVERY_COW = 'cow'
+
+DELIVERY_POLICIES = (DELIVERY_COPY, DELIVERY_VIEW, DELIVERY_COW)
+
+# Versions are drawn from a single counter so that they are unique across all
+# ports and a replaced port is never mistaken for an unchanged one.
+versions = count()
 
 
 class Port(object):
     """
     A `Port` has a buffer value and a outward connection to another port.
     There may only be one outward connection but multiple inward connections.
+
+    The `delivery` policy of an in-port decides what `Component.input()`
+    stores in `inputs`:
+
+      * `DELIVERY_COPY` (default): a deep copy of the buffer.
+      * `DELIVERY_VIEW`: a read-only view of a `numpy.ndarray` buffer (other
+        values are passed by reference).
+      * `DELIVERY_COW`: a read-only view of a `numpy.ndarray` buffer which is
+        copied only when the component asks for a writable version through
+        `Component.get_mutable_input()` (other values are deep copied).
+
+    Views are only taken of buffers stored by ports (see `private()`). A
+    buffer shared with the `results` of another component may be mutated
+    while the receiving component fires, so it is delivered as a snapshot
+    (see `freeze()`) instead.
+
+    A `fixed` port keeps the shape and dtype of its initial `numpy.ndarray`
+    buffer. Values written to a fixed out-port are copied into the buffer
+    instead of replacing it, and a fixed in-port with `DELIVERY_COPY` copies
+    into the array stored in `inputs` on the previous step unless it is held
+    in `results` or `states` (see `Component.holds()`). Components must not
+    keep other references to such inputs across steps. Both raise a
+    `ValueError` when a value of a different shape is received.
+
+    In-ports connected to a `broadcast` out-port share a frozen snapshot of
+    its buffer (see `BroadcastConnection`). An in-port with a `reduce`
+    operation accepts any number of connections and merges them (see
+    `FanInConnection`); other ports only keep their last connection.
+
+    Every assignment to `buffer` and every `update()` sets a new `version`,
+    which lets connections and components skip unchanged buffers. Code
+    mutating a buffer in place by other means must call `touch()`.
+
+    Ports are slotted to keep agents with many ports small; `connection` is
+    None until `connect()` is called. Rarely used attributes default to the
+    class attributes below and are only stored in the instance `__dict__`
+    when set, and `callbacks` is an empty tuple until `register_callback()`
+    is called.
     """
 
-    def __init__(self, value):
+    __slots__ = ('_buffer', 'version', 'callbacks', 'delivery', 'fixed',
+                 'connection', '__dict__')
+
+    broadcast = False
+    reduce = None
+    segment = None
+    owns_segment = False
+    frozen = None
+    frozen_version = None
+
+    def __init__(self, value, delivery=DELIVERY_COPY, fixed=False,
+                 broadcast=False, reduce=None):
         """ Create a new `Port` instance.
 
         Args:
-          None.
+          value (any): an initial buffer value.
+          delivery (str): a delivery policy for the buffer.
+          fixed (bool): keep the shape and dtype of the buffer, which must be
+            a `numpy.ndarray`.
+          broadcast (bool): connect in-ports with `BroadcastConnection`s.
+          reduce (str): merge multiple connections with a reduction, one of
+            'sum', 'mean', 'max', 'concatenate', or 'stack'.
 
         Returns:
-          Scheduler: A new `Port` instance.
+          Port: A new `Port` instance.
 
         """
 
         super(Port, self).__init__()
-        self.buffer = value
-        self.callbacks = []
 
-    def connect(self, target):
+        if delivery not in DELIVERY_POLICIES:
+            raise ValueError("Unknown delivery policy: {}".format(delivery))
+
+        if reduce is not None and reduce not in REDUCTIONS:
+            raise ValueError("Unknown reduction: {}".format(reduce))
+
+        if fixed and not isinstance(value, numpy.ndarray):
+            raise ValueError("A fixed port requires a numpy.ndarray buffer")
+
+        self._buffer = value
+        self.version = next(versions)
+        self.callbacks = ()
+        self.delivery = delivery
+        self.fixed = fixed
+        self.connection = None
+
+        if broadcast:
+            self.broadcast = broadcast
+
+        if reduce is not None:
+            self.reduce = reduce
+
+    @property
+    def buffer(self):
+        """ The buffer value of this `Port`. """
+
+        return self._buffer
+
+    @buffer.setter
+    def buffer(self, value):
+        if self.fixed:
+            self.validate(value)
+        self._buffer = value
+        self.version = next(versions)
+
+    @property
+    def shape(self):
+        """ The shape of the buffer of a fixed `Port`, or None. """
+
+        return self._buffer.shape if self.fixed else None
+
+    @property
+    def dtype(self):
+        """ The dtype of the buffer of a fixed `Port`, or None. """
+
+        return self._buffer.dtype if self.fixed else None
+
+    def release(self):
+        """ Release the shared memory segment backing the buffer.
+
+        The buffer is replaced with a private copy, and the segment is
+        unlinked if this `Port` created it. Views of the segment delivered
+        before must not be used afterwards.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        if self.segment is None:
+            return
+
+        self.buffer = numpy.array(self.buffer)
+        self.segment.close()
+
+        if self.owns_segment:
+            self.segment.unlink()
+
+        del self.segment
+        self.__dict__.pop('owns_segment', None)
+
+    def touch(self):
+        """ Mark the buffer as changed after mutating it in place.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        self.version = next(versions)
+
+    def connect(self, target, delay=False):
         """ Create a connection to the target `Port`.
 
         Args:
           target (Port): a `Port` to connect to.
+          delay (bool): create a `DelayedConnection`, even if `target` is a
+            broadcast port.
 
         Returns:
           None.
 
         """
 
-        self.connection = Connection(target, self)
+        if self.fixed and target.fixed:
+            if self.reduce not in ('concatenate', 'stack'):
+                self.validate(target.buffer)
+            if not numpy.can_cast(target.dtype, self.dtype, 'same_kind'):
+                raise ValueError("Cannot connect a port of dtype {} to a port"
+                                 " of dtype {}".format(target.dtype,
+                                                       self.dtype))
+
+        if self.reduce is not None:
+            if delay:
+                raise ValueError("A reducing port cannot have delayed"
+                                 " connections")
+            if self.connection is None:
+                self.connection = FanInConnection(self, self.reduce)
+            self.connection.add(target)
+        elif delay:
+            self.connection = DelayedConnection(target, self)
+        elif target.broadcast:
+            self.connection = BroadcastConnection(target, self)
+        else:
+            self.connection = Connection(target, self)
 
     def sync(self):
         """ Sync self with the `Connection`.
@@ -57,9 +238,160 @@ class Port(object):
 
         """
 
-        if hasattr(self, 'connection'):
+        if self.connection is not None:
             self.connection.sync()
 
+    def freeze(self):
+        """ Get a snapshot of the buffer which is never mutated.
+
+        `numpy.ndarray` snapshots are read-only. The snapshot is taken once
+        per `version`, and a read-only array owning its data is used as is.
+
+        Args:
+          None.
+
+        Returns:
+          any: a snapshot of the buffer.
+
+        """
+
+        if self.frozen_version != self.version:
+            buffer = self.buffer
+
+            if isinstance(buffer, numpy.ndarray):
+                if buffer.flags.writeable or buffer.base is not None:
+                    buffer = buffer.copy()
+                    buffer.flags.writeable = False
+            else:
+                buffer = deepcopy(buffer)
+
+            self.frozen = buffer
+            self.frozen_version = self.version
+
+        return self.frozen
+
+    def validate(self, value):
+        """ Check a value against the shape of a fixed `Port`.
+
+        Args:
+          value (any): a value to check.
+
+        Returns:
+          None.
+
+        """
+
+        if self.fixed and numpy.shape(value) != self.shape:
+            raise ValueError("Port expects a value of shape {} but got {}"
+                             .format(self.shape, numpy.shape(value)))
+
+    def write(self, value):
+        """ Write a value to the buffer.
+
+        Fixed ports copy the value into the buffer, other ports hold a
+        reference to the value.
+
+        Args:
+          value (any): a value to write.
+
+        Returns:
+          None.
+
+        """
+
+        if self.fixed:
+            self.update(value)
+        else:
+            self.buffer = value
+
+    def update(self, value):
+        """ Copy a value into the buffer in place.
+
+        The value is copied into the current buffer when it is a writable
+        `numpy.ndarray` of the same shape and dtype, otherwise the buffer is
+        replaced with a copy of the value. Fixed ports always copy into the
+        buffer, casting the value if it is of the same kind. A dict is copied
+        field by field into a structured buffer and must have exactly the
+        fields of the buffer. Other values are passed to `write()`.
+
+        Args:
+          value (any): a value to copy from.
+
+        Returns:
+          None.
+
+        """
+
+        buffer = self.buffer
+
+        if (type(value) is dict and isinstance(buffer, numpy.ndarray) and
+                buffer.dtype.names is not None):
+            if set(value) != set(buffer.dtype.names):
+                raise ValueError("Port expects a record with the fields {}"
+                                 " but got {}".format(
+                                     sorted(buffer.dtype.names),
+                                     sorted(value)))
+            for name, field in value.items():
+                numpy.copyto(buffer[name], field, casting='same_kind')
+            self.version = next(versions)
+        elif self.fixed:
+            self.validate(value)
+            numpy.copyto(buffer, value, casting='same_kind')
+            self.version = next(versions)
+        elif not isinstance(value, numpy.ndarray):
+            self.write(value)
+        elif (isinstance(buffer, numpy.ndarray) and buffer is not value and
+                buffer.flags.writeable and buffer.shape == value.shape and
+                buffer.dtype == value.dtype):
+            numpy.copyto(buffer, value)
+            self.version = next(versions)
+        else:
+            self.buffer = numpy.array(value, copy=True)
+
+    def receive(self, value, version):
+        """ Take a value synced from a connection with its version.
+
+        A fixed `Port` copies the value into its own buffer, casting it if it
+        is of the same kind, so the preallocated buffer is reused. Other
+        ports share the value.
+
+        Args:
+          value (any): a value to receive.
+          version (int): the version of the value.
+
+        Returns:
+          None.
+
+        """
+
+        if self.fixed:
+            self.validate(value)
+            numpy.copyto(self._buffer, value, casting='same_kind')
+        else:
+            self._buffer = value
+
+        self.version = version
+
+    def private(self):
+        """ Check whether the buffer is stored by ports only.
+
+        The buffer of a fixed or unconnected `Port` is its own, and the value
+        synced by a connection may be private to ports as well (see
+        `Connection.private`). Other buffers may be held in the `results` of
+        another component.
+
+        Args:
+          None.
+
+        Returns:
+          bool: True if no component can mutate the buffer while it fires.
+
+        """
+
+        connection = self.connection
+
+        return self.fixed or connection is None or connection.private
+
     def register_callback(self, f):
         """ Register a callback function to this `Port`
 
@@ -71,6 +403,9 @@ class Port(object):
 
         """
 
+        if not self.callbacks:
+            self.callbacks = []
+
         self.callbacks.append(f)
 
     def invoke_callbacks(self):
@@ -86,3 +421,57 @@ class Port(object):
 
         for f in self.callbacks:
             f(self.buffer)
+
+    def deliver(self, previous=None):
+        """ Get the buffer value according to the delivery policy.
+
+        Args:
+          previous (any): the value delivered on the previous step. Fixed
+            ports with `DELIVERY_COPY` copy into it when possible.
+
+        Returns:
+          any: a value to be stored in `Component.inputs`.
+
+        """
+
+        buffer = self._buffer
+
+        if self.fixed:
+            self.validate(buffer)
+
+        connection = self.connection
+
+        if (connection is not None and connection.shared and
+                isinstance(buffer, numpy.ndarray) and
+                not buffer.flags.writeable):
+            return buffer
+
+        if self.delivery == DELIVERY_COPY:
+            if not self.fixed:
+                # A plain array without objects is deep copied by copy().
+                if (type(buffer) is numpy.ndarray and
+                        not buffer.dtype.hasobject):
+                    return buffer.copy()
+                return deepcopy(buffer)
+
+            if (not isinstance(previous, numpy.ndarray) or
+                    previous.shape != self.shape or
+                    previous.dtype != self.dtype or
+                    not previous.flags.writeable):
+                previous = numpy.empty(self.shape, dtype=self.dtype)
+
+            numpy.copyto(previous, buffer, casting='same_kind')
+            return previous
+
+        if not self.private():
+            buffer = self.freeze()
+
+        if isinstance(buffer, numpy.ndarray):
+            view = buffer.view()
+            view.flags.writeable = False
+            return view
+
+        if self.delivery == DELIVERY_VIEW:
+            return buffer
+
+        return deepcopy(buffer)
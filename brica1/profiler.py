@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+
+"""
+profiler.py
+=====
+
+This module contains the `Profiler` which records per-component timings of
+the `input()`, `train()`, `fire()`, and `output()` calls made by a
+`Scheduler`, the time spent in port callbacks, and the number of bytes copied
+per port. It is usually created by `Scheduler.enable_profiling()`.
+
+"""
+
+__all__ = ["Profiler"]
+
+import asyncio
+from functools import wraps
+import json
+import threading
+import time
+
+import numpy
+
+# BriCA imports
+from .port import DELIVERY_COPY
+
+
+class Profiler(object):
+    """
+    A `Profiler` instruments the components of a `Scheduler` while attached.
+
+    The methods of each component and the callbacks of its ports are wrapped
+    with timers for the instances only, so nothing is measured and nothing
+    costs anything once the `Profiler` is detached. The `step()` of the
+    `Scheduler` is timed as well.
+    """
+
+    def __init__(self, trace=False):
+        """ Create a new `Profiler` instance.
+
+        Args:
+          trace (bool): also record every call as a trace event for
+            `export_chrome_trace()`.
+
+        Returns:
+          Profiler: a new `Profiler` instance.
+
+        """
+
+        super(Profiler, self).__init__()
+        self.trace = trace
+        self.timings = {}
+        self.port_bytes = {}
+        self.events = []
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter_ns()
+        self.patches = []
+        self.callbacks = []
+        self.versions = {}
+
+    def record(self, name, phase, start, end):
+        """ Record a timed call.
+
+        Args:
+          name (str): a component path, or 'scheduler'.
+          phase (str): a phase name, e.g. 'fire'.
+          start (int): a `time.perf_counter_ns()` value at the start.
+          end (int): a `time.perf_counter_ns()` value at the end.
+
+        Returns:
+          None.
+
+        """
+
+        spent = end - start
+
+        with self.lock:
+            timing = self.timings.get((name, phase))
+            if timing is None:
+                self.timings[(name, phase)] = [1, spent, spent]
+            else:
+                timing[0] += 1
+                timing[1] += spent
+                if spent > timing[2]:
+                    timing[2] = spent
+
+            if self.trace:
+                self.events.append({
+                    'name': name,
+                    'cat': phase,
+                    'ph': 'X',
+                    'ts': (start - self.origin) / 1000.0,
+                    'dur': spent / 1000.0,
+                    'pid': 0,
+                    'tid': threading.get_ident(),
+                })
+
+    def count_bytes(self, name, direction, identifier, value):
+        """ Count the bytes of a copied port value.
+
+        Args:
+          name (str): a component path.
+          direction (str): 'in' or 'out'.
+          identifier (str): a port ID.
+          value (any): the copied value.
+
+        Returns:
+          None.
+
+        """
+
+        if isinstance(value, numpy.ndarray):
+            key = (name, direction, identifier)
+            with self.lock:
+                self.port_bytes[key] = (self.port_bytes.get(key, 0) +
+                                        value.nbytes)
+
+    def timed(self, name, phase, method):
+        """ Wrap a callable with a timer.
+
+        Args:
+          name (str): a component path.
+          phase (str): a phase name.
+          method (callable): a callable or coroutine function to wrap.
+
+        Returns:
+          callable: the wrapped callable.
+
+        """
+
+        record = self.record
+        clock = time.perf_counter_ns
+
+        if asyncio.iscoroutinefunction(method):
+            @wraps(method)
+            async def wrapper(*args, **kwargs):
+                start = clock()
+                try:
+                    return await method(*args, **kwargs)
+                finally:
+                    record(name, phase, start, clock())
+        else:
+            @wraps(method)
+            def wrapper(*args, **kwargs):
+                start = clock()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    record(name, phase, start, clock())
+
+        return wrapper
+
+    def patch(self, obj, attr, method):
+        """ Override a method of an instance until `detach()`.
+
+        Args:
+          obj (object): an instance to patch.
+          attr (str): a method name.
+          method (callable): the replacement.
+
+        Returns:
+          None.
+
+        """
+
+        self.patches.append((obj, attr, obj.__dict__.get(attr)))
+        setattr(obj, attr, method)
+
+    def attach(self, scheduler):
+        """ Instrument the components of a `Scheduler`.
+
+        Components added after attaching are not instrumented.
+
+        Args:
+          scheduler (Scheduler): a `Scheduler` to instrument.
+
+        Returns:
+          None.
+
+        """
+
+        names = dict((id(component), path) for path, component
+                     in scheduler.agent.get_all_named_components())
+        ports = set()
+
+        for component in scheduler.components:
+            name = names.get(id(component), repr(component))
+
+            self.patch(component, 'input',
+                       self.timed_input(name, component, component.input))
+            self.patch(component, 'train',
+                       self.timed(name, 'train', component.train))
+            self.patch(component, 'fire',
+                       self.timed(name, 'fire', component.fire))
+            self.patch(component, 'output',
+                       self.timed_output(name, component, component.output))
+
+            for port in list(component.in_ports.values()) + list(
+                    component.out_ports.values()):
+                if id(port) not in ports and port.callbacks:
+                    ports.add(id(port))
+                    self.callbacks.append((port, list(port.callbacks)))
+                    port.callbacks = [
+                        self.timed(name, 'callbacks', f)
+                        for f in port.callbacks
+                    ]
+
+        self.patch(scheduler, 'step',
+                   self.timed('scheduler', 'step', scheduler.step))
+
+    def timed_input(self, name, component, method):
+        """ Wrap `input()` with a timer counting the copied bytes.
+
+        Nothing is copied when the component is not ready. Otherwise
+        `DELIVERY_COPY` in-ports copy on every call, and other in-ports copy
+        a changed buffer which is not private (see `Port.private()`).
+
+        Args:
+          name (str): a component path.
+          component (Component): the component of `method`.
+          method (callable): the bound `input()` method.
+
+        Returns:
+          callable: the wrapped method.
+
+        """
+
+        timed = self.timed(name, 'input', method)
+        count_bytes = self.count_bytes
+        versions = self.versions
+
+        def wrapper(time):
+            timed(time)
+            if not component.is_ready():
+                return
+            for identifier, in_port in component.in_ports.items():
+                value = component.inputs.get(identifier)
+                changed = versions.get(in_port) != in_port.version
+                versions[in_port] = in_port.version
+                connection = in_port.connection
+                if (connection is not None and connection.shared and
+                        isinstance(value, numpy.ndarray) and
+                        not value.flags.writeable):
+                    continue
+                if (in_port.delivery == DELIVERY_COPY or
+                        changed and not in_port.private()):
+                    count_bytes(name, 'in', identifier, value)
+
+        return wrapper
+
+    def timed_output(self, name, component, method):
+        """ Wrap `output()` with a timer counting the bytes copied in place.
+
+        Only out-ports whose `version` was changed by the call are counted.
+
+        Args:
+          name (str): a component path.
+          component (Component): the component of `method`.
+          method (callable): the bound `output()` method.
+
+        Returns:
+          callable: the wrapped method.
+
+        """
+
+        timed = self.timed(name, 'output', method)
+        count_bytes = self.count_bytes
+
+        def wrapper(time):
+            out_ports = component.out_ports
+            before = [out_port.version for out_port in out_ports.values()]
+            timed(time)
+            for (identifier, out_port), version in zip(out_ports.items(),
+                                                        before):
+                if out_port.version == version:
+                    continue
+                if (identifier in component.inplace_results or
+                        out_port.fixed):
+                    count_bytes(name, 'out', identifier, out_port.buffer)
+
+        return wrapper
+
+    def detach(self):
+        """ Remove the instrumentation installed by `attach()`.
+
+        The recorded data are kept.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        for obj, attr, previous in reversed(self.patches):
+            if previous is None:
+                delattr(obj, attr)
+            else:
+                setattr(obj, attr, previous)
+
+        for port, callbacks in self.callbacks:
+            port.callbacks = callbacks
+
+        self.patches = []
+        self.callbacks = []
+        self.versions = {}
+
+    def summary(self):
+        """ Format the recorded data as a table.
+
+        Args:
+          None.
+
+        Returns:
+          str: a table of timings sorted by total time, followed by a table
+            of bytes copied per port.
+
+        """
+
+        lines = ["{:<40} {:<10} {:>8} {:>12} {:>12} {:>12}".format(
+            "Component", "Phase", "Calls", "Total (ms)", "Mean (us)",
+            "Max (us)")]
+
+        timings = sorted(self.timings.items(), key=lambda item: -item[1][1])
+
+        for (name, phase), (calls, total, longest) in timings:
+            lines.append("{:<40} {:<10} {:>8} {:>12.3f} {:>12.3f} {:>12.3f}"
+                         .format(name, phase, calls, total / 1e6,
+                                 total / calls / 1e3, longest / 1e3))
+
+        if self.port_bytes:
+            lines.append("")
+            lines.append("{:<40} {:<10} {:>12}".format(
+                "Component", "Port", "Bytes"))
+
+            for (name, direction, identifier), count in sorted(
+                    self.port_bytes.items(), key=lambda item: -item[1]):
+                lines.append("{:<40} {:<10} {:>12}".format(
+                    name, "{}:{}".format(direction, identifier), count))
+
+        return "\n".join(lines)
+
+    def export_chrome_trace(self, path):
+        """ Write the trace events in the Chrome trace-event JSON format.
+
+        The file can be opened with chrome://tracing or Perfetto. Requires
+        the `Profiler` to be created with `trace=True`.
+
+        Args:
+          path (str): a file path to write to.
+
+        Returns:
+          None.
+
+        """
+
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.events,
+                       'displayTimeUnit': 'ms'}, f)
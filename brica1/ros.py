@@ -87,20 +87,21 @@ class ROSAdapter(Unit):
 
         self.get_in_port(id).register_callback(callback)
 
-    def connect(self, target, from_id, to_id):
+    def connect(self, target, from_id, to_id, delay=False):
         """ Connect an out-port of another `Unit` to an in-port.
 
         Args:
           target (Unit): a `Unit` to connect to.
           from_id (str): an out-port of the target `Unit`.
           to_id(str): an in-port of this `Unit`.
+          delay (bool): make the connection a delay edge.
 
         Returns:
           None.
 
         """
 
-        super(ROSAdapter, self).connect(target, from_id, to_id)
+        super(ROSAdapter, self).connect(target, from_id, to_id, delay=delay)
         from_port = target.get_out_port(from_id)
         to_port = self.get_in_port(to_id)
 
@@ -9,32 +9,90 @@ types of schedulers. The `VirtualTimeSyncScheduler` is implemneted for now.
 
 """
 
-__all__ = ["Scheduler", "VirtualTimeSyncScheduler", "VirtualTimeScheduler",
-           "RealTimeSyncScheduler"]
-
-from .utils import current_time
+__all__ = ["Scheduler", "ExecutionPlan", "VirtualTimeSyncScheduler",
+           "TopologicalSyncScheduler", "VirtualTimeScheduler",
+           "RealTimeSyncScheduler", "AsyncScheduler", "OVERRUN_CATCH_UP",
+           "OVERRUN_SKIP"]
+
+from .arena import ArenaConnection, PortArena
+from .component import AsyncComponent, Component
+from .connection import Connection, DelayedConnection
+from .profiler import Profiler
 from .supervisor import NullSupervisor
 
 from abc import ABCMeta, abstractmethod
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
+import heapq
 import time
 
-import queue
+# Policies of `RealTimeSyncScheduler` for steps overrunning their deadline.
+OVERRUN_CATCH_UP = 'catch_up'
+OVERRUN_SKIP = 'skip'
+
+
+def train_and_fire(component):
+    """ Call `train()` and `fire()` of a `Component`.
+
+    Args:
+      component (Component): a `Component` to fire.
+
+    Returns:
+      None.
+
+    """
+
+    component.train()
+    component.fire()
+
+
+def wait_all(futures):
+    """ Wait for all futures and raise the first exception if any.
+
+    Args:
+      futures (list): a list of `concurrent.futures.Future`s.
+
+    Returns:
+      None.
+
+    """
+
+    wait(futures)
+
+    for future in futures:
+        future.result()
 
 
 class Scheduler(object):
     """
     This class is an abstract class for creating `Scheduler`s. Subclasses must
     override the `step()` method to specify its implementation.
+
+    An `executor` may be given to run the fire phase in parallel. Since
+    `fire()` only mutates `results` and `states` of its own component, the
+    components of a phase may fire concurrently while `input()` and
+    `output()` stay serial. This pays off for components which release the
+    GIL, e.g. NumPy/BLAS calls or I/O.
+
+    Only schedulers which set `fires_coroutines` accept `AsyncComponent`s;
+    others raise a `TypeError` when they are created or updated with one.
     """
 
     __metaclass__ = ABCMeta
 
-    def __init__(self, agent, supervisor=NullSupervisor):
+    fires_coroutines = False
+
+    def __init__(self, agent, supervisor=NullSupervisor, executor=None):
         """ Create a new `Scheduler` instance.
 
         Args:
           agent (Agent): An `Agent` to schedule.
           supervisor (Supervisor): A `Supervisor` to schedule.
+          executor (Executor or int): A `concurrent.futures.Executor` to fire
+            components with, or a number of worker threads of a
+            `ThreadPoolExecutor` owned by the `Scheduler`. Components fire
+            serially if None.
 
         Returns:
           Scheduler: A new `Scheduler` instance.
@@ -47,6 +105,91 @@ class Scheduler(object):
         self.num_steps = 0
         self.current_time = 0
         self.components = agent.get_all_components()
+        self.check_components(self.components)
+        self.owns_executor = isinstance(executor, int)
+
+        if self.owns_executor:
+            executor = ThreadPoolExecutor(max_workers=executor)
+
+        self.executor = executor
+        self.profiler = None
+
+    def enable_profiling(self, trace=False):
+        """ Instrument the components with a new `Profiler`.
+
+        Call this after `update()`. Profiling costs nothing while disabled.
+
+        Args:
+          trace (bool): also record trace events (see `Profiler`).
+
+        Returns:
+          Profiler: the attached `Profiler`.
+
+        """
+
+        self.disable_profiling()
+        self.profiler = Profiler(trace=trace)
+        self.profiler.attach(self)
+        return self.profiler
+
+    def disable_profiling(self):
+        """ Remove the instrumentation of the attached `Profiler`.
+
+        Args:
+          None.
+
+        Returns:
+          Profiler: the detached `Profiler` holding the recorded data, or
+            None.
+
+        """
+
+        profiler = self.profiler
+
+        if profiler is not None:
+            profiler.detach()
+            self.profiler = None
+
+        return profiler
+
+    def close(self):
+        """ Shut down the executor if it is owned by the `Scheduler`.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        if self.owns_executor:
+            self.executor.shutdown()
+            self.executor = None
+            self.owns_executor = False
+
+    def fire_components(self, components):
+        """ Run `train()` and `fire()` of the components.
+
+        Args:
+          components (list): a list of `Component`s to fire.
+
+        Returns:
+          None.
+
+        """
+
+        components = [component for component in components
+                      if component.is_ready()]
+
+        if self.executor is None:
+            for component in components:
+                component.train()
+                component.fire()
+            return
+
+        wait_all([self.executor.submit(train_and_fire, component)
+                  for component in components])
 
     def reset(self):
         """ Reset the `Scheduler`.
@@ -75,6 +218,60 @@ class Scheduler(object):
         """
 
         self.components = self.agent.get_all_components()
+        self.check_components(self.components)
+
+    def check_components(self, components):
+        """ Check that this `Scheduler` can fire the given components.
+
+        Args:
+          components (list): `Component`s to check.
+
+        Returns:
+          None.
+
+        Raises:
+          TypeError: if an `AsyncComponent` is given to a `Scheduler` which
+            does not await coroutines.
+
+        """
+
+        if self.fires_coroutines:
+            return
+
+        for component in components:
+            if isinstance(component, AsyncComponent):
+                raise TypeError("{} cannot fire the AsyncComponent {!r};"
+                                " use AsyncScheduler".format(
+                                    type(self).__name__, component))
+
+    def save_state(self, paths):
+        """ Get the state of the `Scheduler` for a snapshot.
+
+        Args:
+          paths (dict): component paths keyed by the `id()` of components.
+
+        Returns:
+          dict: a picklable state.
+
+        """
+
+        return {'current_time': self.current_time,
+                'num_steps': self.num_steps}
+
+    def load_state(self, state, components):
+        """ Restore a state returned by `save_state()`.
+
+        Args:
+          state (dict): a saved state.
+          components (dict): components keyed by their paths.
+
+        Returns:
+          None.
+
+        """
+
+        self.current_time = state['current_time']
+        self.num_steps = state['num_steps']
 
     @abstractmethod
     def step(self):
@@ -91,17 +288,189 @@ class Scheduler(object):
         pass
 
 
+class ExecutionPlan(object):
+    """
+    `ExecutionPlan` is a static, flattened representation of the `input()`,
+    `fire()`, and `output()` calls of a set of `Component`s.
+
+    Connections, callbacks, and bound methods are resolved once when the plan
+    is created, so executing a step only iterates flat lists. The plan must be
+    recreated whenever ports, connections, components, or `fire_on_change`
+    flags are changed.
+    Components overriding `input()` or `output()` are called as usual.
+    """
+
+    def __init__(self, components):
+        """ Create a new `ExecutionPlan` instance.
+
+        Args:
+          components (list): a list of `Component`s to execute.
+
+        Returns:
+          ExecutionPlan: a new `ExecutionPlan` instance.
+
+        """
+
+        super(ExecutionPlan, self).__init__()
+        self.components = list(components)
+        self.custom_inputs = []
+        self.custom_outputs = []
+        self.links = []
+        self.syncs = []
+        self.callbacks = []
+        self.deliveries = []
+        self.fires = []
+        self.changes = []
+        self.outputs = []
+
+        for component in self.components:
+            component_type = type(component)
+
+            if component_type.input is Component.input:
+                for in_port in component.in_ports.values():
+                    connection = in_port.connection
+                    if type(connection) is Connection:
+                        self.links.append(connection)
+                    elif (connection is not None and
+                            type(connection) is not ArenaConnection):
+                        self.syncs.append(connection.sync)
+                    if in_port.callbacks:
+                        self.callbacks.append(in_port.invoke_callbacks)
+                self.deliveries.append(component.deliver_inputs)
+            else:
+                self.custom_inputs.append(component.input)
+
+            if component_type.train is Component.train:
+                fire = component.fire
+            else:
+                fire = partial(train_and_fire, component)
+
+            if component.fire_on_change:
+                self.changes.append((component, fire))
+            else:
+                self.fires.append(fire)
+
+            if component_type.output is Component.output:
+                self.outputs.append((component,
+                                     list(component.out_ports.items())))
+            else:
+                self.custom_outputs.append(component.output)
+
+    def input(self, time):
+        """ Execute `input()` of all `Component`s.
+
+        Args:
+          time (int): the scheduler's current time.
+
+        Returns:
+          None.
+
+        """
+
+        for connection in self.links:
+            from_port = connection.from_port
+            if from_port.version != connection.version:
+                connection.version = version = from_port.version
+                connection.to_port.receive(from_port.buffer, version)
+
+        for sync in self.syncs:
+            sync()
+
+        for invoke_callbacks in self.callbacks:
+            invoke_callbacks()
+
+        for deliver_inputs in self.deliveries:
+            deliver_inputs()
+
+        for component in self.components:
+            component.last_input_time = time
+
+        for custom_input in self.custom_inputs:
+            custom_input(time)
+
+    def fire(self, executor=None):
+        """ Execute `train()` and `fire()` of all `Component`s.
+
+        Args:
+          executor (Executor): an executor to fire the components in
+            parallel with, or None to fire them serially.
+
+        Returns:
+          None.
+
+        """
+
+        fires = self.fires
+
+        if self.changes:
+            fires = fires + [fire for component, fire in self.changes
+                             if component.inputs_changed]
+
+        if executor is None:
+            for fire in fires:
+                fire()
+        else:
+            wait_all([executor.submit(fire) for fire in fires])
+
+    def output(self, time):
+        """ Execute `output()` of all `Component`s.
+
+        Args:
+          time (int): the scheduler's current time.
+
+        Returns:
+          None.
+
+        """
+
+        for component, ports in self.outputs:
+            if not component.is_ready():
+                component.last_output_time = time
+                continue
+
+            results = component.assigned_results()
+            tracked = component.track_results
+            assigned = results.assigned if tracked else ()
+            inplace_results = component.inplace_results
+
+            for identifier, out_port in ports:
+                if identifier not in results:
+                    continue
+                if identifier in assigned:
+                    inplace_results.discard(identifier)
+                    out_port.write(results[identifier])
+                elif identifier in inplace_results:
+                    out_port.update(results[identifier])
+                elif tracked:
+                    continue
+                else:
+                    out_port.write(results[identifier])
+                if out_port.callbacks:
+                    out_port.invoke_callbacks()
+
+            if tracked:
+                assigned.clear()
+
+            component.last_output_time = time
+
+        for custom_output in self.custom_outputs:
+            custom_output(time)
+
+
 class VirtualTimeSyncScheduler(Scheduler):
     """
     `VirtualTimeSyncScheduler` is a `Scheduler` implementation for virutal time
     in a synced manner.
     """
 
-    def __init__(self, agent, supervisor=NullSupervisor, interval=1):
+    def __init__(self, agent, supervisor=NullSupervisor, interval=1,
+                 executor=None):
         """ Create a new `VirtualTimeSyncScheduler` Instance.
 
         Args:
           interval (int): interval in milliseconds between each step
+          executor (Executor or int): an executor for the fire phase (see
+            `Scheduler`).
 
         Returns:
           VirtualTimeSyncScheduler: A new `VirtualTimeSyncScheduler` instance.
@@ -111,8 +480,103 @@ class VirtualTimeSyncScheduler(Scheduler):
         super(VirtualTimeSyncScheduler, self).__init__(
             agent,
             supervisor=NullSupervisor,
+            executor=executor,
         )
         self.interval = interval
+        self.plan = None
+        self.arena = None
+
+    def reset(self):
+        """ Reset the `Scheduler`.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        super(VirtualTimeSyncScheduler, self).reset()
+        self.plan = None
+        self.unpack()
+
+    def update(self):
+        """ Update the `Scheduler` for given cognitive architecture (agent)
+
+        The execution plan is recompiled if the `Scheduler` was compiled, and
+        the ports are repacked if they were packed.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        super(VirtualTimeSyncScheduler, self).update()
+        if self.arena is not None:
+            self.pack()
+        elif self.plan is not None:
+            self.compile()
+
+    def compile(self):
+        """ Compile the components into an `ExecutionPlan`.
+
+        Subsequent calls to `step()` execute the plan instead of calling the
+        methods of each component, unless profiling is enabled. `compile()`
+        must be called again after changing ports or connections.
+
+        Args:
+          None.
+
+        Returns:
+          ExecutionPlan: the compiled plan.
+
+        """
+
+        self.plan = ExecutionPlan(self.components)
+        return self.plan
+
+    def pack(self):
+        """ Pack the fixed numeric ports of the components into a `PortArena`.
+
+        Subsequent calls to `step()` sync the packed connections with a few
+        vectorized copies. `pack()` must be called again after changing
+        ports or connections, and the execution plan is recompiled if the
+        `Scheduler` was compiled.
+
+        Args:
+          None.
+
+        Returns:
+          PortArena: the arena holding the packed ports.
+
+        """
+
+        self.unpack()
+        self.arena = PortArena(self.components)
+
+        if self.plan is not None:
+            self.compile()
+
+        return self.arena
+
+    def unpack(self):
+        """ Release the `PortArena` created by `pack()`, if any.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        if self.arena is not None:
+            self.arena.release()
+            self.arena = None
 
     def step(self):
         """ Step by the internal interval.
@@ -129,14 +593,25 @@ class VirtualTimeSyncScheduler(Scheduler):
 
         """
 
+        plan = self.plan
+
+        if self.arena is not None:
+            self.arena.sync()
+
+        if plan is not None and self.profiler is None:
+            plan.input(self.current_time)
+            self.supervisor.step()
+            plan.fire(self.executor)
+            self.current_time = self.current_time + self.interval
+            plan.output(self.current_time)
+            return self.current_time
+
         for component in self.components:
             component.input(self.current_time)
 
         self.supervisor.step()
 
-        for component in self.components:
-            component.train()
-            component.fire()
+        self.fire_components(self.components)
 
         self.current_time = self.current_time + self.interval
 
@@ -146,45 +621,226 @@ class VirtualTimeSyncScheduler(Scheduler):
         return self.current_time
 
 
+class TopologicalSyncScheduler(Scheduler):
+    """
+    `TopologicalSyncScheduler` is a `Scheduler` implementation for virtual
+    time which fires all components once per step in the topological order
+    of their connections.
+
+    Each component calls `input()`, `train()`, `fire()`, and `output()` in
+    turn, so a value travels through a feed-forward chain of any length in a
+    single step. Cycles must be broken with delay edges (see `connect()` and
+    `DelayedConnection`), which deliver the value of the previous step.
+    """
+
+    def __init__(self, agent, supervisor=NullSupervisor, interval=1):
+        """ Create a new `TopologicalSyncScheduler` Instance.
+
+        Args:
+          interval (int): interval in milliseconds between each step
+
+        Returns:
+          TopologicalSyncScheduler: A new `TopologicalSyncScheduler`
+            instance.
+
+        """
+
+        super(TopologicalSyncScheduler, self).__init__(
+            agent,
+            supervisor=NullSupervisor,
+        )
+        self.interval = interval
+        self.order = []
+        self.delays = []
+        self.sort()
+
+    def reset(self):
+        """ Reset the `Scheduler`.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        super(TopologicalSyncScheduler, self).reset()
+        self.order = []
+        self.delays = []
+
+    def update(self):
+        """ Update the `Scheduler` for given cognitive architecture (agent)
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        super(TopologicalSyncScheduler, self).update()
+        self.sort()
+
+    def sort(self):
+        """ Derive the firing order from the connections of the components.
+
+        Ties are broken by the order of `Module.get_all_components()`, so the
+        firing order is reproducible.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        Raises:
+          ValueError: if the connections contain a cycle without delay edges.
+
+        """
+
+        owners = {}
+        for index, component in enumerate(self.components):
+            for out_port in component.out_ports.values():
+                owners.setdefault(id(out_port), index)
+
+        successors = [set() for _ in self.components]
+        degrees = [0] * len(self.components)
+        delays = []
+
+        for index, component in enumerate(self.components):
+            for in_port in component.in_ports.values():
+                connection = in_port.connection
+
+                if connection is None:
+                    continue
+
+                if isinstance(connection, DelayedConnection):
+                    delays.append(connection)
+                    continue
+
+                for from_port in connection.from_ports:
+                    source = owners.get(id(from_port))
+                    if source is not None and index not in successors[source]:
+                        successors[source].add(index)
+                        degrees[index] += 1
+
+        ready = [index for index, degree in enumerate(degrees) if degree == 0]
+        heapq.heapify(ready)
+        order = []
+
+        while ready:
+            index = heapq.heappop(ready)
+            order.append(self.components[index])
+            for successor in successors[index]:
+                degrees[successor] -= 1
+                if degrees[successor] == 0:
+                    heapq.heappush(ready, successor)
+
+        if len(order) < len(self.components):
+            names = dict((id(component), path) for path, component
+                         in self.agent.get_all_named_components())
+            cycle = [names.get(id(component), repr(component))
+                     for index, component in enumerate(self.components)
+                     if degrees[index] > 0]
+            raise ValueError("Connections form a cycle without a delay edge"
+                             " through: {}".format(", ".join(cycle)))
+
+        self.order = order
+        self.delays = delays
+
+    def step(self):
+        """ Step by the internal interval.
+
+        Delay edges are latched, then `input()`, `train()`, `fire()`, and
+        `output()` are called for each component in topological order and
+        the time is incremented by the given interval.
+
+        Args:
+          None.
+
+        Returns:
+          int: the current time of the `Scheduler`.
+
+        """
+
+        for connection in self.delays:
+            connection.latch()
+
+        self.supervisor.step()
+
+        next_time = self.current_time + self.interval
+
+        for component in self.order:
+            component.input(self.current_time)
+            if component.is_ready():
+                component.train()
+                component.fire()
+            component.output(next_time)
+
+        for connection in self.delays:
+            connection.release()
+
+        self.current_time = next_time
+
+        return self.current_time
+
+
 class VirtualTimeScheduler(Scheduler):
     """
     `VirtualTimeScheduler` is a `Scheduler` implementation for virutal time.
+
+    Components sharing the same `offset`, `interval`, and `sleep` form a
+    cohort which is scheduled as a single `Event`. Events are kept in a
+    calendar mapping each time to a bucket of events, and the distinct times
+    are kept in a binary heap (`heapq`), so the scheduling cost of a step
+    depends on the number of cohorts rather than components. Events of the
+    same time are processed in the order they were scheduled.
+
+    The timing attributes of the components are read by `update()`, which
+    must be called again after changing them.
     """
 
     class Event(object):
         """
-        `Event` is a queue object for `PriorityQueue` in VirtualTimeScheduler.
+        `Event` is a record in the calendar of `VirtualTimeScheduler` for a
+        cohort of components sharing the same timing.
         """
 
-        def __init__(self, time, component, action='fire'):
+        __slots__ = ('time', 'components', 'action', 'interval', 'sleep')
+
+        def __init__(self, time, components, action='fire', interval=1000,
+                     sleep=0):
             """ Create a new `Event` instance.
 
             Args:
               time (int): the time of the `Event`.
-              component (Component): `Component` to be handled.
+              components (list): `Component`s to be handled.
+              action (str): 'fire' or 'sleep'.
+              interval (int): the interval of the components.
+              sleep (int): the sleep of the components.
 
             Returns:
-              Component: a new `Component` instance.
+              Event: a new `Event` instance.
 
             """
 
             super(VirtualTimeScheduler.Event, self).__init__()
             self.time = time
-            self.component = component
+            self.components = components
             self.action = action
-
-        def __lt__(self, other):
-            return self.time < other.time
+            self.interval = interval
+            self.sleep = sleep
 
     def __init__(self, agent, supervisor=NullSupervisor):
-        """ Create a new `Event` instance.
+        """ Create a new `VirtualTimeScheduler` instance.
 
         Args:
-          time (int): the time of the `Event`.
-          component (Component): `Component` to be handled.
+          agent (Agent): An `Agent` to schedule.
 
         Returns:
-          Component: a new `Component` instance.
+          VirtualTimeScheduler: a new `VirtualTimeScheduler` instance.
 
         """
 
@@ -192,11 +848,29 @@ class VirtualTimeScheduler(Scheduler):
             agent,
             supervisor=NullSupervisor,
         )
-        self.event_queue = queue.PriorityQueue()
+        self.calendar = {}
+        self.times = []
+
+    def reset(self):
+        """ Reset the `Scheduler`.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        super(VirtualTimeScheduler, self).reset()
+        self.calendar = {}
+        self.times = []
 
     def update(self):
         """ Update the `Scheduler` for given cognitive architecture (agent)
 
+        The calendar is rebuilt and every cohort is scheduled at its offset.
+
         Args:
           agent (Agent): a target to update.
 
@@ -206,44 +880,116 @@ class VirtualTimeScheduler(Scheduler):
         """
 
         super(VirtualTimeScheduler, self).update()
+
+        cohorts = {}
         for component in self.components:
-            self.event_queue.put(
-                VirtualTimeScheduler.Event(
-                    component.offset,
-                    component,
-                    'sleep',
-                )
-            )
+            key = (component.offset, component.interval, component.sleep)
+            cohorts.setdefault(key, []).append(component)
+
+        self.calendar = {}
+        self.times = []
+
+        for (offset, interval, sleep), components in cohorts.items():
+            self.schedule(VirtualTimeScheduler.Event(
+                offset,
+                components,
+                'sleep',
+                interval,
+                sleep,
+            ))
+
+    def save_state(self, paths):
+        """ Get the state of the `Scheduler` for a snapshot.
+
+        The calendar is saved with the paths of the components.
+
+        Args:
+          paths (dict): component paths keyed by the `id()` of components.
+
+        Returns:
+          dict: a picklable state.
+
+        """
+
+        state = super(VirtualTimeScheduler, self).save_state(paths)
+        state['calendar'] = [
+            (event.time, [paths[id(component)]
+                          for component in event.components],
+             event.action, event.interval, event.sleep)
+            for time in sorted(self.calendar)
+            for event in self.calendar[time]
+        ]
+        return state
+
+    def load_state(self, state, components):
+        """ Restore a state returned by `save_state()`.
+
+        The calendar replaces the one built by `update()`, which must not be
+        called afterwards.
+
+        Args:
+          state (dict): a saved state.
+          components (dict): components keyed by their paths.
+
+        Returns:
+          None.
+
+        """
+
+        super(VirtualTimeScheduler, self).load_state(state, components)
+        self.calendar = {}
+        self.times = []
+
+        for time, names, action, interval, sleep in state['calendar']:
+            self.schedule(VirtualTimeScheduler.Event(
+                time,
+                [components[name] for name in names],
+                action,
+                interval,
+                sleep,
+            ))
+
+    def schedule(self, event):
+        """ Add an `Event` to the calendar.
+
+        Args:
+          event (Event): an `Event` to schedule at `event.time`.
+
+        Returns:
+          None.
+
+        """
+
+        bucket = self.calendar.get(event.time)
+
+        if bucket is None:
+            self.calendar[event.time] = [event]
+            heapq.heappush(self.times, event.time)
+        else:
+            bucket.append(event)
 
     def step_for_time(self, time):
         fires = []
         sleeps = []
 
-        while not self.event_queue.empty():
-            if self.event_queue.queue[0].time == time:
-                event = self.event_queue.get()
-                component = event.component
+        times = self.times
+        calendar = self.calendar
+
+        while times and times[0] == time:
+            heapq.heappop(times)
 
+            for event in calendar.pop(time):
                 if event.action == 'fire':
-                    next_event = VirtualTimeScheduler.Event(
-                        event.time + component.sleep,
-                        component,
-                        'sleep'
-                    )
-                    sleeps.append(component)
+                    event.time = time + event.sleep
+                    event.action = 'sleep'
+                    sleeps.extend(event.components)
                 else:
-                    next_event = VirtualTimeScheduler.Event(
-                        event.time + component.interval,
-                        component,
-                        'fire'
-                    )
-                    fires.append(component)
-
-                self.event_queue.put(next_event)
-            else:
-                break
+                    event.time = time + event.interval
+                    event.action = 'fire'
+                    fires.extend(event.components)
+
+                self.schedule(event)
 
-        
         for component in sleeps:
             component.output(time)
 
@@ -253,8 +999,9 @@ class VirtualTimeScheduler(Scheduler):
         self.supervisor.step()
 
         for component in fires:
-            component.train()
-            component.fire()
+            if component.is_ready():
+                component.train()
+                component.fire()
 
     def step(self, interval=0):
         """ Step with given interval or to the next event
@@ -271,12 +1018,12 @@ class VirtualTimeScheduler(Scheduler):
         """
 
         if interval == 0:
-            self.current_time = self.event_queue.queue[0].time
+            self.current_time = self.times[0]
             self.step_for_time(self.current_time)
         else:
             self.current_time += interval
-            while self.event_queue.queue[0].time <= self.current_time:
-                self.step_for_time(self.event_queue.queue[0].time)
+            while self.times[0] <= self.current_time:
+                self.step_for_time(self.times[0])
 
         return self.current_time
 
@@ -285,73 +1032,199 @@ class RealTimeSyncScheduler(Scheduler):
     """
     `RealTimeSyncScheduler` is a `Scheduler` implementation for real time
     in a synced manner.
+
+    Time is measured with a monotonic clock, `time.perf_counter_ns()` by
+    default, in milliseconds since the first step. The output of the n-th
+    step is scheduled at the absolute deadline `n * interval`, so the time
+    spent in each step and the jitter of `sleep()` do not accumulate.
+
+    When a step overruns its deadline, the `overrun` policy decides the next
+    deadline: `OVERRUN_CATCH_UP` keeps the original deadlines so that the
+    following steps run without sleeping until the schedule is met again,
+    and `OVERRUN_SKIP` moves on to the next deadline in the future, dropping
+    the missed ones.
+
+    The clock keeps running across `reset()` and `reset_statistics()`, so
+    the time never goes back for components which have been stepped.
     """
 
-    def __init__(self, agent, supervisor=NullSupervisor, interval=1):
+    def __init__(self, agent, supervisor=NullSupervisor, interval=1,
+                 executor=None, overrun=OVERRUN_CATCH_UP,
+                 clock=time.perf_counter_ns, sleep=time.sleep):
         """ Create a new `RealTimeSyncScheduler` Instance.
 
         Args:
-          interval (int): minimu interval in seconds between input and output
-          of the modules.
+          interval (int): interval in milliseconds between the outputs of
+            each step.
+          executor (Executor or int): an executor for the fire phase (see
+            `Scheduler`).
+          overrun (str): `OVERRUN_CATCH_UP` or `OVERRUN_SKIP`.
+          clock (callable): a monotonic clock in nanoseconds.
+          sleep (callable): a function sleeping for a number of seconds.
 
         Returns:
           RealTimeSyncScheduler: A new `RealTimeSyncScheduler` instance.
 
         """
 
-        self.last_input_time = -1
-        self.last_output_time = -1
-        self.last_spent = -1
-        self.last_dt = -1
+        if overrun not in (OVERRUN_CATCH_UP, OVERRUN_SKIP):
+            raise ValueError("Unknown overrun policy: {}".format(overrun))
 
         super(RealTimeSyncScheduler, self).__init__(
             agent,
             supervisor=NullSupervisor,
+            executor=executor,
         )
+        self.overrun = overrun
+        self.clock = clock
+        self.sleep = sleep
         self.set_interval(interval)
+        self.reset_statistics()
 
     def reset(self):
+        """ Reset the `Scheduler`.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        current_time = self.current_time
         super(RealTimeSyncScheduler, self).reset()
+        self.current_time = current_time
         self.set_interval(1)
+        self.reset_statistics()
+
+    def reset_statistics(self):
+        """ Restart the deadlines and clear the lag statistics.
+
+        The next step continues from the current time.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        self.num_steps = 0
+        self.origin = None
+        self.resume_time = self.current_time
+        self.deadline = None
+        self.last_input_time = -1
+        self.last_output_time = -1
+        self.last_spent = -1
+        self.lagged = False
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.overruns = 0
+        self.skipped = 0
 
     def set_interval(self, interval):
-        self.interval = int(interval)
-        assert self.interval > 0
+        """ Set the interval between the outputs of each step.
+
+        Args:
+          interval (int): interval in milliseconds.
+
+        Returns:
+          None.
+
+        """
+
+        if not interval > 0:
+            raise ValueError("The interval must be positive")
+
+        self.interval = interval
+        self.interval_ns = int(interval * 1000000)
+
+    def load_state(self, state, components):
+        """ Restore a state returned by `save_state()`.
+
+        The clock restarts on the next step, continuing from the saved time.
+
+        Args:
+          state (dict): a saved state.
+          components (dict): components keyed by their paths.
+
+        Returns:
+          None.
+
+        """
+
+        super(RealTimeSyncScheduler, self).load_state(state, components)
+        self.reset_statistics()
+
+    def elapsed(self, now):
+        """ Convert a clock value to milliseconds since the first step.
+
+        Args:
+          now (int): a value of `clock()`.
+
+        Returns:
+          float: milliseconds since the first step.
+
+        """
+
+        return (now - self.origin) / 1000000.0
+
+    def get_statistics(self):
+        """ Get the lag statistics of the steps so far.
+
+        Args:
+          None.
+
+        Returns:
+          dict: the number of steps, overruns, and skipped deadlines, and
+            the last, maximum, and mean lag of the outputs in milliseconds.
+
+        """
+
+        return {
+            'steps': self.num_steps,
+            'overruns': self.overruns,
+            'skipped': self.skipped,
+            'lag': self.lag,
+            'max_lag': self.max_lag,
+            'mean_lag': self.total_lag / self.num_steps if self.num_steps
+            else 0.0,
+        }
 
     def step(self):
         """ Step by the internal interval.
 
         The methods `input()`, `fire()`, and `output()` are synchronously
-        called for all components.
+        called for all components. `input()` is called immediately and
+        `output()` is called at the deadline of the step.
 
         The time when it started calling input() and output() of the
         components is stored in self.last_input_time and
-        self.last_output_time, respectively.
-
-        self.interval sets the *minimum* interval between the point in
-        time when input() is called and when output() is called.
-        The actual interval between input() and output() will
-        always be longer than self.interval, although the scheduler
-        tries to make the discrepancy minimum.
+        self.last_output_time, respectively, and the time spent until all
+        components are fired is stored in self.last_spent.
 
-        When calling fire() of the components takes longer than the
-        set interval, calling output() of the components will be
-        later than the scheduled time self.input_time + self.interval.
-        In this case, self.lagged will be set True.
-
-        During the execution of this method, it will also set self.last_spent,
-        which will be the time spent until all components are fired
-        after self.last_input_time is set.
+        When `fire()` takes longer than the deadline, self.lagged is set
+        True and the step is counted in self.overruns. self.lag holds how
+        late `output()` was called in milliseconds.
 
         Args:
           None.
 
         Returns:
-          int: the current time of the `Scheduler`.
+          float: the current time of the `Scheduler` in milliseconds.
 
         """
 
-        self.last_input_time = current_time()
+        start = self.clock()
+
+        if self.origin is None:
+            self.origin = start - int(self.resume_time * 1000000)
+            self.deadline = start + self.interval_ns
+
+        self.last_input_time = self.elapsed(start)
         self.current_time = self.last_input_time
 
         for component in self.components:
@@ -359,26 +1232,153 @@ class RealTimeSyncScheduler(Scheduler):
 
         self.supervisor.step()
 
-        for component in self.components:
-            component.train()
-            component.fire()
+        self.fire_components(self.components)
 
-        self.last_spent = current_time() - self.last_input_time
-        last_dt = self.interval - self.last_spent
+        now = self.clock()
+        self.last_spent = (now - start) / 1000000.0
+        deadline = self.deadline
 
-        self.lagged = False
-        if last_dt > 0:
-            time.sleep(last_dt / 1000.0)
-        elif last_dt < 0:
-            self.lagged = True
+        self.lagged = now > deadline
+        if self.lagged:
+            self.overruns += 1
+        else:
+            self.sleep((deadline - now) / 1000000000.0)
+            now = self.clock()
+
+        self.lag = max(now - deadline, 0) / 1000000.0
+        self.max_lag = max(self.max_lag, self.lag)
+        self.total_lag += self.lag
+        self.num_steps += 1
 
-        self.last_output_time = current_time()
+        self.last_output_time = self.elapsed(now)
         self.current_time = self.last_output_time
 
         for component in self.components:
             component.output(self.last_output_time)
 
-        self.last_output_time = current_time()
-        self.current_time = self.last_output_time
+        if self.lagged and self.overrun == OVERRUN_SKIP:
+            missed = (now - deadline) // self.interval_ns
+            self.skipped += missed
+            self.deadline = deadline + (missed + 1) * self.interval_ns
+        else:
+            self.deadline = deadline + self.interval_ns
+
+        return self.current_time
+
+
+class AsyncScheduler(Scheduler):
+    """
+    `AsyncScheduler` is a `Scheduler` implementation for virtual time in a
+    synced manner which runs the fire phase on an `asyncio` event loop.
+
+    The semantics of `VirtualTimeSyncScheduler` are kept: `input()` of all
+    components is called first, then the `fire()` coroutines of all
+    `AsyncComponent`s are awaited concurrently while the other components
+    fire as usual, and finally `output()` of all components is called.
+    """
+
+    fires_coroutines = True
+
+    def __init__(self, agent, supervisor=NullSupervisor, interval=1):
+        """ Create a new `AsyncScheduler` Instance.
+
+        Args:
+          interval (int): interval in milliseconds between each step
+
+        Returns:
+          AsyncScheduler: A new `AsyncScheduler` instance.
+
+        """
+
+        super(AsyncScheduler, self).__init__(
+            agent,
+            supervisor=NullSupervisor,
+        )
+        self.interval = interval
+        self.loop = None
+
+    def close(self):
+        """ Close the event loop used by `step()`.
+
+        Args:
+          None.
+
+        Returns:
+          None.
+
+        """
+
+        if self.loop is not None:
+            self.loop.close()
+            self.loop = None
+
+        super(AsyncScheduler, self).close()
+
+    async def fire_async(self, component):
+        """ Call `train()` and await `fire()` of an `AsyncComponent`.
+
+        Args:
+          component (AsyncComponent): a component to fire.
+
+        Returns:
+          None.
+
+        """
+
+        component.train()
+        await component.fire()
+
+    async def astep(self):
+        """ Step by the internal interval as a coroutine.
+
+        Args:
+          None.
+
+        Returns:
+          int: the current time of the `Scheduler`.
+
+        """
+
+        for component in self.components:
+            component.input(self.current_time)
+
+        self.supervisor.step()
+
+        coroutines = []
+
+        for component in self.components:
+            if not component.is_ready():
+                continue
+            if isinstance(component, AsyncComponent):
+                coroutines.append(self.fire_async(component))
+            else:
+                component.train()
+                component.fire()
+
+        await asyncio.gather(*coroutines)
+
+        self.current_time = self.current_time + self.interval
+
+        for component in self.components:
+            component.output(self.current_time)
 
         return self.current_time
+
+    def step(self):
+        """ Step by the internal interval.
+
+        Runs `astep()` to completion on an event loop owned by the
+        `Scheduler`. Use `astep()` directly from a running event loop.
+
+        Args:
+          None.
+
+        Returns:
+          int: the current time of the `Scheduler`.
+
+        """
+
+        if self.loop is None:
+            self.loop = asyncio.new_event_loop()
+
+        return self.loop.run_until_complete(self.astep())
@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+
+"""
+snapshot.py
+=====
+
+This module contains `save_snapshot()` and `load_snapshot()` which store the
+state of an `Agent` and its `Scheduler` in a single file and restore it.
+
+The file starts with a pickled header describing the agent, followed by the
+raw data of every `numpy.ndarray` aligned to 64 bytes. Arrays are restored
+as copy-on-write views of a `numpy.memmap` of the file, so restoring takes
+time proportional to the header only, pages are read lazily, and many
+agents restored from the same file share memory until they write to it.
+
+"""
+
+__all__ = ["save_snapshot", "load_snapshot"]
+
+import pickle
+import struct
+
+import numpy
+
+# BriCA imports
+from .component import Results
+
+MAGIC = b'BRICA1SS'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+PREAMBLE = struct.Struct('<8sIQ')
+
+
+def align(offset):
+    """ Round an offset up to `ALIGNMENT`.
+
+    Args:
+      offset (int): an offset in bytes.
+
+    Returns:
+      int: the aligned offset.
+
+    """
+
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class ArrayRef(object):
+    """
+    An `ArrayRef` stands for an array in the header of a snapshot.
+    """
+
+    __slots__ = ('offset', 'shape', 'dtype')
+
+    def __init__(self, offset, shape, dtype):
+        """ Create a new `ArrayRef` instance.
+
+        Args:
+          offset (int): the offset of the data from the start of the data
+            section.
+          shape (tuple): the shape of the array.
+          dtype (numpy.dtype): the data type of the array.
+
+        Returns:
+          ArrayRef: a new `ArrayRef` instance.
+
+        """
+
+        super(ArrayRef, self).__init__()
+        self.offset = offset
+        self.shape = shape
+        self.dtype = dtype
+
+    def __getstate__(self):
+        return (self.offset, self.shape, self.dtype)
+
+    def __setstate__(self, state):
+        self.offset, self.shape, self.dtype = state
+
+
+class SnapshotWriter(object):
+    """
+    A `SnapshotWriter` replaces the arrays in a value with `ArrayRef`s and
+    collects their data. An array referenced several times is stored once.
+    """
+
+    def __init__(self):
+        """ Create a new `SnapshotWriter` instance.
+
+        Args:
+          None.
+
+        Returns:
+          SnapshotWriter: a new `SnapshotWriter` instance.
+
+        """
+
+        super(SnapshotWriter, self).__init__()
+        self.arrays = []
+        self.refs = {}
+        self.size = 0
+
+    def pack(self, value):
+        """ Replace the arrays in dicts, lists, and tuples with `ArrayRef`s.
+
+        Args:
+          value (any): a value to pack.
+
+        Returns:
+          any: the packed value.
+
+        """
+
+        if isinstance(value, numpy.ndarray) and not value.dtype.hasobject:
+            ref = self.refs.get(id(value))
+            if ref is None:
+                self.size = align(self.size)
+                ref = ArrayRef(self.size, value.shape, value.dtype)
+                self.refs[id(value)] = ref
+                self.arrays.append((ref, value))
+                self.size += value.nbytes
+            return ref
+
+        if type(value) is dict:
+            return dict((key, self.pack(item)) for key, item in value.items())
+
+        if type(value) is list:
+            return [self.pack(item) for item in value]
+
+        if type(value) is tuple:
+            return tuple(self.pack(item) for item in value)
+
+        return value
+
+    def write(self, path, header):
+        """ Write a snapshot file.
+
+        Args:
+          path (str): a file path to write to.
+          header (dict): a packed header.
+
+        Returns:
+          None.
+
+        """
+
+        data = pickle.dumps(header, protocol=pickle.HIGHEST_PROTOCOL)
+        start = align(PREAMBLE.size + len(data))
+
+        with open(path, 'wb') as f:
+            f.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(data)))
+            f.write(data)
+
+            for ref, value in self.arrays:
+                f.write(b'\0' * (start + ref.offset - f.tell()))
+                f.write(numpy.ascontiguousarray(value).tobytes())
+
+
+class SnapshotReader(object):
+    """
+    A `SnapshotReader` reads the header of a snapshot file and replaces the
+    `ArrayRef`s with views of a copy-on-write memory map of the file.
+    """
+
+    def __init__(self, path):
+        """ Create a new `SnapshotReader` instance.
+
+        Args:
+          path (str): a snapshot file path.
+
+        Returns:
+          SnapshotReader: a new `SnapshotReader` instance.
+
+        """
+
+        super(SnapshotReader, self).__init__()
+
+        with open(path, 'rb') as f:
+            magic, version, length = PREAMBLE.unpack(f.read(PREAMBLE.size))
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError("Not a BriCA snapshot: {}".format(path))
+            self.header = pickle.loads(f.read(length))
+            end = f.seek(0, 2)
+
+        self.start = align(PREAMBLE.size + length)
+        self.map = None
+        self.arrays = {}
+
+        if end > self.start:
+            self.map = numpy.memmap(path, dtype=numpy.uint8, mode='c')
+
+    def unpack(self, value):
+        """ Replace the `ArrayRef`s in a packed value with arrays.
+
+        Args:
+          value (any): a packed value.
+
+        Returns:
+          any: the unpacked value.
+
+        """
+
+        if isinstance(value, ArrayRef):
+            array = self.arrays.get(value.offset)
+            if array is None:
+                dtype = numpy.dtype(value.dtype)
+                if self.map is None or 0 in value.shape:
+                    array = numpy.zeros(value.shape, dtype=dtype)
+                else:
+                    array = numpy.ndarray(value.shape, dtype=dtype,
+                                          buffer=self.map,
+                                          offset=self.start + value.offset)
+                self.arrays[value.offset] = array
+            return array
+
+        if type(value) is dict:
+            return dict((key, self.unpack(item))
+                        for key, item in value.items())
+
+        if type(value) is list:
+            return [self.unpack(item) for item in value]
+
+        if type(value) is tuple:
+            return tuple(self.unpack(item) for item in value)
+
+        return value
+
+
+def restore_port(port, value):
+    """ Restore the buffer of a `Port`.
+
+    Fixed ports keep their buffer and copy the value into it.
+
+    Args:
+      port (Port): a `Port` to restore.
+      value (any): the saved buffer.
+
+    Returns:
+      None.
+
+    """
+
+    if port.fixed:
+        numpy.copyto(port.buffer, value)
+        port.touch()
+    else:
+        port.buffer = value
+
+
+def save_snapshot(agent, path, scheduler=None):
+    """ Save the state of an `Agent` to a file.
+
+    The `states`, `results`, `inputs`, port buffers, and timing of every
+    component are saved, along with the state of `scheduler` if given (see
+    `Scheduler.save_state()`). Other attributes of the components are not.
+
+    The components are read in the calling process, so an agent run by a
+    `ProcessScheduler` must be saved with that scheduler, which raises a
+    `ValueError` once its workers have started.
+
+    Args:
+      agent (Agent): an `Agent` to save.
+      path (str): a file path to write to.
+      scheduler (Scheduler): a `Scheduler` of `agent` to save.
+
+    Returns:
+      None.
+
+    """
+
+    writer = SnapshotWriter()
+    paths = {}
+    components = {}
+
+    for name, component in agent.get_all_named_components():
+        paths[id(component)] = name
+        components[name] = {
+            'states': writer.pack(component.states),
+            'results': writer.pack(component.results),
+            'inputs': writer.pack(component.inputs),
+            'inplace_results': sorted(component.inplace_results),
+            'last_input_time': component.last_input_time,
+            'last_output_time': component.last_output_time,
+            'in_ports': dict((identifier, writer.pack(port.buffer))
+                             for identifier, port
+                             in component.in_ports.items()),
+            'out_ports': dict((identifier, writer.pack(port.buffer))
+                              for identifier, port
+                              in component.out_ports.items()),
+        }
+
+    header = {'components': components, 'scheduler': None}
+
+    if scheduler is not None:
+        header['scheduler'] = scheduler.save_state(paths)
+
+    writer.write(path, header)
+
+
+def load_snapshot(agent, path, scheduler=None):
+    """ Restore the state of an `Agent` from a file.
+
+    `agent` must have the same structure as the saved agent. Arrays are
+    restored as copy-on-write views of the file, except for the buffers of
+    fixed ports which are copied into place. An agent run by a
+    `ProcessScheduler` must be restored with that scheduler before its first
+    step.
+
+    Args:
+      agent (Agent): an `Agent` to restore.
+      path (str): a snapshot file path.
+      scheduler (Scheduler): a `Scheduler` of `agent` to restore.
+
+    Returns:
+      None.
+
+    """
+
+    reader = SnapshotReader(path)
+    header = reader.header
+    named_components = dict(agent.get_all_named_components())
+
+    # The scheduler is restored first, as it may reject the snapshot.
+    if scheduler is not None and header['scheduler'] is not None:
+        scheduler.load_state(header['scheduler'], named_components)
+
+    for name, saved in header['components'].items():
+        component = named_components.get(name)
+        if component is None:
+            raise ValueError("No component named {}".format(name))
+
+        component.states = reader.unpack(saved['states'])
+        component.results = reader.unpack(saved['results'])
+        component.inputs = reader.unpack(saved['inputs'])
+        component.inplace_results = set(saved['inplace_results'])
+        if component.track_results:
+            component.results = Results(component.results)
+            component.results.assigned -= component.inplace_results
+        component.last_input_time = saved['last_input_time']
+        component.last_output_time = saved['last_output_time']
+        component.inputs_changed = True
+        component.input_versions = None
+
+        for identifier, value in saved['in_ports'].items():
+            restore_port(component.in_ports[identifier],
+                         reader.unpack(value))
+
+        for identifier, value in saved['out_ports'].items():
+            restore_port(component.out_ports[identifier],
+                         reader.unpack(value))
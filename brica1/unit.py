@@ -13,8 +13,101 @@ __all__ = ["Unit"]
 
 import numpy
 
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
 # BriCA imports
-from .port import Port
+from .port import Port, DELIVERY_COPY, DELIVERY_VIEW
+
+
+def record_dtype(fields):
+    """ Make a structured dtype for the fields of a record.
+
+    Args:
+      fields (dict or numpy.dtype): a structured dtype, or a dict mapping
+        field names to a dtype or a (dtype, shape) tuple.
+
+    Returns:
+      numpy.dtype: a structured dtype.
+
+    """
+
+    if not isinstance(fields, dict):
+        dtype = numpy.dtype(fields)
+        if dtype.names is None:
+            raise ValueError("A record requires a structured dtype")
+        return dtype
+
+    descr = []
+    for name, field in fields.items():
+        if isinstance(field, tuple):
+            descr.append((name,) + field)
+        else:
+            descr.append((name, field))
+
+    return numpy.dtype(descr)
+
+
+def allocate(length, dtype, shape, fields=None):
+    """ Allocate a zero-filled port buffer.
+
+    Args:
+      length (int): a length of the buffer, or None.
+      dtype (numpy.dtype): a data type of the buffer.
+      shape (tuple): a shape of the buffer, or None to use `length`.
+      fields (dict or numpy.dtype): fields of a record overriding `dtype`
+        (see `record_dtype()`). The buffer is a single record by default.
+
+    Returns:
+      numpy.ndarray: a new buffer.
+
+    """
+
+    if fields is not None:
+        dtype = record_dtype(fields)
+        if shape is None and length is None:
+            shape = ()
+
+    if shape is None:
+        if length is None:
+            raise ValueError("Either length or shape is required")
+        shape = length
+
+    return numpy.zeros(shape, dtype=dtype)
+
+
+def share(shape, dtype, name=None):
+    """ Create or attach a shared memory segment holding an array.
+
+    Args:
+      shape (tuple): a shape of the array.
+      dtype (numpy.dtype): a data type of the array.
+      name (str): the name of an existing segment, or None to create one.
+
+    Returns:
+      tuple: a `SharedMemory` and a `numpy.ndarray` using it.
+
+    """
+
+    if shared_memory is None:
+        raise RuntimeError("Shared ports require multiprocessing.shared_memory")
+
+    dtype = numpy.dtype(dtype)
+    size = max(int(numpy.prod(shape)) * dtype.itemsize, 1)
+
+    if name is None:
+        segment = shared_memory.SharedMemory(create=True, size=size)
+    else:
+        segment = shared_memory.SharedMemory(name=name)
+
+    array = numpy.ndarray(shape, dtype=dtype, buffer=segment.buf)
+
+    if name is None:
+        array[...] = 0
+
+    return segment, array
 
 
 class Unit(object):
@@ -38,19 +131,87 @@ class Unit(object):
         self.in_ports = {}
         self.out_ports = {}
 
-    def make_in_port(self, id, length):
+    def make_in_port(self, id, length=None, dtype=numpy.short, shape=None,
+                     fixed=False, fields=None, delivery=DELIVERY_COPY,
+                     reduce=None):
         """ Make an in-port of this `Unit`.
 
         Args:
           id (str): a string ID.
           length (int): an initial length of the value vector.
+          dtype (numpy.dtype): a data type of the buffer.
+          shape (tuple): a shape of the buffer, overriding `length`.
+          fixed (bool): keep the shape and dtype of the buffer (see `Port`).
+            Connections copy into the buffer, and with `DELIVERY_COPY` the
+            array in `inputs` is reused on the next step unless `results` or
+            `states` hold it (see `Component.holds()`).
+          fields (dict or numpy.dtype): make a fixed port holding a record
+            of these fields in one contiguous buffer (see `record_dtype()`).
+          delivery (str): a delivery policy of the in-port (see `Port`).
+          reduce (str): accept multiple connections merged with a reduction
+            (see `FanInConnection`).
 
         Returns:
           None.
 
         """
 
-        self.in_ports[id] = Port(numpy.zeros(length, dtype=numpy.short))
+        self.in_ports[id] = Port(allocate(length, dtype, shape, fields),
+                                 delivery=delivery,
+                                 fixed=fixed or fields is not None,
+                                 reduce=reduce)
+
+    def make_mapped_in_port(self, id, path, dtype=numpy.short, shape=None,
+                            mode='r', delivery=DELIVERY_VIEW):
+        """ Make an in-port whose buffer is a memory-mapped file.
+
+        The file is paged in lazily and its pages are shared by every
+        process mapping it. The in-port should not be connected, since a
+        connection replaces the buffer. Call `Port.touch()` after the file
+        has been changed by other means to mark the buffer as changed.
+
+        Args:
+          id (str): a string ID.
+          path (str): a file path to map.
+          dtype (numpy.dtype): a data type of the buffer.
+          shape (tuple): a shape of the buffer, defaults to the whole file
+            as a vector.
+          mode (str): a `numpy.memmap` mode.
+          delivery (str): a delivery policy, `DELIVERY_VIEW` by default to
+            avoid copying the mapped data.
+
+        Returns:
+          None.
+
+        """
+
+        self.in_ports[id] = Port(numpy.memmap(path, dtype=dtype, mode=mode,
+                                              shape=shape),
+                                 delivery=delivery)
+
+    def make_shared_in_port(self, id, name, shape, dtype=numpy.short,
+                            delivery=DELIVERY_VIEW):
+        """ Make an in-port whose buffer is an existing shared memory segment.
+
+        The segment is usually created by `make_shared_out_port()` in another
+        process. See `make_mapped_in_port()` for caveats.
+
+        Args:
+          id (str): a string ID.
+          name (str): the name of the segment.
+          shape (tuple): a shape of the buffer.
+          dtype (numpy.dtype): a data type of the buffer.
+          delivery (str): a delivery policy, `DELIVERY_VIEW` by default.
+
+        Returns:
+          None.
+
+        """
+
+        segment, array = share(shape, dtype, name)
+        port = Port(array, delivery=delivery)
+        port.segment = segment
+        self.in_ports[id] = port
 
     def get_in_port(self, id):
         """ Get values in an in-port from this `Unit`.
@@ -92,19 +253,76 @@ class Unit(object):
 
         del self.in_ports[id]
 
-    def make_out_port(self, id, length):
+    def make_out_port(self, id, length=None, dtype=numpy.short, shape=None,
+                      fixed=False, fields=None, broadcast=False):
         """ Make an out-port of this `Unit`.
 
         Args:
           id (str): a string ID.
           length (int): an initial length of the value vector.
+          dtype (numpy.dtype): a data type of the buffer.
+          shape (tuple): a shape of the buffer, overriding `length`.
+          fixed (bool): keep the shape and dtype of the buffer, so results
+            are copied into it by `Component.output()` (see `Port`).
+          fields (dict or numpy.dtype): make a fixed port holding a record
+            of these fields in one contiguous buffer (see `record_dtype()`).
+            Results may be given as dicts of field values.
+          broadcast (bool): share a frozen snapshot of the buffer with all
+            connected in-ports (see `BroadcastConnection`).
+
+        Returns:
+          None.
+
+        """
+
+        self.out_ports[id] = Port(allocate(length, dtype, shape, fields),
+                                  fixed=fixed or fields is not None,
+                                  broadcast=broadcast)
+
+    def make_mapped_out_port(self, id, path, dtype=numpy.short, shape=None,
+                             mode='w+'):
+        """ Make a fixed out-port whose buffer is a memory-mapped file.
+
+        Results are copied into the mapped file by `Component.output()`.
+
+        Args:
+          id (str): a string ID.
+          path (str): a file path to map.
+          dtype (numpy.dtype): a data type of the buffer.
+          shape (tuple): a shape of the buffer.
+          mode (str): a `numpy.memmap` mode.
 
         Returns:
           None.
 
         """
 
-        self.out_ports[id] = Port(numpy.zeros(length, dtype=numpy.short))
+        self.out_ports[id] = Port(numpy.memmap(path, dtype=dtype, mode=mode,
+                                               shape=shape),
+                                  fixed=True)
+
+    def make_shared_out_port(self, id, shape, dtype=numpy.short):
+        """ Make a fixed out-port whose buffer is a new shared memory segment.
+
+        Results are copied into the segment by `Component.output()`. The
+        name of the segment is `get_out_port(id).segment.name`, and
+        `Port.release()` frees it.
+
+        Args:
+          id (str): a string ID.
+          shape (tuple): a shape of the buffer.
+          dtype (numpy.dtype): a data type of the buffer.
+
+        Returns:
+          None.
+
+        """
+
+        segment, array = share(shape, dtype)
+        port = Port(array, fixed=True)
+        port.segment = segment
+        port.owns_segment = True
+        self.out_ports[id] = port
 
     def get_out_port(self, id):
         """ Get values in an out-port from this `Unit`.
@@ -163,7 +381,8 @@ class Unit(object):
 
         to_port = self.get_in_port(to_id)
         from_port = target.get_in_port(from_id)
-        from_port.callbacks.extend(to_port.callbacks)
+        for f in to_port.callbacks:
+            from_port.register_callback(f)
         self.set_in_port(to_id, from_port)
 
     def alias_out_port(self, target, from_id, to_id):
@@ -183,17 +402,20 @@ class Unit(object):
 
         self.set_out_port(to_id, target.get_out_port(from_id))
 
-    def connect(self, target, from_id, to_id):
+    def connect(self, target, from_id, to_id, delay=False):
         """ Connect an out-port of another `Unit` to an in-port.
 
         Args:
           target (Unit): a `Unit` to connect to.
           from_id (str): an out-port of the target `Unit`.
           to_id(str): an in-port of this `Unit`.
+          delay (bool): make the connection a delay edge (see
+            `DelayedConnection`).
 
         Returns:
           None.
 
         """
 
-        self.get_in_port(to_id).connect(target.get_out_port(from_id))
+        self.get_in_port(to_id).connect(target.get_out_port(from_id),
+                                        delay=delay)
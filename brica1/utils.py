@@ -22,12 +22,13 @@ def current_time_millis():
     return int(time.time() * 1000)
 
 
-def connect(from_tuple, to_tuple):
+def connect(from_tuple, to_tuple, delay=False):
     """ Connect ports of two units
 
     Args:
       from_tuple (tuple<Unit, str>):  Unit and port id to connect from.
       to_tuple (tuple<Unit, str>): Unit and port id to connect to.
+      delay (bool): make the connection a delay edge.
 
     Returns:
       None.
@@ -37,7 +38,7 @@ def connect(from_tuple, to_tuple):
     from_unit, from_port = from_tuple
     to_unit, to_port = to_tuple
 
-    to_unit.connect(from_unit, from_port, to_port)
+    to_unit.connect(from_unit, from_port, to_port, delay=delay)
 
 
 def alias_in_port(from_tuple, to_tuple):
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+"""
+vectorized.py
+=====
+
+This module contains the `ComponentArray` which runs many identical
+components as one `Component` operating on stacked arrays, and the
+`ArrayElement` handles exposing the ports of each instance.
+
+"""
+
+__all__ = ["ComponentArray", "ArrayElement"]
+
+import numpy
+
+# BriCA imports
+from .component import Component
+from .port import Port, DELIVERY_COPY
+from .unit import Unit, allocate
+
+
+class ArrayElement(Unit):
+    """
+    An `ArrayElement` is a handle to one instance of a `ComponentArray`.
+
+    Its ports are the rows of the stacked ports of the array, so they can be
+    connected like the ports of any other `Unit`. It is obtained by indexing
+    the array, e.g. `array[3]`.
+    """
+
+    def __init__(self, array, index):
+        """ Create a new `ArrayElement` instance.
+
+        Args:
+          array (ComponentArray): the array this element belongs to.
+          index (int): the index of this element.
+
+        Returns:
+          ArrayElement: a new `ArrayElement` instance.
+
+        """
+
+        super(ArrayElement, self).__init__()
+        self.array = array
+        self.index = index
+
+    def get_state(self, identifier):
+        """ Get the state of this instance for the given ID.
+
+        Args:
+          identifier (str): a string ID.
+
+        Returns:
+          numpy.ndarray: a view of the row of the stacked state.
+
+        """
+
+        return self.array.states[identifier][self.index]
+
+    def set_state(self, identifier, value):
+        """ Set the state of this instance for the given ID.
+
+        Args:
+          identifier (str): a string ID.
+          value (any): a value to copy into the row of the stacked state.
+
+        Returns:
+          None.
+
+        """
+
+        self.array.states[identifier][self.index] = value
+
+
+class ComponentArray(Component):
+    """
+    `ComponentArray` is an abstract class for `size` identical components
+    fired with a single vectorized call. Subclasses must override `fire()`,
+    which works like `Component.fire()` on `inputs`, `states`, and `results`
+    holding arrays stacked along a first axis of length `size`.
+
+    Ports are declared with the shape of a single instance. The array holds
+    a stacked, fixed port for each of them which may be connected as a
+    whole, e.g. to another `ComponentArray` of the same size. The rows of
+    the stacked ports are exposed by the `ArrayElement`s (`array[i]`), and
+    an in-port must be connected either as a whole or by rows. The row ports
+    are registered in `in_ports` and `out_ports` as well under IDs like
+    'in[3]', so schedulers see every connection.
+    """
+
+    def __init__(self, size):
+        """ Create a new `ComponentArray` instance.
+
+        Args:
+          size (int): the number of instances.
+
+        Returns:
+          ComponentArray: a new `ComponentArray` instance.
+
+        """
+
+        super(ComponentArray, self).__init__()
+        self.size = size
+        self.elements = [ArrayElement(self, index) for index in range(size)]
+        self.stacked_in_ports = {}
+        self.in_rows = {}
+        self.out_rows = {}
+        self.gathers = {}
+        self.row_versions = {}
+
+    def __getitem__(self, index):
+        return self.elements[index]
+
+    def __len__(self):
+        return self.size
+
+    def make_in_port(self, id, length=None, dtype=numpy.short, shape=None,
+                     delivery=DELIVERY_COPY):
+        """ Make a stacked in-port and the in-ports of each instance.
+
+        Args:
+          id (str): a string ID.
+          length (int): a length of the value vector of an instance.
+          dtype (numpy.dtype): a data type of the buffer.
+          shape (tuple): a shape of the buffer of an instance, overriding
+            `length`.
+          delivery (str): a delivery policy of the stacked in-port.
+
+        Returns:
+          None.
+
+        """
+
+        row = allocate(length, dtype, shape)
+        gather = numpy.zeros((self.size,) + row.shape, dtype=row.dtype)
+
+        port = Port(gather, delivery=delivery, fixed=True)
+        self.in_ports[id] = port
+        self.stacked_in_ports[id] = port
+        self.gathers[id] = gather
+        self.row_versions[id] = [None] * self.size
+        self.in_rows[id] = []
+
+        for element in self.elements:
+            row_port = Port(row.copy(), fixed=True)
+            self.in_ports['{}[{}]'.format(id, element.index)] = row_port
+            element.in_ports[id] = row_port
+            self.in_rows[id].append(row_port)
+
+    def make_out_port(self, id, length=None, dtype=numpy.short, shape=None,
+                      broadcast=False):
+        """ Make a stacked out-port and the out-ports of each instance.
+
+        The out-ports of the instances are views of the rows of the stacked
+        out-port.
+
+        Args:
+          id (str): a string ID.
+          length (int): a length of the value vector of an instance.
+          dtype (numpy.dtype): a data type of the buffer.
+          shape (tuple): a shape of the buffer of an instance, overriding
+            `length`.
+          broadcast (bool): make broadcast ports (see `Port`).
+
+        Returns:
+          None.
+
+        """
+
+        row = allocate(length, dtype, shape)
+        buffer = numpy.zeros((self.size,) + row.shape, dtype=row.dtype)
+
+        self.out_ports[id] = Port(buffer, fixed=True, broadcast=broadcast)
+        self.out_rows[id] = []
+
+        for element in self.elements:
+            row_port = Port(buffer[element.index], fixed=True,
+                            broadcast=broadcast)
+            self.out_ports['{}[{}]'.format(id, element.index)] = row_port
+            element.out_ports[id] = row_port
+            self.out_rows[id].append(row_port)
+
+    def gather(self, identifier):
+        """ Copy the changed rows of an in-port into its stacked buffer.
+
+        Args:
+          identifier (str): a stacked in-port ID.
+
+        Returns:
+          None.
+
+        """
+
+        gather = self.gathers[identifier]
+        versions = self.row_versions[identifier]
+        changed = False
+
+        for index, row_port in enumerate(self.in_rows[identifier]):
+            row_port.sync()
+
+            if versions[index] != row_port.version:
+                versions[index] = row_port.version
+                numpy.copyto(gather[index], row_port.buffer,
+                             casting='same_kind')
+                changed = True
+
+        if changed:
+            self.in_ports[identifier].buffer = gather
+
+    def input(self, time):
+        """ Obtain the stacked inputs.
+
+        Stacked in-ports connected as a whole are synced as usual, the rows
+        of the other in-ports are gathered into the stacked buffers.
+
+        Args:
+          time (int): the scheduler's current time.
+
+        Returns:
+          None.
+
+        """
+
+        for identifier, in_port in self.stacked_in_ports.items():
+            if in_port.connection is None:
+                self.gather(identifier)
+            else:
+                in_port.sync()
+            in_port.invoke_callbacks()
+
+        self.deliver_inputs(self.stacked_in_ports)
+
+        assert self.last_input_time <= time, ("collect_input() captured a time"
+                                              " travel")
+        self.last_input_time = time
+
+    def output(self, time):
+        """ Expose the stacked results to the stacked out-ports.
+
+        The out-ports of the instances share the memory of the stacked
+        out-ports and are marked as changed.
+
+        Args:
+          time (int): the scheduler's current time.
+
+        Returns:
+          None.
+
+        """
+
+        if self.is_ready():
+            results = self.assigned_results()
+            tracked = self.track_results
+            assigned = results.assigned if tracked else ()
+
+            for identifier, rows in self.out_rows.items():
+                if identifier in results and (
+                        not tracked or identifier in assigned or
+                        identifier in self.inplace_results):
+                    out_port = self.out_ports[identifier]
+                    out_port.update(results[identifier])
+                    out_port.invoke_callbacks()
+                    for row_port in rows:
+                        row_port.touch()
+
+            if tracked:
+                assigned.clear()
+
+        assert self.last_output_time <= time, ("update_output() captured a"
+                                               " time travel")
+        self.last_output_time = time
@@ -0,0 +1,399 @@
+"""
+Benchmark suite for the BriCA schedulers.
+
+Every case builds an agent, warms it up, and measures the time per scheduler
+step with `time.perf_counter()`. The minimum and median of several repeats
+are reported, and results can be written as JSON and compared against a
+previous run:
+
+    python tests/benchmark_suite.py --output results.json
+    python tests/benchmark_suite.py --compare results.json --threshold 0.1
+
+With `--compare`, the exit status is 1 if a case got slower than the
+threshold.
+"""
+
+import sys, os
+import argparse
+import json
+import platform
+import random
+import statistics
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+import numpy as np
+import brica1
+from brica1.__version__ import __version__
+
+SEED = 0
+CASES = []
+
+
+def case(name, **params):
+    """ Register a benchmark case.
+
+    The decorated function receives `params` and returns a callable which
+    performs one step.
+    """
+
+    def register(build):
+        CASES.append((name, params, build))
+        return build
+
+    return register
+
+
+def constant(agent, name, value):
+    component = brica1.ConstantComponent()
+    component.set_state('out', value)
+    component.make_out_port('out', 1)
+    agent.add_component(name, component)
+    return component
+
+
+def pipe(agent, name):
+    component = brica1.PipeComponent()
+    component.make_in_port('in', 1)
+    component.make_out_port('out', 1)
+    component.set_map('in', 'out')
+    agent.add_component(name, component)
+    return component
+
+
+def null(agent, name, num_ports=1):
+    component = brica1.NullComponent()
+    for i in range(num_ports):
+        component.make_in_port('in{}'.format(i), 1)
+    agent.add_component(name, component)
+    return component
+
+
+def chain(scheduler_class, length, compile=False, **kwargs):
+    agent = brica1.Agent()
+    source = constant(agent, 'source', np.zeros(16, dtype=np.float32))
+    upstream = source
+
+    for i in range(length):
+        component = pipe(agent, 'pipe{}'.format(i))
+        brica1.connect((upstream, 'out'), (component, 'in'))
+        upstream = component
+
+    scheduler = scheduler_class(agent, **kwargs)
+    scheduler.update()
+
+    if compile:
+        scheduler.compile()
+
+    return scheduler.step
+
+
+for scheduler_class in (brica1.VirtualTimeSyncScheduler,
+                        brica1.TopologicalSyncScheduler,
+                        brica1.AsyncScheduler):
+    case('chain/' + scheduler_class.__name__, length=100)(
+        lambda length, scheduler_class=scheduler_class:
+        chain(scheduler_class, length))
+
+
+@case('chain/VirtualTimeSyncScheduler/compiled', length=100)
+def compiled_chain(length):
+    return chain(brica1.VirtualTimeSyncScheduler, length, compile=True)
+
+
+@case('chain/RealTimeSyncScheduler', length=100)
+def real_time_chain(length):
+    # A tiny interval makes every step overrun, so no time is spent sleeping
+    # and only the overhead of the scheduler is measured.
+    return chain(brica1.RealTimeSyncScheduler, length, interval=1e-6)
+
+
+@case('fan_out', width=200, size=1024)
+@case('fan_out/broadcast', width=200, size=1024, broadcast=True)
+def fan_out(width, size, broadcast=False):
+    agent = brica1.Agent()
+    source = constant(agent, 'source', np.zeros(size, dtype=np.float32))
+    source.make_out_port('out', 1, broadcast=broadcast)
+
+    for i in range(width):
+        sink = null(agent, 'sink{}'.format(i))
+        brica1.connect((source, 'out'), (sink, 'in0'))
+
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+    scheduler.update()
+    return scheduler.step
+
+
+@case('fan_in', width=200, size=1024)
+def fan_in(width, size):
+    agent = brica1.Agent()
+    sink = null(agent, 'sink', num_ports=width)
+
+    for i in range(width):
+        source = constant(agent, 'source{}'.format(i),
+                          np.zeros(size, dtype=np.float32))
+        brica1.connect((source, 'out'), (sink, 'in{}'.format(i)))
+
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+    scheduler.update()
+    return scheduler.step
+
+
+@case('hierarchy', depth=8, branching=2)
+def hierarchy(depth, branching):
+    agent = brica1.Agent()
+
+    def grow(module, level):
+        if level == depth:
+            source = constant(module, 'source', np.zeros(4, dtype=np.int16))
+            sink = null(module, 'sink')
+            brica1.connect((source, 'out'), (sink, 'in0'))
+            return
+
+        for i in range(branching):
+            submodule = brica1.Module()
+            module.add_submodule('m{}'.format(i), submodule)
+            grow(submodule, level + 1)
+
+    grow(agent, 0)
+
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+
+    def step():
+        scheduler.update()
+        scheduler.step()
+
+    return step
+
+
+class Leaky(brica1.Component):
+    def fire(self):
+        v = self.states['v']
+        v *= 0.5
+        v += self.inputs['in']
+        self.results['out'] = v
+
+
+class LeakyArray(brica1.ComponentArray):
+    def fire(self):
+        v = self.states['v']
+        v *= 0.5
+        v += self.inputs['in']
+        self.results['out'] = v
+
+
+@case('population/components', size=500)
+def population(size):
+    agent = brica1.Agent()
+    source = constant(agent, 'source', np.ones(1, dtype=np.float32))
+
+    for i in range(size):
+        component = Leaky()
+        component.set_state('v', np.zeros(1, dtype=np.float32))
+        component.make_in_port('in', 1, dtype=np.float32)
+        component.make_out_port('out', 1, dtype=np.float32)
+        brica1.connect((source, 'out'), (component, 'in'))
+        agent.add_component('leaky{}'.format(i), component)
+
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+    scheduler.update()
+    return scheduler.step
+
+
+@case('population/ComponentArray', size=500)
+def population_array(size):
+    agent = brica1.Agent()
+    source = constant(agent, 'source', np.ones((size, 1), dtype=np.float32))
+    source.make_out_port('out', shape=(size, 1), dtype=np.float32)
+
+    array = LeakyArray(size)
+    array.set_state('v', np.zeros((size, 1), dtype=np.float32))
+    array.make_in_port('in', 1, dtype=np.float32)
+    array.make_out_port('out', 1, dtype=np.float32)
+    brica1.connect((source, 'out'), (array, 'in'))
+    agent.add_component('array', array)
+
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+    scheduler.update()
+    return scheduler.step
+
+
+class Scale(brica1.Component):
+    def fire(self):
+        self.results['out'] = self.inputs['in'] * 0.5
+
+
+@case('fixed_chain/compiled', length=500, size=16)
+@case('fixed_chain/compiled/packed', length=500, size=16, pack=True)
+def fixed_chain(length, size, pack=False):
+    agent = brica1.Agent()
+    upstream = brica1.ConstantComponent()
+    upstream.set_state('out', np.ones(size, dtype=np.float32))
+    upstream.make_out_port('out', size, dtype=np.float32, fixed=True)
+    agent.add_component('source', upstream)
+
+    for i in range(length):
+        component = Scale()
+        component.make_in_port('in', size, dtype=np.float32, fixed=True)
+        component.make_out_port('out', size, dtype=np.float32, fixed=True)
+        brica1.connect((upstream, 'out'), (component, 'in'))
+        agent.add_component('scale{}'.format(i), component)
+        upstream = component
+
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+    scheduler.update()
+    scheduler.compile()
+
+    if pack:
+        scheduler.pack()
+
+    return scheduler.step
+
+
+@case('mixed_intervals', num_components=2000, period=1000)
+def mixed_intervals(num_components, period):
+    rng = random.Random(SEED)
+    agent = brica1.Agent()
+
+    for i in range(num_components):
+        component = brica1.NullComponent()
+        component.interval = rng.choice((10, 20, 50, 100, 250, 500))
+        component.offset = rng.randrange(component.interval)
+        agent.add_component('comp{}'.format(i), component)
+
+    scheduler = brica1.VirtualTimeScheduler(agent)
+    scheduler.update()
+
+    return lambda: scheduler.step(period)
+
+
+for dtype, shape in ((np.int16, (1024,)), (np.float32, (1024,)),
+                     (np.float64, (1024,)), (np.uint8, (256, 256, 3)),
+                     (np.float32, (256, 256, 3))):
+    def dtype_case(dtype=dtype, shape=shape):
+        agent = brica1.Agent()
+        source = constant(agent, 'source', np.zeros(shape, dtype=dtype))
+        sink = null(agent, 'sink')
+        brica1.connect((source, 'out'), (sink, 'in0'))
+
+        scheduler = brica1.VirtualTimeSyncScheduler(agent)
+        scheduler.update()
+        return scheduler.step
+
+    case('dtype/{}/{}'.format(np.dtype(dtype).name,
+                              'x'.join(str(n) for n in shape)))(dtype_case)
+
+
+def measure(build, params, repeat, number):
+    random.seed(SEED)
+    np.random.seed(SEED)
+
+    step = build(**params)
+
+    for _ in range(max(number // 10, 1)):
+        step()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            step()
+        timings.append((time.perf_counter() - start) / number)
+
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'repeat': repeat,
+        'number': number,
+    }
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'numpy': np.__version__,
+        'brica1': __version__,
+        'machine': platform.machine(),
+        'system': platform.system(),
+    }
+
+
+def compare(results, baseline, threshold):
+    baseline = dict((r['name'], r) for r in baseline['results'])
+    regressions = 0
+
+    print("{:<50} {:>14} {:>14} {:>8}".format(
+        "Case", "Baseline (us)", "Current (us)", "Ratio"))
+
+    for result in results:
+        previous = baseline.get(result['name'])
+        if previous is None:
+            print("{:<50} {:>14} {:>14.2f} {:>8}".format(
+                result['name'], "-", result['min'] * 1e6, "new"))
+            continue
+
+        ratio = result['min'] / previous['min']
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = " REGRESSION"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            flag = " improved"
+
+        print("{:<50} {:>14.2f} {:>14.2f} {:>8.2f}{}".format(
+            result['name'], previous['min'] * 1e6, result['min'] * 1e6,
+            ratio, flag))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('--output', help="write results as JSON")
+    parser.add_argument('--compare', help="compare with a JSON result file")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="relative slowdown reported as a regression")
+    parser.add_argument('--filter', default='',
+                        help="run only cases whose name contains this")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=100)
+    parser.add_argument('--quick', action='store_true',
+                        help="use few iterations, e.g. for smoke tests")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.repeat, args.number = 1, 2
+
+    results = []
+
+    for name, params, build in CASES:
+        if args.filter not in name:
+            continue
+
+        result = measure(build, params, args.repeat, args.number)
+        result['name'] = name
+        result['params'] = params
+        results.append(result)
+
+        if not args.compare:
+            print("{:<50} {:>12.2f} us/step (median {:.2f})".format(
+                name, result['min'] * 1e6, result['median'] * 1e6))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'environment': environment(), 'results': results}, f,
+                      indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
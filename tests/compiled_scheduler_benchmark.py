@@ -0,0 +1,52 @@
+import sys, os
+import timeit
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+import brica1
+
+NUM_COMPONENTS = 1000
+NUM_STEPS = 200
+
+
+def build(num_components):
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+
+    for i in range(num_components // 2):
+        compA = brica1.ConstantComponent()
+        compB = brica1.NullComponent()
+        mod = brica1.Module()
+
+        mod.add_component('compA', compA)
+        mod.add_component('compB', compB)
+
+        compA.make_out_port('out', 1)
+        compB.make_in_port('in', 1)
+
+        brica1.connect((compA, 'out'), (compB, 'in'))
+
+        agent.add_submodule('mod{}'.format(i), mod)
+
+    scheduler.update()
+
+    return scheduler
+
+
+def measure(scheduler):
+    scheduler.step()
+    spent = min(timeit.repeat(scheduler.step, number=NUM_STEPS, repeat=5))
+    return spent / NUM_STEPS
+
+
+if __name__ == '__main__':
+    for num_components in (NUM_COMPONENTS, NUM_COMPONENTS * 4):
+        scheduler = build(num_components)
+        interpreted = measure(scheduler)
+        scheduler.compile()
+        compiled = measure(scheduler)
+
+        print("{:>6} components: interpreted {:8.3f} ms/step, "
+              "compiled {:8.3f} ms/step ({:.2f}x)".format(
+                  num_components, interpreted * 1e3, compiled * 1e3,
+                  interpreted / compiled))
@@ -0,0 +1,105 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pytest
+import brica1
+
+class CounterComponent(brica1.Component):
+    def fire(self):
+        buffer = self.get_result_buffer('out', (4, 4), np.float32)
+        np.add(buffer, 1, out=buffer)
+
+def make_agent(delivery):
+    agent = brica1.Agent()
+    source = CounterComponent()
+    source.make_out_port('out', shape=(4, 4), dtype=np.float32,
+                         broadcast=True)
+    agent.add_component('source', source)
+
+    sinks = []
+    for i in range(3):
+        sink = brica1.NullComponent()
+        sink.make_in_port('in', shape=(4, 4), dtype=np.float32,
+                          delivery=delivery)
+        brica1.connect((source, 'out'), (sink, 'in'))
+        agent.add_component('sink{}'.format(i), sink)
+        sinks.append(sink)
+
+    return agent, source, sinks
+
+@pytest.mark.parametrize('delivery', [brica1.DELIVERY_COPY,
+                                      brica1.DELIVERY_VIEW])
+def test_shared_snapshot(delivery):
+    agent, source, sinks = make_agent(delivery)
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+    scheduler.update()
+
+    scheduler.step()
+    scheduler.step()
+
+    snapshot = sinks[0].get_input('in')
+    assert isinstance(sinks[0].get_in_port('in').connection,
+                      brica1.BroadcastConnection)
+    assert (snapshot == 1).all()
+    assert not snapshot.flags.writeable
+    assert snapshot is not source.get_out_port('out').buffer
+
+    for sink in sinks:
+        assert sink.get_input('in') is snapshot
+
+    scheduler.step()
+
+    # The source updates its out-port in place, the snapshot is unaffected.
+    assert (snapshot == 1).all()
+    assert (sinks[0].get_input('in') == 2).all()
+
+    with pytest.raises(ValueError):
+        sinks[0].get_input('in')[0, 0] = 0
+
+    value = sinks[1].get_mutable_input('in')
+    value[0, 0] = 0
+    assert sinks[2].get_input('in')[0, 0] == 2
+
+def test_freeze_once_per_version():
+    port = brica1.Port(np.zeros(3), broadcast=True)
+
+    snapshot = port.freeze()
+    assert port.freeze() is snapshot
+
+    port.update(np.ones(3))
+    assert port.freeze() is not snapshot
+    assert (port.freeze() == 1).all()
+    assert (snapshot == 0).all()
+
+def test_fixed_in_port(tmpdir):
+    agent = brica1.Agent()
+    source = CounterComponent()
+    source.make_out_port('out', shape=(4, 4), dtype=np.float32,
+                         broadcast=True)
+    sink = brica1.NullComponent()
+    sink.make_in_port('in', shape=(4, 4), dtype=np.float32, fixed=True)
+    brica1.connect((source, 'out'), (sink, 'in'))
+    agent.add_component('source', source)
+    agent.add_component('sink', sink)
+
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+    scheduler.update()
+
+    in_buffer = sink.get_in_port('in').buffer
+
+    for _ in range(3):
+        scheduler.step()
+
+    assert sink.get_in_port('in').buffer is in_buffer
+    assert in_buffer.flags.writeable
+    assert (in_buffer == 2).all()
+
+    path = str(tmpdir.join('agent.snapshot'))
+    agent.snapshot(path, scheduler)
+    scheduler.step()
+    agent.restore(path, scheduler)
+
+    assert sink.get_in_port('in').buffer is in_buffer
+    assert (in_buffer == 2).all()
@@ -0,0 +1,216 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pytest
+import brica1
+
+class SparseComponent(brica1.Component):
+    """ Publishes a new value every `period` fires. """
+
+    def __init__(self, period):
+        super(SparseComponent, self).__init__()
+        self.period = period
+        self.count = 0
+
+    def fire(self):
+        if self.count % self.period == 0:
+            self.results['out'] = np.full(3, self.count)
+        else:
+            self.results.pop('out', None)
+        self.count += 1
+
+class CountingComponent(brica1.Component):
+    def __init__(self):
+        super(CountingComponent, self).__init__()
+        self.fires = 0
+
+    def fire(self):
+        self.fires += 1
+        self.results['out'] = self.inputs['in'] * 2
+
+def test_sync_skips_unchanged():
+    CompA = brica1.NullComponent()
+    CompB = brica1.NullComponent()
+    CompA.make_out_port('out', 3)
+    CompB.make_in_port('in', 3)
+    brica1.connect((CompA, 'out'), (CompB, 'in'))
+
+    out_port = CompA.get_out_port('out')
+    in_port = CompB.get_in_port('in')
+
+    in_port.sync()
+    version = in_port.version
+    assert in_port.buffer is out_port.buffer
+
+    in_port.sync()
+    assert in_port.version == version
+
+    out_port.buffer = np.ones(3)
+    in_port.sync()
+    assert in_port.version != version
+    assert in_port.buffer is out_port.buffer
+
+    version = in_port.version
+    out_port.update(np.zeros(3))
+    in_port.sync()
+    assert in_port.version != version
+
+def test_view_reused():
+    CompA = brica1.NullComponent()
+    CompB = brica1.NullComponent()
+    CompA.make_out_port('out', 3)
+    CompB.make_in_port('in', 3, delivery=brica1.DELIVERY_VIEW)
+    brica1.connect((CompA, 'out'), (CompB, 'in'))
+
+    CompB.input(0)
+    view = CompB.get_input('in')
+    CompB.input(0)
+    assert CompB.get_input('in') is view
+
+    CompB.get_mutable_input('in')
+    CompB.input(0)
+    assert CompB.get_input('in') is not view
+    assert not CompB.get_input('in').flags.writeable
+
+# The topological scheduler delivers the first value of CompA on the first
+# step, together with the initial fire of CompB.
+@pytest.mark.parametrize('scheduler_class, compile, expected', [
+    (brica1.VirtualTimeSyncScheduler, False, 5),
+    (brica1.VirtualTimeSyncScheduler, True, 5),
+    (brica1.TopologicalSyncScheduler, False, 4),
+])
+def test_fire_on_change(scheduler_class, compile, expected):
+    agent = brica1.Agent()
+    scheduler = scheduler_class(agent)
+
+    CompA = SparseComponent(4)
+    CompB = CountingComponent()
+    CompC = CountingComponent()
+
+    CompA.make_out_port('out', 3)
+    CompB.make_in_port('in', 3)
+    CompB.make_out_port('out', 3)
+    CompC.make_in_port('in', 3)
+    CompC.make_out_port('out', 3)
+    CompB.fire_on_change = True
+    CompC.fire_on_change = True
+
+    brica1.connect((CompA, 'out'), (CompB, 'in'))
+    brica1.connect((CompB, 'out'), (CompC, 'in'))
+
+    agent.add_component('CompA', CompA)
+    agent.add_component('CompB', CompB)
+    agent.add_component('CompC', CompC)
+    scheduler.update()
+
+    if compile:
+        scheduler.compile()
+
+    for _ in range(16):
+        scheduler.step()
+
+    assert CompA.count == 16
+    assert CompB.fires == expected
+    assert CompC.fires <= 6
+    assert (CompC.get_out_port('out').buffer == 48).all()
+
+@pytest.mark.parametrize('compile', [False, True])
+@pytest.mark.parametrize('fixed', [False, True])
+def test_fire_on_change_constant(compile, fixed):
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+
+    CompA = brica1.ConstantComponent()
+    CompB = CountingComponent()
+
+    CompA.set_state('out', np.arange(3, dtype=np.short))
+    CompA.make_out_port('out', 3, fixed=fixed)
+    CompB.make_in_port('in', 3)
+    CompB.make_out_port('out', 3)
+    CompB.fire_on_change = True
+
+    brica1.connect((CompA, 'out'), (CompB, 'in'))
+    agent.add_component('CompA', CompA)
+    agent.add_component('CompB', CompB)
+    scheduler.update()
+
+    if compile:
+        scheduler.compile()
+
+    # Every component fires on the first step, before the constant arrives.
+    scheduler.step()
+    CompB.fires = 0
+
+    for _ in range(10):
+        scheduler.step()
+
+    assert CompB.fires == 1
+    assert (CompB.get_out_port('out').buffer == [0, 2, 4]).all()
+
+    CompA.set_state('out', np.ones(3, dtype=np.short))
+
+    for _ in range(10):
+        scheduler.step()
+
+    assert CompB.fires == 2
+    assert (CompB.get_out_port('out').buffer == 2).all()
+
+    # Setting the same object again outputs it again.
+    value = CompA.get_state('out')
+    value += 1
+    CompA.set_state('out', value, move=True)
+
+    for _ in range(10):
+        scheduler.step()
+
+    assert CompB.fires == 3
+    assert (CompB.get_out_port('out').buffer == 4).all()
+
+class MutatingComponent(brica1.Component):
+    def fire(self):
+        if 'out' in self.results:
+            value = self.results['out']
+            value += 1
+        else:
+            self.results['out'] = np.zeros(3)
+
+@pytest.mark.parametrize('track_results', [False, True])
+def test_mutated_result(track_results):
+    comp = MutatingComponent()
+    comp.track_results = track_results
+    comp.make_out_port('out', 3)
+    out_port = comp.get_out_port('out')
+
+    comp.fire()
+    comp.output(0)
+    version = out_port.version
+
+    comp.fire()
+    comp.output(0)
+
+    # Only untracked results are written again after mutating in place.
+    assert (out_port.version == version) == track_results
+    assert (out_port.buffer == 1).all()
+
+def test_results_assigned():
+    results = brica1.component.Results(a=0)
+    assert results.assigned == {'a'}
+
+    results.assigned.clear()
+    results['b'] = 1
+    results.update(c=2)
+    results.setdefault('d', 3)
+    results |= {'e': 4}
+    results.setdefault('a', 5)
+
+    assert results.assigned == {'b', 'c', 'd', 'e'}
+    assert results['a'] == 0
+
+    del results['b']
+    results.pop('c')
+    assert results.assigned == {'d', 'e'}
+
+    results.clear()
+    assert not results.assigned
@@ -0,0 +1,107 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pytest
+import brica1
+
+def make_pipeline(delivery):
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+
+    data = np.array([1, 2, 3], dtype=np.short)
+
+    CompA = brica1.ConstantComponent()
+    CompB = brica1.NullComponent()
+
+    ModA = brica1.Module()
+    ModA.add_component('CompA', CompA)
+    ModA.add_component('CompB', CompB)
+
+    CompA.set_state('out', data)
+    CompA.make_out_port('out', 3, fixed=True)
+    CompB.make_in_port('in', 3, delivery=delivery)
+    brica1.connect((CompA, 'out'), (CompB, 'in'))
+
+    agent.add_submodule('ModA', ModA)
+    scheduler.update()
+
+    scheduler.step()
+    scheduler.step()
+
+    return CompA, CompB
+
+def test_copy():
+    CompA, CompB = make_pipeline(brica1.DELIVERY_COPY)
+    value = CompB.get_input('in')
+
+    assert (value == [1, 2, 3]).all()
+    assert value.flags.writeable
+    assert not np.shares_memory(value, CompA.get_out_port('out').buffer)
+
+def test_view():
+    CompA, CompB = make_pipeline(brica1.DELIVERY_VIEW)
+    value = CompB.get_input('in')
+
+    assert (value == [1, 2, 3]).all()
+    assert not value.flags.writeable
+    assert np.shares_memory(value, CompA.get_out_port('out').buffer)
+
+    with pytest.raises(ValueError):
+        value[0] = 0
+
+def test_copy_on_write():
+    CompA, CompB = make_pipeline(brica1.DELIVERY_COW)
+    view = CompB.get_input('in')
+
+    assert not view.flags.writeable
+    assert np.shares_memory(view, CompA.get_out_port('out').buffer)
+
+    value = CompB.get_mutable_input('in')
+    value[0] = 0
+
+    assert CompB.get_mutable_input('in') is value
+    assert (CompB.get_input('in') == [0, 2, 3]).all()
+    assert (CompA.get_out_port('out').buffer == [1, 2, 3]).all()
+
+class MutatingComponent(brica1.Component):
+    def fire(self):
+        if 'out' in self.results:
+            self.results['out'] += 1
+        else:
+            self.results['out'] = np.arange(4)
+
+class ReaderComponent(brica1.Component):
+    def fire(self):
+        self.results['out'] = np.array(self.inputs['in'])
+
+@pytest.mark.parametrize('delivery', [brica1.DELIVERY_COPY,
+                                      brica1.DELIVERY_VIEW,
+                                      brica1.DELIVERY_COW])
+def test_mutated_result(delivery):
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+
+    CompA = MutatingComponent()
+    CompB = ReaderComponent()
+    CompA.make_out_port('out', 4)
+    CompB.make_in_port('in', 4, delivery=delivery)
+    CompB.make_out_port('out', 4)
+    brica1.connect((CompA, 'out'), (CompB, 'in'))
+
+    agent.add_component('CompA', CompA)
+    agent.add_component('CompB', CompB)
+    scheduler.update()
+
+    scheduler.step()
+    scheduler.step()
+
+    # CompA mutates the result it has output while CompB fires.
+    assert (CompB.get_result('out') == [0, 1, 2, 3]).all()
+    assert not np.shares_memory(CompB.get_input('in'),
+                                CompA.get_result('out'))
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        brica1.Port(np.zeros(3), delivery='unknown')
@@ -0,0 +1,112 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pytest
+import brica1
+
+def make_agent(reduce, **kwargs):
+    agent = brica1.Agent()
+    sink = brica1.NullComponent()
+    sink.make_in_port('in', 3, reduce=reduce, **kwargs)
+    agent.add_component('sink', sink)
+
+    sources = []
+    for i in range(3):
+        source = brica1.ConstantComponent()
+        source.set_state('out', np.arange(3, dtype=np.float32) + i)
+        source.make_out_port('out', 3)
+        brica1.connect((source, 'out'), (sink, 'in'))
+        agent.add_component('source{}'.format(i), source)
+        sources.append(source)
+
+    return agent, sources, sink
+
+@pytest.mark.parametrize('reduce, expected', [
+    ('sum', [3, 6, 9]),
+    ('mean', [1, 2, 3]),
+    ('max', [2, 3, 4]),
+    ('concatenate', [0, 1, 2, 1, 2, 3, 2, 3, 4]),
+    ('stack', [[0, 1, 2], [1, 2, 3], [2, 3, 4]]),
+])
+def test_reduce(reduce, expected):
+    agent, sources, sink = make_agent(reduce)
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+    scheduler.update()
+
+    scheduler.step()
+    scheduler.step()
+
+    connection = sink.get_in_port('in').connection
+    assert isinstance(connection, brica1.FanInConnection)
+    assert len(connection.from_ports) == 3
+    assert (sink.get_input('in') == np.array(expected)).all()
+
+    buffer = sink.get_in_port('in').buffer
+    sources[0].set_state('out', np.full(3, 10, dtype=np.float32))
+    scheduler.step()
+    scheduler.step()
+
+    assert sink.get_in_port('in').buffer is buffer
+    assert (sink.get_input('in') != np.array(expected)).any()
+
+def test_fixed_reduce():
+    agent, sources, sink = make_agent('sum', dtype=np.float32, fixed=True)
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+    scheduler.update()
+
+    buffer = sink.get_in_port('in').buffer
+    scheduler.step()
+    scheduler.step()
+
+    assert sink.get_in_port('in').buffer is buffer
+    assert (buffer == [3, 6, 9]).all()
+
+def test_topological_order():
+    agent, sources, sink = make_agent('sum')
+    scheduler = brica1.TopologicalSyncScheduler(agent)
+    scheduler.update()
+
+    assert scheduler.order[-1] is sink
+
+    scheduler.step()
+    assert (sink.get_input('in') == [3, 6, 9]).all()
+
+def test_invalid():
+    port = brica1.Port(np.zeros(3), reduce='sum')
+
+    with pytest.raises(ValueError):
+        port.connect(brica1.Port(np.zeros(3)), delay=True)
+
+    with pytest.raises(ValueError):
+        brica1.Port(np.zeros(3), reduce='median')
+
+@pytest.mark.parametrize('reduce, dtype, expected', [
+    ('mean', np.float32, [1, 2, 3]),
+    ('max', np.float32, [2, 3, 4]),
+    ('mean', np.int64, [1, 2, 3]),
+])
+def test_fixed_elementwise(reduce, dtype, expected):
+    agent = brica1.Agent()
+    sink = brica1.NullComponent()
+    sink.make_in_port('in', 3, dtype=dtype, fixed=True, reduce=reduce)
+    agent.add_component('sink', sink)
+
+    for i in range(3):
+        source = brica1.ConstantComponent()
+        source.set_state('out', np.arange(3, dtype=dtype) + i)
+        source.make_out_port('out', 3, dtype=dtype, fixed=True)
+        brica1.connect((source, 'out'), (sink, 'in'))
+        agent.add_component('source{}'.format(i), source)
+
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+    scheduler.update()
+
+    buffer = sink.get_in_port('in').buffer
+    scheduler.step()
+    scheduler.step()
+
+    assert sink.get_in_port('in').buffer is buffer
+    assert buffer.dtype == dtype
+    assert (buffer == expected).all()
@@ -0,0 +1,63 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import brica1
+
+class FrameComponent(brica1.Component):
+    def fire(self):
+        frames = self.inputs['frames']
+        self.results['out'] = frames[self.states['index']] * 2
+        self.states['index'] += 1
+
+def test_mapped(tmpdir):
+    path = str(tmpdir.join('frames.dat'))
+    np.arange(24, dtype=np.float32).reshape(4, 6).tofile(path)
+
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+
+    CompA = FrameComponent()
+    CompA.set_state('index', 0)
+    CompA.make_mapped_in_port('frames', path, dtype=np.float32, shape=(4, 6))
+    CompA.make_mapped_out_port('out', str(tmpdir.join('out.dat')),
+                               dtype=np.float32, shape=(6,))
+    agent.add_component('CompA', CompA)
+    scheduler.update()
+
+    scheduler.step()
+    scheduler.step()
+
+    frames = CompA.get_input('frames')
+    assert isinstance(CompA.get_in_port('frames').buffer, np.memmap)
+    assert not frames.flags.writeable
+    assert (frames[1] == np.arange(6, 12)).all()
+
+    out = np.fromfile(str(tmpdir.join('out.dat')), dtype=np.float32)
+    assert (out == np.arange(6, 12) * 2).all()
+
+def test_shared():
+    CompA = brica1.ConstantComponent()
+    CompA.set_state('out', np.full((2, 3), 7, dtype=np.int32))
+    CompA.make_shared_out_port('out', (2, 3), dtype=np.int32)
+
+    out_port = CompA.get_out_port('out')
+    name = out_port.segment.name
+
+    CompB = brica1.NullComponent()
+    CompB.make_shared_in_port('in', name, (2, 3), dtype=np.int32)
+
+    try:
+        CompA.fire()
+        CompA.output(0)
+        CompB.get_in_port('in').touch()
+        CompB.input(0)
+
+        assert (CompB.get_input('in') == 7).all()
+    finally:
+        CompB.get_in_port('in').release()
+        out_port.release()
+
+    assert out_port.segment is None
+    assert (out_port.buffer == 7).all()
@@ -0,0 +1,98 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pytest
+import brica1
+
+FIELDS = {
+    'observation': (np.float32, (4,)),
+    'mask': (np.bool_, (4,)),
+    'timestamp': np.int64,
+}
+
+class SensorComponent(brica1.Component):
+    def fire(self):
+        t = self.states['t']
+        self.results['out'] = {
+            'observation': np.arange(4) + t,
+            'mask': np.arange(4) % 2 == t % 2,
+            'timestamp': t,
+        }
+        self.states['t'] += 1
+
+class MaskComponent(brica1.Component):
+    def fire(self):
+        record = self.inputs['in']
+        self.results['out'] = record['observation'] * record['mask']
+
+def test_record():
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+
+    CompA = SensorComponent()
+    CompA.set_state('t', 0)
+    CompA.make_out_port('out', fields=FIELDS)
+
+    CompB = MaskComponent()
+    CompB.make_in_port('in', fields=FIELDS, delivery=brica1.DELIVERY_VIEW)
+    CompB.make_out_port('out', 4, dtype=np.float32)
+
+    brica1.connect((CompA, 'out'), (CompB, 'in'))
+    agent.add_component('CompA', CompA)
+    agent.add_component('CompB', CompB)
+    scheduler.update()
+
+    buffer = CompA.get_out_port('out').buffer
+    assert buffer.shape == ()
+    assert buffer.dtype.names == ('observation', 'mask', 'timestamp')
+
+    for _ in range(4):
+        scheduler.step()
+
+    assert CompA.get_out_port('out').buffer is buffer
+    record = CompB.get_input('in')
+    # The fixed in-port keeps its own copy of the record, which the view
+    # delivers without copying it again.
+    in_buffer = CompB.get_in_port('in').buffer
+    assert record['timestamp'] == 2
+    assert np.shares_memory(record['observation'], in_buffer)
+    assert not np.shares_memory(in_buffer, buffer)
+    assert (CompB.get_out_port('out').buffer == [2, 0, 4, 0]).all()
+
+def test_record_validation():
+    CompA = brica1.NullComponent()
+    CompB = brica1.NullComponent()
+    CompA.make_out_port('out', fields=FIELDS)
+    CompB.make_in_port('in', fields={'observation': (np.float32, (4,))})
+
+    with pytest.raises(ValueError):
+        brica1.connect((CompA, 'out'), (CompB, 'in'))
+
+    CompB.make_in_port('batch', 8, fields=np.dtype(
+        [('x', np.float32), ('y', np.float32)]))
+    assert CompB.get_in_port('batch').buffer.shape == (8,)
+
+    with pytest.raises(ValueError):
+        CompB.make_in_port('bad', fields=np.float32)
+
+def test_record_fields():
+    CompA = brica1.NullComponent()
+    CompA.make_out_port('out', fields=FIELDS)
+    out_port = CompA.get_out_port('out')
+
+    mask = np.ones(4, dtype=bool)
+    out_port.write({'observation': np.ones(4), 'mask': mask, 'timestamp': 1})
+    version = out_port.version
+
+    with pytest.raises(ValueError, match="timestamp"):
+        out_port.write({'observation': np.zeros(4), 'mask': ~mask})
+
+    with pytest.raises(ValueError, match="extra"):
+        out_port.write({'observation': np.zeros(4), 'mask': ~mask,
+                        'timestamp': 2, 'extra': 0})
+
+    assert out_port.version == version
+    assert out_port.buffer['timestamp'] == 1
+    assert out_port.buffer['mask'].all()
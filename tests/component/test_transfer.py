@@ -0,0 +1,89 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import brica1
+
+class CounterComponent(brica1.Component):
+    def fire(self):
+        buffer = self.get_result_buffer('out', (3,), np.float32)
+        np.add(buffer, 1, out=buffer)
+
+def test_move():
+    comp = brica1.NullComponent()
+    data = np.array([1, 2, 3])
+
+    comp.set_state('state', data, move=True)
+    comp.publish('out', data)
+
+    assert comp.get_state('state') is data
+    assert comp.get_result('out') is data
+
+    comp.set_result('out', data)
+
+    assert comp.get_result('out') is not data
+
+def test_inplace():
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+
+    CompA = CounterComponent()
+    CompB = brica1.NullComponent()
+
+    CompA.make_out_port('out', 3)
+    CompB.make_in_port('in', 3)
+    brica1.connect((CompA, 'out'), (CompB, 'in'))
+
+    agent.add_component('CompA', CompA)
+    agent.add_component('CompB', CompB)
+    scheduler.update()
+
+    scheduler.step()
+    buffer = CompA.get_result('out')
+    port_buffer = CompA.get_out_port('out').buffer
+
+    assert port_buffer is not buffer
+
+    for _ in range(3):
+        scheduler.step()
+
+    assert CompA.get_result('out') is buffer
+    assert CompA.get_out_port('out').buffer is port_buffer
+    assert (port_buffer == 4).all()
+    assert (CompB.get_input('in') == 3).all()
+
+def test_update_result():
+    comp = brica1.NullComponent()
+
+    comp.update_result('out', np.zeros(3))
+    buffer = comp.get_result('out')
+    comp.update_result('out', np.ones(3))
+
+    assert comp.get_result('out') is buffer
+    assert (buffer == 1).all()
+
+    comp.update_result('out', np.ones(4))
+
+    assert comp.get_result('out') is not buffer
+
+def test_update_non_array():
+    port = brica1.Port(np.zeros(3))
+
+    port.update(5)
+    assert port.buffer == 5
+
+    port.update({'a': 1})
+    assert port.buffer == {'a': 1}
+
+def test_functor_inplace():
+    comp = brica1.component.FunctorComponent(lambda inputs: {'out': 5})
+    comp.make_out_port('out', 3)
+
+    comp.get_result_buffer('out', (3,), np.float32)
+    comp.fire()
+
+    assert not comp.inplace_results
+
+    comp.output(0)
+    assert comp.get_out_port('out').buffer == 5
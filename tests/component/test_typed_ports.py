@@ -0,0 +1,152 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pytest
+import brica1
+
+class RampComponent(brica1.Component):
+    def fire(self):
+        self.results['out'] = np.full((2, 3), self.states['count'],
+                                      dtype=np.float64)
+        self.states['count'] += 1
+
+def test_declare():
+    comp = brica1.NullComponent()
+    comp.make_in_port('in', shape=(2, 3), dtype=np.float32, fixed=True)
+    comp.make_out_port('out', 4, dtype=np.uint8)
+
+    in_port = comp.get_in_port('in')
+    out_port = comp.get_out_port('out')
+
+    assert in_port.buffer.shape == (2, 3)
+    assert in_port.buffer.dtype == np.float32
+    assert in_port.fixed
+    assert out_port.buffer.shape == (4,)
+    assert out_port.buffer.dtype == np.uint8
+    assert not out_port.fixed
+
+    with pytest.raises(ValueError):
+        comp.make_in_port('bad')
+
+def test_connect_validation():
+    CompA = brica1.NullComponent()
+    CompB = brica1.NullComponent()
+
+    CompA.make_out_port('out', shape=(2, 3), dtype=np.float32, fixed=True)
+    CompB.make_in_port('shape', shape=(3, 2), dtype=np.float32, fixed=True)
+    CompB.make_in_port('dtype', shape=(2, 3), dtype=np.int32, fixed=True)
+    CompB.make_in_port('ok', shape=(2, 3), dtype=np.float64, fixed=True)
+
+    with pytest.raises(ValueError):
+        brica1.connect((CompA, 'out'), (CompB, 'shape'))
+
+    with pytest.raises(ValueError):
+        brica1.connect((CompA, 'out'), (CompB, 'dtype'))
+
+    brica1.connect((CompA, 'out'), (CompB, 'ok'))
+
+def test_preallocated():
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+
+    CompA = RampComponent()
+    CompB = brica1.NullComponent()
+
+    CompA.set_state('count', 1)
+    CompA.make_out_port('out', shape=(2, 3), dtype=np.float32, fixed=True)
+    CompB.make_in_port('in', shape=(2, 3), dtype=np.float32, fixed=True)
+    brica1.connect((CompA, 'out'), (CompB, 'in'))
+
+    agent.add_component('CompA', CompA)
+    agent.add_component('CompB', CompB)
+    scheduler.update()
+
+    out_buffer = CompA.get_out_port('out').buffer
+    in_buffer = CompB.get_in_port('in').buffer
+
+    scheduler.step()
+    scheduler.step()
+    inputs = CompB.get_input('in')
+
+    for count in range(2, 5):
+        assert (CompB.get_input('in') == count - 1).all()
+        assert CompB.get_input('in') is inputs
+        assert CompA.get_out_port('out').buffer is out_buffer
+        assert CompB.get_in_port('in').buffer is in_buffer
+        assert (in_buffer == count - 1).all()
+        assert out_buffer.dtype == np.float32
+        scheduler.step()
+
+    CompA.results['out'] = np.zeros(3)
+
+    with pytest.raises(ValueError):
+        CompA.output(scheduler.current_time)
+
+def test_fixed_pipe():
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+
+    CompA = RampComponent()
+    CompB = brica1.PipeComponent()
+    CompC = brica1.NullComponent()
+
+    CompA.set_state('count', 1)
+    CompA.make_out_port('out', shape=(2, 3), dtype=np.float64, fixed=True)
+    CompB.make_in_port('in', shape=(2, 3), dtype=np.float64, fixed=True)
+    CompB.make_out_port('out', shape=(2, 3), dtype=np.float64)
+    CompB.set_map('in', 'out')
+    CompC.make_in_port('in', shape=(2, 3), dtype=np.float64)
+    brica1.connect((CompA, 'out'), (CompB, 'in'))
+    brica1.connect((CompB, 'out'), (CompC, 'in'))
+
+    agent.add_component('CompA', CompA)
+    agent.add_component('CompB', CompB)
+    agent.add_component('CompC', CompC)
+    scheduler.update()
+
+    for _ in range(3):
+        scheduler.step()
+
+    assert (CompC.get_input('in') == 1).all()
+
+    # The next input of CompB is not copied into the array it has output.
+    out_buffer = CompB.get_out_port('out').buffer
+    value = out_buffer.copy()
+    CompB.input(scheduler.current_time)
+
+    assert (CompB.get_input('in') == 3).all()
+    assert (out_buffer == value).all()
+
+class KeepingComponent(brica1.Component):
+    def fire(self):
+        self.states['first'] = self.states.get('first', self.inputs['in'])
+        self.results['out'] = self.inputs['in'][0]
+
+def test_held_inputs():
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+
+    CompA = RampComponent()
+    CompB = KeepingComponent()
+
+    CompA.set_state('count', 1)
+    CompA.make_out_port('out', shape=(2, 3), dtype=np.float64, fixed=True)
+    CompB.make_in_port('in', shape=(2, 3), dtype=np.float64, fixed=True)
+    CompB.make_out_port('out', 3)
+    brica1.connect((CompA, 'out'), (CompB, 'in'))
+
+    agent.add_component('CompA', CompA)
+    agent.add_component('CompB', CompB)
+    scheduler.update()
+
+    for _ in range(4):
+        scheduler.step()
+
+    # Arrays held in states and results are not overwritten by new inputs.
+    assert (CompB.get_state('first') == 0).all()
+    assert (CompB.get_result('out') == 3).all()
+    assert (CompB.get_input('in') == 3).all()
+    assert not np.shares_memory(CompB.get_result('out'),
+                                CompB.get_state('first'))
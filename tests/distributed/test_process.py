@@ -0,0 +1,165 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pytest
+import brica1
+
+class PidComponent(brica1.Component):
+    def __init__(self):
+        super(PidComponent, self).__init__()
+        self.make_out_port('pid', 1, dtype=np.int64, fixed=True)
+
+    def fire(self):
+        self.results['pid'] = np.array([os.getpid()], dtype=np.int64)
+
+def build(scheduler_class, **kwargs):
+    agent = brica1.Agent()
+    data = np.array([1, 2, 3], dtype=np.short)
+
+    CompA = brica1.ConstantComponent()
+    CompB = brica1.PipeComponent()
+    CompC = brica1.PipeComponent()
+    PidA = PidComponent()
+    PidC = PidComponent()
+
+    ModA = brica1.Module()
+    ModB = brica1.Module()
+    ModC = brica1.Module()
+
+    ModA.add_component('CompA', CompA)
+    ModA.add_component('PidA', PidA)
+    ModB.add_component('CompB', CompB)
+    ModC.add_component('CompC', CompC)
+    ModC.add_component('PidC', PidC)
+
+    CompA.set_state('out', data)
+    CompA.make_out_port('out', 3, fixed=True)
+    CompB.make_in_port('in', 3)
+    CompB.make_out_port('out', 3, fixed=True)
+    CompB.set_map('in', 'out')
+    CompC.make_in_port('in', 3)
+    CompC.make_out_port('out', 3, fixed=True)
+    CompC.set_map('in', 'out')
+
+    brica1.connect((CompA, 'out'), (CompB, 'in'))
+    brica1.connect((CompB, 'out'), (CompC, 'in'))
+
+    agent.add_submodule('ModA', ModA)
+    agent.add_submodule('ModB', ModB)
+    agent.add_submodule('ModC', ModC)
+
+    scheduler = scheduler_class(agent, **kwargs)
+    return scheduler, CompC, PidA, PidC
+
+def test_process():
+    expected, expected_c, _, _ = build(brica1.VirtualTimeSyncScheduler)
+    actual, actual_c, pid_a, pid_c = build(brica1.ProcessScheduler)
+
+    actual.export(actual_c, 'out')
+    actual.export(pid_a, 'pid')
+    actual.export(pid_c, 'pid')
+
+    try:
+        for _ in range(4):
+            assert expected.step() == actual.step()
+            assert (expected_c.get_out_port('out').buffer ==
+                    actual_c.get_out_port('out').buffer).all()
+
+        pids = set([pid_a.get_out_port('pid').buffer[0],
+                    pid_c.get_out_port('pid').buffer[0], os.getpid()])
+        assert len(pids) == 3
+    finally:
+        actual.close()
+
+    assert (actual_c.get_out_port('out').buffer == [1, 2, 3]).all()
+
+def test_shape_mismatch():
+    scheduler, CompC, _, _ = build(brica1.ProcessScheduler)
+    scheduler.agent.get_submodule('ModA').get_component(
+        'CompA').set_state('out', np.zeros(4, dtype=np.short))
+
+    try:
+        with pytest.raises(RuntimeError):
+            scheduler.step()
+            scheduler.step()
+    finally:
+        scheduler.close()
+
+class CountingComponent(brica1.Component):
+    def __init__(self):
+        super(CountingComponent, self).__init__()
+        self.fire_on_change = True
+        self.fires = 0
+        self.make_in_port('in', 3)
+        self.make_out_port('count', 1, dtype=np.int64, fixed=True)
+
+    def fire(self):
+        self.fires += 1
+        self.results['count'] = np.array([self.fires])
+
+def test_fire_on_change():
+    agent = brica1.Agent()
+
+    CompA = brica1.ConstantComponent()
+    CompA.set_state('out', np.array([1, 2, 3], dtype=np.short))
+    CompA.make_out_port('out', 3, fixed=True)
+    CompB = CountingComponent()
+    brica1.connect((CompA, 'out'), (CompB, 'in'))
+
+    ModA = brica1.Module()
+    ModB = brica1.Module()
+    ModA.add_component('CompA', CompA)
+    ModB.add_component('CompB', CompB)
+    agent.add_submodule('ModA', ModA)
+    agent.add_submodule('ModB', ModB)
+
+    scheduler = brica1.ProcessScheduler(agent)
+    scheduler.export(CompB, 'count')
+
+    try:
+        for _ in range(6):
+            scheduler.step()
+    finally:
+        scheduler.close()
+
+    # CompB fires on the first step and once more when the constant arrives.
+    assert CompB.get_out_port('count').buffer[0] == 2
+
+def test_unfixed_port():
+    scheduler, _, _, _ = build(brica1.ProcessScheduler)
+    CompA = scheduler.agent.get_submodule('ModA').get_component('CompA')
+    CompA.make_out_port('out', 3)
+    brica1.connect((CompA, 'out'),
+                   (scheduler.agent.get_submodule('ModB').get_component(
+                       'CompB'), 'in'))
+
+    try:
+        with pytest.raises(ValueError):
+            scheduler.step()
+    finally:
+        scheduler.close()
+
+def test_snapshot(tmpdir):
+    scheduler, _, _, _ = build(brica1.ProcessScheduler)
+    agent = scheduler.agent
+    path = str(tmpdir.join('agent.snapshot'))
+
+    # Before the workers start the main process holds the components.
+    agent.snapshot(path, scheduler)
+    agent.restore(path, scheduler)
+
+    try:
+        scheduler.step()
+
+        with pytest.raises(ValueError):
+            agent.snapshot(path, scheduler)
+
+        with pytest.raises(ValueError):
+            agent.restore(path, scheduler)
+    finally:
+        scheduler.close()
+
+    with pytest.raises(ValueError):
+        agent.snapshot(path, scheduler)
@@ -0,0 +1,273 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pytest
+
+try:
+    import gym
+except ImportError:
+    gym = pytest.importorskip('gymnasium')
+
+import brica1
+from brica1 import brica_gym
+
+class CountingEnv(gym.Env):
+    """ Observes the number of steps; an episode lasts `length` steps and
+    the reward is the action. """
+
+    def __init__(self, length, discrete=True):
+        self.length = length
+        self.t = 0
+        self.observation_space = gym.spaces.Box(0.0, np.inf, shape=(2,),
+                                                dtype=np.float32)
+        if discrete:
+            self.action_space = gym.spaces.Discrete(3)
+        else:
+            self.action_space = gym.spaces.Box(-1.0, 1.0, shape=(2,),
+                                               dtype=np.float32)
+        self.actions = []
+        self.closed = False
+
+    def observe(self):
+        return np.array([self.t, self.length], dtype=np.float32)
+
+    def reset(self, seed=None, options=None):
+        self.t = 0
+        return self.observe(), {}
+
+    def step(self, action):
+        if not self.action_space.contains(action):
+            raise ValueError("Invalid action: {!r}".format(action))
+        self.actions.append(action)
+        self.t += 1
+        reward = float(np.sum(action))
+        return self.observe(), reward, self.t >= self.length, False, {}
+
+    def close(self):
+        self.closed = True
+
+class FailingEnv(CountingEnv):
+    def step(self, action):
+        raise RuntimeError("broken env")
+
+class BatchPolicy(brica1.Component):
+    """ Takes action 2 in every env and records the observed steps. """
+
+    def __init__(self, num_envs):
+        super(BatchPolicy, self).__init__()
+        for id in ('observation', 'reward', 'done'):
+            self.make_in_port(id, 1)
+        self.make_out_port('action', shape=(num_envs, 1), dtype=np.float32)
+        self.num_envs = num_envs
+        self.seen = []
+
+    def fire(self):
+        self.seen.append(self.inputs['observation'][:, 0].copy())
+        self.results['action'] = np.full((self.num_envs, 1), 2,
+                                         dtype=np.float32)
+
+def test_to_action():
+    discrete = CountingEnv(1)
+    action = brica_gym.to_action(discrete, np.array([2], dtype=np.float32), 1)
+    assert type(action) is int and action == 2
+    assert discrete.action_space.contains(action)
+
+    one_hot = np.array([0, 1, 0], dtype=np.float32)
+    assert brica_gym.to_action(discrete, one_hot, 1) == 2
+    assert brica_gym.to_action(discrete, np.zeros(3), 1) == 0
+
+    box = CountingEnv(1, discrete=False)
+    value = np.array([0.5, -0.5], dtype=np.float32)
+    assert brica_gym.to_action(box, value, 2) is value
+
+def test_step_auto_reset():
+    env = CountingEnv(2)
+    env.reset()
+
+    observation, reward, done, info = brica_gym.step_auto_reset(
+        env, np.array([1], dtype=np.float32), 1)
+    assert (observation == [1, 2]).all()
+    assert reward == 1.0 and not done
+    assert 'final_observation' not in info
+
+    observation, reward, done, info = brica_gym.step_auto_reset(
+        env, np.array([1], dtype=np.float32), 1)
+    assert done
+    assert (info['final_observation'] == [2, 2]).all()
+    assert (observation == [0, 2]).all()
+    assert env.actions == [1, 1]
+
+@pytest.mark.parametrize('processes', [False, True])
+def test_vec_env(processes):
+    policy = BatchPolicy(3)
+    env_fns = [lambda length=length: CountingEnv(length)
+               for length in (1, 2, 3)]
+    agent = brica_gym.VecGymAgent(policy, env_fns, processes=processes)
+    scheduler = brica1.TopologicalSyncScheduler(agent)
+    scheduler.update()
+
+    env = agent.env
+    observations, dones = [], []
+
+    try:
+        for _ in range(4):
+            scheduler.step()
+            observations.append(env.get_out_port('observation').buffer[:, 0]
+                                .copy())
+            dones.append(env.get_out_port('done').buffer.copy())
+            assert (env.get_out_port('reward').buffer == 2).all()
+    finally:
+        agent.close()
+
+    # Each env is reset as soon as its episode of 1, 2, or 3 steps ends.
+    assert np.array_equal(observations, [[0, 1, 1], [0, 0, 2], [0, 1, 0],
+                                         [0, 0, 1]])
+    assert np.array_equal(dones, [[1, 0, 0], [1, 1, 0], [1, 0, 1],
+                                  [1, 1, 0]])
+    assert (env.infos[0]['final_observation'] == [1, 1]).all()
+
+    # The policy sees the observations of the previous step.
+    assert np.array_equal(policy.seen, [[0, 0, 0]] + observations[:3])
+
+def test_vec_env_worker_failure():
+    policy = BatchPolicy(2)
+    env_fns = [lambda: CountingEnv(2), lambda: FailingEnv(2)]
+    agent = brica_gym.VecGymAgent(policy, env_fns, processes=True)
+    scheduler = brica1.TopologicalSyncScheduler(agent)
+    scheduler.update()
+
+    try:
+        with pytest.raises(RuntimeError, match="broken env"):
+            scheduler.step()
+    finally:
+        agent.close()
+
+class PushPolicy(brica1.Component):
+    """ Always pushes the carts of a batch of CartPole envs to the right. """
+
+    def __init__(self, num_envs):
+        super(PushPolicy, self).__init__()
+        for id in ('observation', 'reward', 'done'):
+            self.make_in_port(id, 1)
+        self.make_out_port('action', shape=(num_envs, 1), dtype=np.float32)
+        self.num_envs = num_envs
+
+    def fire(self):
+        self.results['action'] = np.ones((self.num_envs, 1), dtype=np.float32)
+
+@pytest.mark.parametrize('processes', [False, True])
+def test_vec_cartpole(processes):
+    policy = PushPolicy(2)
+    env_fns = [lambda: gym.make('CartPole-v1')] * 2
+    agent = brica_gym.VecGymAgent(policy, env_fns, processes=processes)
+    scheduler = brica1.TopologicalSyncScheduler(agent)
+    scheduler.update()
+
+    env = agent.env
+    dones = []
+
+    try:
+        for _ in range(50):
+            scheduler.step()
+            assert env.get_out_port('observation').buffer.shape == (2, 4)
+            assert (env.get_out_port('reward').buffer == 1).all()
+            dones.append(env.get_out_port('done').buffer.copy())
+    finally:
+        agent.close()
+
+    # Pushing in one direction drops the pole within a few dozen steps.
+    assert np.array(dones).any(axis=0).all()
+
+class StepPolicy(brica1.Component):
+    """ Chooses the action from the observed step count. """
+
+    def __init__(self):
+        super(StepPolicy, self).__init__()
+        self.make_in_port('observation', 2)
+        self.make_in_port('reward', 1)
+        self.make_in_port('done', 1)
+        self.make_out_port('action', 1)
+        self.seen = []
+
+    def fire(self):
+        observation = self.inputs['observation']
+        self.seen.append(int(observation[0]))
+        self.results['action'] = np.array([int(observation[0]) % 3])
+
+def test_lockstep():
+    env = CountingEnv(4)
+    policy = StepPolicy()
+    agent = brica_gym.LockstepGymAgent(policy, env, obs_dim=2)
+    scheduler = brica1.TopologicalSyncScheduler(agent)
+    scheduler.update()
+
+    for _ in range(3):
+        scheduler.step()
+
+    # The model acts on the observation of the same step, and the env
+    # steps with that action before the next step begins.
+    assert policy.seen == [0, 1, 2]
+    assert env.actions == [0, 1, 2]
+    assert (agent.env.get_out_port('observation').buffer == [3, 4]).all()
+    assert agent.env.done == 0
+
+    scheduler.step()
+    assert agent.env.done == 1
+
+def test_episode_runner():
+    env = CountingEnv(4)
+    runner = brica_gym.EpisodeRunner(
+        brica_gym.LockstepGymAgent(StepPolicy(), env, obs_dim=2))
+
+    episodes = runner.run(2)
+
+    assert len(episodes) == 2
+    for episode in episodes:
+        assert (episode['observation'][:, 0] == [0, 1, 2, 3]).all()
+        assert (episode['action'][:, 0] == [0, 1, 2, 0]).all()
+        assert (episode['reward'] == [0, 1, 2, 0]).all()
+        assert (episode['done'] == [False, False, False, True]).all()
+    assert env.actions == [0, 1, 2, 0] * 2
+
+def test_episode_runner_max_steps():
+    runner = brica_gym.EpisodeRunner(
+        brica_gym.LockstepGymAgent(StepPolicy(), CountingEnv(10), obs_dim=2),
+        max_steps=3)
+
+    episode = runner.run_episode()
+
+    assert len(episode['reward']) == 3
+    assert not episode['done'].any()
+
+class BalancePolicy(brica1.Component):
+    """ Pushes the cart towards the side the pole is falling to. """
+
+    def __init__(self):
+        super(BalancePolicy, self).__init__()
+        self.make_in_port('observation', 4)
+        self.make_in_port('reward', 1)
+        self.make_in_port('done', 1)
+        self.make_out_port('action', 1)
+
+    def fire(self):
+        observation = self.inputs['observation']
+        falling = observation[2] + 0.5 * observation[3]
+        self.results['action'] = np.array([1 if falling > 0 else 0])
+
+def test_cartpole_episode():
+    runner = brica_gym.EpisodeRunner(
+        brica_gym.LockstepGymAgent(BalancePolicy(), gym.make('CartPole-v1'),
+                                   obs_dim=4),
+        max_steps=1000)
+
+    episode = runner.run_episode()
+    steps = len(episode['reward'])
+
+    assert episode['observation'].shape == (steps, 4)
+    assert (episode['reward'] == 1).all()
+    assert episode['done'][-1] and not episode['done'][:-1].any()
+    # The lock-step agent acts on the current observation, so the pole is
+    # held until CartPole-v1 truncates the episode.
+    assert steps == 500
@@ -0,0 +1,102 @@
+"""
+Memory benchmark for large agents.
+
+Builds an agent of many small components, each having one in-port and one
+out-port connected to the previous component, and reports the memory
+allocated per port and per connection as measured by `tracemalloc`. Ports
+are compared against the unslotted `Port` of earlier releases, and the exit
+status is 1 if a `Port` is larger:
+
+    python tests/memory_benchmark.py --components 100000
+"""
+
+import sys, os
+import argparse
+import gc
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+import numpy as np
+import brica1
+
+
+class UnslottedPort(object):
+    """ The `Port` of earlier releases, keeping its buffer and callbacks in
+    the instance `__dict__`. """
+
+    def __init__(self, value):
+        self.buffer = value
+        self.callbacks = []
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return result, size
+
+
+def ports(num, port_class=brica1.Port):
+    buffer = np.zeros(1, dtype=np.float32)
+    return [port_class(buffer) for _ in range(num)]
+
+
+def connections(num):
+    buffer = np.zeros(1, dtype=np.float32)
+    pairs = [(brica1.Port(buffer), brica1.Port(buffer)) for _ in range(num)]
+    gc.collect()
+
+    def connect():
+        for from_port, to_port in pairs:
+            to_port.connect(from_port)
+
+    return measure(connect)[1]
+
+
+def agent(num):
+    agent = brica1.Agent()
+    upstream = None
+
+    for i in range(num):
+        component = brica1.NullComponent()
+        component.make_in_port('in', 1, dtype=np.float32)
+        component.make_out_port('out', 1, dtype=np.float32)
+        if upstream is not None:
+            brica1.connect((upstream, 'out'), (component, 'in'))
+        agent.add_component('comp{}'.format(i), component)
+        upstream = component
+
+    return agent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('--components', type=int, default=100000)
+    args = parser.parse_args()
+
+    num = args.components
+
+    _, size_port = measure(lambda: ports(num))
+    _, reference = measure(lambda: ports(num, UnslottedPort))
+    print("{:<30} {:>10.1f} bytes ({:+.0%} against unslotted)".format(
+        "Port", size_port / num, size_port / reference - 1))
+    print("{:<30} {:>10.1f} bytes".format("Unslotted Port", reference / num))
+
+    size = connections(num)
+    print("{:<30} {:>10.1f} bytes".format("Connection", size / num))
+
+    _, size = measure(lambda: agent(num))
+    print("{:<30} {:>10.1f} bytes".format("Component with 2 ports", size / num))
+
+    return 0 if size_port <= reference else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import brica1
+
+def test_order():
+    agent = brica1.Agent()
+    ModA = brica1.Module()
+    ModB = brica1.Module()
+
+    CompA = brica1.NullComponent()
+    CompB = brica1.NullComponent()
+    CompC = brica1.NullComponent()
+    CompD = brica1.NullComponent()
+
+    agent.add_component('CompA', CompA)
+    agent.add_submodule('ModA', ModA)
+    ModA.add_component('CompB', CompB)
+    ModA.add_submodule('ModB', ModB)
+    ModB.add_component('CompC', CompC)
+    agent.add_component('CompD', CompD)
+
+    assert agent.get_all_components() == [CompA, CompD, CompB, CompC]
+    assert agent.get_all_submodules() == [ModA, ModB]
+    assert [path for path, _ in agent.get_all_named_components()] == [
+        'CompA', 'CompD', 'ModA.CompB', 'ModA.ModB.CompC']
+
+def test_invalidation():
+    agent = brica1.Agent()
+    ModA = brica1.Module()
+    ModB = brica1.Module()
+
+    CompA = brica1.NullComponent()
+    CompB = brica1.NullComponent()
+
+    agent.add_submodule('ModA', ModA)
+    ModA.add_submodule('ModB', ModB)
+
+    assert agent.get_all_components() == []
+    assert agent.get_index() is agent.get_index()
+
+    ModB.add_component('CompA', CompA)
+    ModA.get_all_components()
+    ModB.add_component('CompB', CompB)
+
+    assert agent.get_all_components() == [CompA, CompB]
+
+    ModB.remove_component('CompA')
+
+    assert agent.get_all_components() == [CompB]
+
+    ModA.remove_submodule('ModB')
+
+    assert agent.get_all_components() == []
+    assert ModB.parents == []
+
+def test_copies():
+    agent = brica1.Agent()
+    CompA = brica1.NullComponent()
+    agent.add_component('CompA', CompA)
+
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+    scheduler.components.append(brica1.NullComponent())
+    agent.get_all_named_components().clear()
+    agent.get_all_submodules().append(brica1.Module())
+
+    assert agent.get_all_components() == [CompA]
+    assert agent.get_all_named_components() == [('CompA', CompA)]
+    assert agent.get_all_submodules() == []
@@ -0,0 +1,104 @@
+import sys, os
+import json
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import brica1
+
+def build():
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+
+    CompA = brica1.ConstantComponent()
+    CompB = brica1.NullComponent()
+
+    ModA = brica1.Module()
+    ModA.add_component('CompA', CompA)
+    ModA.add_component('CompB', CompB)
+
+    CompA.set_state('out', np.zeros(100, dtype=np.float32))
+    CompA.make_out_port('out', 100)
+    CompB.make_in_port('in', 100)
+    CompB.get_in_port('in').register_callback(lambda value: None)
+    brica1.connect((CompA, 'out'), (CompB, 'in'))
+
+    agent.add_submodule('ModA', ModA)
+    scheduler.update()
+    scheduler.compile()
+
+    return scheduler, CompA, CompB
+
+def test_profiler(tmpdir):
+    scheduler, CompA, CompB = build()
+    profiler = scheduler.enable_profiling(trace=True)
+
+    for _ in range(3):
+        scheduler.step()
+
+    assert scheduler.disable_profiling() is profiler
+
+    timings = profiler.timings
+    assert timings[('ModA.CompA', 'fire')][0] == 3
+    assert timings[('ModA.CompB', 'input')][0] == 3
+    assert timings[('ModA.CompB', 'callbacks')][0] == 3
+    assert timings[('scheduler', 'step')][0] == 3
+    assert profiler.port_bytes[('ModA.CompB', 'in', 'in')] == 2 * 400 + 200
+
+    assert 'ModA.CompA' in profiler.summary()
+
+    path = str(tmpdir.join('trace.json'))
+    profiler.export_chrome_trace(path)
+    with open(path) as f:
+        events = json.load(f)['traceEvents']
+    assert len(events) == len(
+        [e for e in events if e['ph'] == 'X' and e['dur'] >= 0])
+    assert any(e['name'] == 'ModA.CompA' and e['cat'] == 'fire'
+               for e in events)
+
+def test_detach():
+    scheduler, CompA, CompB = build()
+    callback = CompB.get_in_port('in').callbacks[0]
+
+    scheduler.enable_profiling()
+    scheduler.disable_profiling()
+
+    assert 'fire' not in CompA.__dict__
+    assert 'step' not in scheduler.__dict__
+    assert CompB.get_in_port('in').callbacks == [callback]
+
+def test_idle_bytes():
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+
+    CompA = brica1.ConstantComponent()
+    CompB = brica1.PipeComponent()
+
+    CompA.set_state('out', np.ones(100, dtype=np.float32))
+    CompA.make_out_port('out', 100, dtype=np.float32, fixed=True)
+    CompB.make_in_port('in', 100, dtype=np.float32, fixed=True)
+    CompB.make_out_port('out', 100, dtype=np.float32, fixed=True)
+    CompB.set_map('in', 'out')
+    CompB.fire_on_change = True
+    brica1.connect((CompA, 'out'), (CompB, 'in'))
+
+    agent.add_component('CompA', CompA)
+    agent.add_component('CompB', CompB)
+    scheduler.update()
+
+    profiler = scheduler.enable_profiling()
+
+    for _ in range(3):
+        scheduler.step()
+
+    # CompA outputs once, and CompB fires on the first two steps.
+    assert profiler.port_bytes == {
+        ('CompA', 'out', 'out'): 400,
+        ('CompB', 'in', 'in'): 2 * 400,
+        ('CompB', 'out', 'out'): 2 * 400,
+    }
+
+    profiler.port_bytes.clear()
+    scheduler.step()
+
+    assert not any(profiler.port_bytes.values())
@@ -0,0 +1,90 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import pytest
+import brica1
+
+class FakeClock(object):
+    """ A clock in nanoseconds which only advances when told to. """
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, milliseconds):
+        self.now += int(milliseconds * 1000000)
+
+    def sleep(self, seconds):
+        self.now += int(seconds * 1000000000)
+
+class SleepingComponent(brica1.Component):
+    def __init__(self, clock, durations):
+        super(SleepingComponent, self).__init__()
+        self.clock = clock
+        self.durations = list(durations)
+
+    def fire(self):
+        if self.durations:
+            self.clock.advance(self.durations.pop(0))
+
+def build(durations, **kwargs):
+    clock = FakeClock()
+    agent = brica1.Agent()
+    agent.add_component('CompA', SleepingComponent(clock, durations))
+    return brica1.RealTimeSyncScheduler(agent, clock=clock, sleep=clock.sleep,
+                                        **kwargs)
+
+def test_no_drift():
+    scheduler = build([3] * 20, interval=10)
+
+    for _ in range(20):
+        current_time = scheduler.step()
+
+    # Outputs are scheduled at absolute deadlines, so the time spent in
+    # fire() does not accumulate.
+    assert current_time == 200
+    assert scheduler.overruns == 0
+    assert scheduler.get_statistics()['steps'] == 20
+
+def test_catch_up():
+    scheduler = build([35], interval=10)
+
+    times = [scheduler.step() for _ in range(5)]
+
+    # The missed deadlines at 20 and 30 are kept, so the steps run back to
+    # back until the deadline at 40 is in the future again.
+    assert times == [35, 35, 35, 40, 50]
+    assert scheduler.overruns == 3
+    assert scheduler.skipped == 0
+    assert scheduler.max_lag == 25
+
+def test_skip():
+    scheduler = build([35], interval=10, overrun=brica1.OVERRUN_SKIP)
+
+    times = [scheduler.step() for _ in range(3)]
+
+    # The deadlines at 20 and 30 are dropped.
+    assert times == [35, 40, 50]
+    assert scheduler.overruns == 1
+    assert scheduler.skipped == 2
+
+def test_reset():
+    scheduler = build([], interval=10)
+
+    for _ in range(5):
+        scheduler.step()
+
+    scheduler.reset()
+    scheduler.update()
+    scheduler.set_interval(10)
+
+    # The time continues, so components do not see it going back.
+    assert scheduler.step() == 60
+    assert scheduler.get_statistics()['steps'] == 1
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        build([], overrun='unknown')
@@ -0,0 +1,107 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import brica1
+
+class AccumulatorComponent(brica1.Component):
+    def __init__(self):
+        super(AccumulatorComponent, self).__init__()
+        self.make_in_port('in', 3, dtype=np.float32)
+        self.make_out_port('out', 3, dtype=np.float32, fixed=True)
+        self.set_state('total', np.zeros(3, dtype=np.float32))
+        self.set_state('count', 0)
+
+    def fire(self):
+        total = self.states['total']
+        total += self.inputs['in'] + 1
+        self.states['count'] += 1
+        self.results['out'] = total
+
+def build(scheduler_class):
+    agent = brica1.Agent()
+    module = brica1.Module()
+    agent.add_submodule('module', module)
+
+    first = AccumulatorComponent()
+    second = AccumulatorComponent()
+    second.interval = 2000
+    module.add_component('first', first)
+    module.add_component('second', second)
+    brica1.connect((first, 'out'), (second, 'in'))
+
+    scheduler = scheduler_class(agent)
+    scheduler.update()
+    return agent, scheduler, first, second
+
+def run(scheduler, steps):
+    for _ in range(steps):
+        scheduler.step()
+
+def test_restore(tmpdir):
+    path = str(tmpdir.join('agent.snapshot'))
+
+    agent, scheduler, first, second = build(brica1.VirtualTimeSyncScheduler)
+    run(scheduler, 5)
+    agent.snapshot(path, scheduler)
+    run(scheduler, 5)
+
+    expected = (scheduler.current_time, second.get_state('total').copy(),
+                second.get_state('count'))
+
+    agent.restore(path, scheduler)
+    assert scheduler.current_time == 5
+    assert first.get_state('count') == 5
+    run(scheduler, 5)
+
+    assert scheduler.current_time == expected[0]
+    assert (second.get_state('total') == expected[1]).all()
+    assert second.get_state('count') == expected[2]
+
+    # A freshly built agent continues from the snapshot as well.
+    fork, fork_scheduler, _, fork_second = build(
+        brica1.VirtualTimeSyncScheduler)
+    fork.restore(path, fork_scheduler)
+    run(fork_scheduler, 5)
+
+    assert (fork_second.get_state('total') == expected[1]).all()
+    assert fork_second.get_out_port('out').buffer is not \
+        second.get_out_port('out').buffer
+
+def test_calendar(tmpdir):
+    path = str(tmpdir.join('agent.snapshot'))
+
+    agent, scheduler, first, second = build(brica1.VirtualTimeScheduler)
+    run(scheduler, 7)
+    agent.snapshot(path, scheduler)
+    run(scheduler, 7)
+    expected = (scheduler.current_time, second.get_state('total').copy())
+
+    fork, fork_scheduler, _, fork_second = build(brica1.VirtualTimeScheduler)
+    fork.restore(path, fork_scheduler)
+    run(fork_scheduler, 7)
+
+    assert fork_scheduler.current_time == expected[0]
+    assert (fork_second.get_state('total') == expected[1]).all()
+
+def test_shared_arrays(tmpdir):
+    path = str(tmpdir.join('agent.snapshot'))
+
+    agent, scheduler, first, second = build(brica1.VirtualTimeSyncScheduler)
+    data = np.arange(1000, dtype=np.float64)
+    first.set_state('a', data, move=True)
+    first.set_state('b', data, move=True)
+    agent.snapshot(path)
+
+    size = os.path.getsize(path)
+    assert data.nbytes < size < 2 * data.nbytes
+
+    agent.restore(path)
+    assert first.get_state('a') is first.get_state('b')
+    assert (first.get_state('a') == data).all()
+
+    first.get_state('a')[0] = -1
+    fork, _, fork_first, _ = build(brica1.VirtualTimeSyncScheduler)
+    fork.restore(path)
+    assert fork_first.get_state('a')[0] == 0
@@ -0,0 +1,85 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import brica1
+
+class LeakyArray(brica1.ComponentArray):
+    def __init__(self, size):
+        super(LeakyArray, self).__init__(size)
+        self.fires = 0
+        self.make_in_port('in', 2, dtype=np.float32)
+        self.make_out_port('out', 2, dtype=np.float32)
+        self.set_state('v', np.zeros((size, 2), dtype=np.float32))
+
+    def fire(self):
+        self.fires += 1
+        v = self.states['v']
+        v *= 0.5
+        v += self.inputs['in']
+        self.results['out'] = v
+
+def constant(agent, name, value):
+    component = brica1.ConstantComponent()
+    component.set_state('out', np.asarray(value, dtype=np.float32))
+    component.make_out_port('out', 2, dtype=np.float32)
+    agent.add_component(name, component)
+    return component
+
+def test_rows():
+    agent = brica1.Agent()
+    array = LeakyArray(4)
+    agent.add_component('array', array)
+
+    sources = [constant(agent, 'source{}'.format(i), [i, -i])
+               for i in range(4)]
+    for i, source in enumerate(sources):
+        brica1.connect((source, 'out'), (array[i], 'in'))
+
+    sink = brica1.NullComponent()
+    sink.make_in_port('in', 2, dtype=np.float32)
+    brica1.connect((array[2], 'out'), (sink, 'in'))
+    agent.add_component('sink', sink)
+
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+    scheduler.update()
+
+    for _ in range(4):
+        scheduler.step()
+
+    assert array.fires == 4
+    assert array.get_input('in').shape == (4, 2)
+    assert (array.get_input('in')[:, 0] == np.arange(4)).all()
+
+    # Inputs arrive on step 2, so v went 0, 2, 3, 3.5 for the third instance.
+    assert array[2].get_state('v')[0] == 3.5
+    assert (sink.get_input('in') == [3.0, -3.0]).all()
+    assert len(array) == 4
+
+def test_whole():
+    agent = brica1.Agent()
+    first = LeakyArray(3)
+    second = LeakyArray(3)
+    agent.add_component('first', first)
+    agent.add_component('second', second)
+
+    source = brica1.ConstantComponent()
+    source.set_state('out', np.ones((3, 2), dtype=np.float32))
+    source.make_out_port('out', shape=(3, 2), dtype=np.float32)
+    agent.add_component('source', source)
+
+    brica1.connect((source, 'out'), (first, 'in'))
+    brica1.connect((first, 'out'), (second, 'in'))
+
+    scheduler = brica1.TopologicalSyncScheduler(agent)
+    scheduler.update()
+
+    assert scheduler.order == [source, first, second]
+
+    scheduler.step()
+    scheduler.step()
+
+    assert (first.get_out_port('out').buffer == 1.5).all()
+    assert (second.get_out_port('out').buffer == 2.0).all()
+    assert (first[1].get_out_port('out').buffer == 1.5).all()
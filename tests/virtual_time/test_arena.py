@@ -0,0 +1,134 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pytest
+import brica1
+
+class Counter(brica1.Component):
+    def fire(self):
+        self.results['out'] = self.inputs['in'] + 1
+
+def build(pack, compile, delivery=brica1.DELIVERY_COPY):
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+
+    source = brica1.ConstantComponent()
+    source.set_state('out', np.arange(3, dtype=np.float32))
+    source.make_out_port('out', 3, dtype=np.float32, fixed=True)
+    agent.add_component('source', source)
+
+    upstream = source
+    for i in range(4):
+        component = Counter()
+        component.make_in_port('in', 3, dtype=np.float32, fixed=True,
+                               delivery=delivery)
+        component.make_out_port('out', 3, dtype=np.float32, fixed=True)
+        brica1.connect((upstream, 'out'), (component, 'in'))
+        agent.add_component('counter{}'.format(i), component)
+        upstream = component
+
+    # Not packed: the ports are not fixed.
+    sink = brica1.NullComponent()
+    sink.make_in_port('in', 3, dtype=np.float32)
+    brica1.connect((upstream, 'out'), (sink, 'in'))
+    agent.add_component('sink', sink)
+
+    scheduler.update()
+
+    if compile:
+        scheduler.compile()
+    if pack:
+        scheduler.pack()
+
+    return scheduler, sink
+
+@pytest.mark.parametrize('compile', [False, True])
+@pytest.mark.parametrize('delivery', [brica1.DELIVERY_COPY,
+                                      brica1.DELIVERY_VIEW])
+def test_arena(compile, delivery):
+    expected, expected_sink = build(False, compile, delivery)
+    actual, actual_sink = build(True, compile, delivery)
+
+    arena = actual.arena
+    assert len(arena.links) == 4
+    assert len(arena.groups) == 1
+    assert all(type(port.buffer.base) is np.ndarray for port in arena.ports)
+
+    for _ in range(6):
+        expected.step()
+        actual.step()
+        assert (expected_sink.get_input('in') ==
+                actual_sink.get_input('in')).all()
+
+    assert (actual_sink.get_input('in') == [4, 5, 6]).all()
+
+    ports = list(arena.ports)
+    actual.unpack()
+    assert actual.arena is None
+    assert all(port.buffer.base is None for port in ports)
+
+    for _ in range(2):
+        expected.step()
+        actual.step()
+        assert (expected_sink.get_input('in') ==
+                actual_sink.get_input('in')).all()
+
+def test_arena_exclusions():
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+
+    source = brica1.ConstantComponent()
+    source.make_out_port('out', 3, dtype=np.float32, fixed=True)
+    agent.add_component('source', source)
+
+    for name, kwargs in (('cast', {'dtype': np.float64, 'fixed': True}),
+                         ('loose', {'dtype': np.float32})):
+        component = brica1.NullComponent()
+        component.make_in_port('in', 3, **kwargs)
+        brica1.connect((source, 'out'), (component, 'in'))
+        agent.add_component(name, component)
+
+    changes = brica1.NullComponent()
+    changes.fire_on_change = True
+    changes.make_in_port('in', 3, dtype=np.float32, fixed=True)
+    brica1.connect((source, 'out'), (changes, 'in'))
+    agent.add_component('changes', changes)
+
+    scheduler.update()
+    arena = scheduler.pack()
+
+    assert arena.links == []
+    assert arena.groups == []
+    assert type(changes.get_in_port('in').connection) is brica1.Connection
+
+def test_arena_fan_out():
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+
+    source = Counter()
+    source.make_in_port('in', 2, dtype=np.int64, fixed=True)
+    source.make_out_port('out', 2, dtype=np.int64, fixed=True)
+    agent.add_component('source', source)
+
+    sinks = []
+    for i in range(3):
+        sink = brica1.NullComponent()
+        sink.make_in_port('in', 2, dtype=np.int64, fixed=True)
+        brica1.connect((source, 'out'), (sink, 'in'))
+        agent.add_component('sink{}'.format(i), sink)
+        sinks.append(sink)
+
+    brica1.connect((source, 'out'), (source, 'in'))
+    scheduler.update()
+    arena = scheduler.pack()
+
+    sources, index, targets = arena.groups[0]
+    assert type(index) is np.ndarray
+    assert targets.size == 8
+
+    for _ in range(3):
+        scheduler.step()
+
+    assert all((sink.get_input('in') == [2, 2]).all() for sink in sinks)
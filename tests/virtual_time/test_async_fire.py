@@ -0,0 +1,90 @@
+import sys, os
+import asyncio
+import time
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pytest
+import brica1
+
+class WaitingComponent(brica1.AsyncComponent):
+    def __init__(self):
+        super(WaitingComponent, self).__init__()
+        self.make_in_port('in', 1)
+        self.make_out_port('out', 1)
+
+    async def fire(self):
+        await asyncio.sleep(0.05)
+        self.results['out'] = self.inputs['in'] + 1
+
+def build():
+    agent = brica1.Agent()
+    components = [WaitingComponent() for _ in range(10)]
+    source = brica1.ConstantComponent()
+    source.set_state('out', np.array([1]))
+    source.make_out_port('out', 1)
+
+    agent.add_component('source', source)
+    for i, component in enumerate(components):
+        agent.add_component('Comp{}'.format(i), component)
+
+    brica1.connect((source, 'out'), (components[0], 'in'))
+    for upstream, downstream in zip(components, components[1:]):
+        brica1.connect((upstream, 'out'), (downstream, 'in'))
+
+    return brica1.AsyncScheduler(agent), components
+
+def test_step():
+    scheduler, components = build()
+
+    start = time.perf_counter()
+    for _ in range(3):
+        scheduler.step()
+    spent = time.perf_counter() - start
+    scheduler.close()
+
+    # The fire() of all ten components is awaited concurrently.
+    assert spent < 0.5
+    assert components[0].get_out_port('out').buffer[0] == 2
+    assert components[1].get_out_port('out').buffer[0] == 3
+    assert components[2].get_out_port('out').buffer[0] == 3
+    assert components[-1].get_out_port('out').buffer[0] == 3
+
+def test_astep():
+    scheduler, components = build()
+
+    async def run():
+        for _ in range(2):
+            await scheduler.astep()
+
+    asyncio.run(run())
+
+    assert scheduler.current_time == 2
+    assert components[1].get_out_port('out').buffer[0] == 2
+
+@pytest.mark.parametrize('scheduler_class', [
+    brica1.VirtualTimeSyncScheduler,
+    brica1.TopologicalSyncScheduler,
+    brica1.VirtualTimeScheduler,
+    brica1.RealTimeSyncScheduler,
+])
+def test_sync_scheduler_rejects(scheduler_class):
+    agent = brica1.Agent()
+    agent.add_component('Comp', WaitingComponent())
+
+    with pytest.raises(TypeError):
+        scheduler_class(agent)
+
+    agent = brica1.Agent()
+    scheduler = scheduler_class(agent)
+    agent.add_component('Comp', WaitingComponent())
+
+    with pytest.raises(TypeError):
+        scheduler.update()
+
+def test_component_set_rejects():
+    components = brica1.ComponentSet()
+
+    with pytest.raises(TypeError):
+        components.add_component('Comp', WaitingComponent(), 0)
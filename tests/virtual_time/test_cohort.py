@@ -0,0 +1,46 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import brica1
+
+class CountingComponent(brica1.Component):
+    def __init__(self):
+        super(CountingComponent, self).__init__()
+        self.fires = 0
+        self.outputs = 0
+
+    def fire(self):
+        self.fires += 1
+
+    def output(self, time):
+        super(CountingComponent, self).output(time)
+        self.outputs += 1
+
+def test_cohort():
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeScheduler(agent)
+
+    fast = [CountingComponent() for _ in range(10)]
+    slow = [CountingComponent() for _ in range(10)]
+
+    for i, component in enumerate(fast):
+        component.interval = 100
+        agent.add_component('fast{}'.format(i), component)
+
+    for i, component in enumerate(slow):
+        component.interval = 300
+        agent.add_component('slow{}'.format(i), component)
+
+    scheduler.update()
+    scheduler.update()
+
+    assert len(scheduler.calendar[0]) == 2
+    assert len(scheduler.times) == 1
+
+    scheduler.step(900)
+
+    assert [c.fires for c in fast] == [10] * 10
+    assert [c.fires for c in slow] == [4] * 10
+    assert [c.outputs for c in fast] == [9] * 10
+    assert [c.outputs for c in slow] == [3] * 10
@@ -0,0 +1,74 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import brica1
+
+class CountingComponent(brica1.Component):
+    def __init__(self):
+        super(CountingComponent, self).__init__()
+        self.trained = 0
+
+    def train(self):
+        self.trained += 1
+
+    def fire(self):
+        self.results['out'] = self.inputs['in'] * 2
+
+def build(compile):
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeSyncScheduler(agent)
+
+    data = np.array([1, 2, 3], dtype=np.short)
+    received = []
+
+    CompA = brica1.ConstantComponent()
+    CompB = CountingComponent()
+    CompC = brica1.component.FunctorComponent(lambda inputs: {'out': inputs['in'] + 1})
+    CompD = brica1.NullComponent()
+
+    ModA = brica1.Module()
+    ModA.add_component('CompA', CompA)
+    ModA.add_component('CompB', CompB)
+    ModA.add_component('CompC', CompC)
+    ModA.add_component('CompD', CompD)
+
+    CompA.set_state('out', data)
+    CompA.make_out_port('out', 3)
+    CompB.make_in_port('in', 3)
+    CompB.make_out_port('out', 3)
+    CompC.make_in_port('in', 3)
+    CompC.make_out_port('out', 3)
+    CompD.make_in_port('in', 3)
+    CompD.get_in_port('in').register_callback(
+        lambda value: received.append(value.copy()))
+
+    brica1.connect((CompA, 'out'), (CompB, 'in'))
+    brica1.connect((CompB, 'out'), (CompC, 'in'))
+    brica1.connect((CompC, 'out'), (CompD, 'in'))
+
+    agent.add_submodule('ModA', ModA)
+    scheduler.update()
+
+    if compile:
+        scheduler.compile()
+
+    return scheduler, CompB, CompD, received
+
+def test_compiled():
+    expected, expected_b, expected_d, expected_received = build(False)
+    actual, actual_b, actual_d, actual_received = build(True)
+
+    for _ in range(5):
+        assert expected.step() == actual.step()
+        assert (expected_d.get_input('in') == actual_d.get_input('in')).all()
+        assert actual_d.last_input_time == expected_d.last_input_time
+        assert actual_d.last_output_time == expected_d.last_output_time
+
+    assert (actual_d.get_input('in') == [3, 5, 7]).all()
+    assert actual_b.trained == expected_b.trained == 5
+    assert len(actual_received) == len(expected_received) == 5
+
+    for a, b in zip(actual_received, expected_received):
+        assert (a == b).all()
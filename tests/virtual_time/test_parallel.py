@@ -0,0 +1,74 @@
+import sys, os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pytest
+import brica1
+
+class BarrierComponent(brica1.Component):
+    """ Fires only if all components fire concurrently. """
+
+    def __init__(self, barrier):
+        super(BarrierComponent, self).__init__()
+        self.barrier = barrier
+        self.make_in_port('in', 1)
+        self.make_out_port('out', 1)
+
+    def fire(self):
+        self.barrier.wait(timeout=5)
+        self.results['out'] = self.inputs['in'] + 1
+
+class FailingComponent(brica1.Component):
+    def fire(self):
+        raise RuntimeError("failed")
+
+def build(num_components, barrier):
+    agent = brica1.Agent()
+    components = [BarrierComponent(barrier) for _ in range(num_components)]
+
+    for i, component in enumerate(components):
+        agent.add_component('Comp{}'.format(i), component)
+
+    for upstream, downstream in zip(components, components[1:]):
+        brica1.connect((upstream, 'out'), (downstream, 'in'))
+
+    return agent, components
+
+@pytest.mark.parametrize('compile', [False, True])
+def test_parallel(compile):
+    barrier = threading.Barrier(4)
+    agent, components = build(4, barrier)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        scheduler = brica1.VirtualTimeSyncScheduler(agent, executor=executor)
+        if compile:
+            scheduler.compile()
+
+        for _ in range(4):
+            scheduler.step()
+
+    assert [c.get_out_port('out').buffer[0] for c in components] == [
+        1, 2, 3, 4]
+
+def test_owned_executor():
+    barrier = threading.Barrier(2)
+    agent, components = build(2, barrier)
+
+    scheduler = brica1.VirtualTimeSyncScheduler(agent, executor=2)
+    scheduler.step()
+    scheduler.close()
+
+    assert scheduler.executor is None
+
+def test_exception():
+    agent = brica1.Agent()
+    agent.add_component('CompA', FailingComponent())
+    scheduler = brica1.VirtualTimeSyncScheduler(agent, executor=2)
+
+    with pytest.raises(RuntimeError):
+        scheduler.step()
+
+    scheduler.close()
@@ -0,0 +1,88 @@
+import sys, os
+
+sys.path.append(os.getcwd())
+
+import numpy as np
+import pytest
+import brica1
+
+class AccumulatorComponent(brica1.Component):
+    def fire(self):
+        self.results['out'] = self.inputs['in'] + self.inputs['feedback']
+
+def test_chain():
+    agent = brica1.Agent()
+    data = np.array([1, 2, 3], dtype=np.short)
+
+    source = brica1.ConstantComponent()
+    source.set_state('out', data)
+    source.make_out_port('out', 3)
+
+    stages = []
+    for i in range(20):
+        stage = brica1.PipeComponent()
+        stage.make_in_port('in', 3)
+        stage.make_out_port('out', 3)
+        stage.set_map('in', 'out')
+        stages.append(stage)
+
+    # Add the stages in reverse so that the insertion order is not the order
+    # of the dependencies.
+    for i, stage in reversed(list(enumerate(stages))):
+        agent.add_component('stage{}'.format(i), stage)
+    agent.add_component('source', source)
+
+    brica1.connect((source, 'out'), (stages[0], 'in'))
+    for upstream, downstream in zip(stages, stages[1:]):
+        brica1.connect((upstream, 'out'), (downstream, 'in'))
+
+    scheduler = brica1.TopologicalSyncScheduler(agent)
+
+    assert scheduler.order[0] is source
+    assert scheduler.step() == 1
+    assert (stages[-1].get_out_port('out').buffer == data).all()
+
+def test_delay():
+    agent = brica1.Agent()
+
+    source = brica1.ConstantComponent()
+    source.set_state('out', np.array([1]))
+    source.make_out_port('out', 1)
+
+    acc = AccumulatorComponent()
+    acc.make_in_port('in', 1)
+    acc.make_in_port('feedback', 1)
+    acc.make_out_port('out', 1)
+
+    agent.add_component('acc', acc)
+    agent.add_component('source', source)
+
+    brica1.connect((source, 'out'), (acc, 'in'))
+    brica1.connect((acc, 'out'), (acc, 'feedback'), delay=True)
+
+    scheduler = brica1.TopologicalSyncScheduler(agent)
+
+    for i in range(5):
+        scheduler.step()
+        assert acc.get_out_port('out').buffer[0] == i + 1
+
+    assert not acc.get_in_port('feedback').connection.latched
+
+def test_cycle():
+    agent = brica1.Agent()
+
+    CompA = brica1.PipeComponent()
+    CompB = brica1.PipeComponent()
+
+    for comp in (CompA, CompB):
+        comp.make_in_port('in', 1)
+        comp.make_out_port('out', 1)
+
+    agent.add_component('CompA', CompA)
+    agent.add_component('CompB', CompB)
+
+    brica1.connect((CompA, 'out'), (CompB, 'in'))
+    brica1.connect((CompB, 'out'), (CompA, 'in'))
+
+    with pytest.raises(ValueError):
+        brica1.TopologicalSyncScheduler(agent)
@@ -0,0 +1,57 @@
+import sys, os
+import random
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + "/..")
+
+import brica1
+
+INTERVALS = (10, 20, 25, 50, 100, 125, 200, 250, 500, 1000)
+DURATION = 10000
+
+
+class CountingComponent(brica1.Component):
+    fires = 0
+
+    def fire(self):
+        CountingComponent.fires += 1
+
+
+def build(num_components, aligned, seed=0):
+    rng = random.Random(seed)
+    agent = brica1.Agent()
+    scheduler = brica1.VirtualTimeScheduler(agent)
+
+    for i in range(num_components):
+        component = CountingComponent()
+        component.interval = rng.choice(INTERVALS)
+        if not aligned:
+            component.offset = rng.randrange(component.interval)
+            component.sleep = rng.randrange(component.interval)
+        agent.add_component('comp{}'.format(i), component)
+
+    scheduler.update()
+
+    return scheduler
+
+
+def measure(num_components, aligned):
+    scheduler = build(num_components, aligned)
+    CountingComponent.fires = 0
+
+    start = time.perf_counter()
+    scheduler.step(DURATION)
+    spent = time.perf_counter() - start
+
+    # Every fire is preceded by a 'sleep' event and followed by a 'fire'
+    # event, so two events are processed per fire.
+    return 2 * CountingComponent.fires / spent
+
+
+if __name__ == '__main__':
+    for aligned in (False, True):
+        for num_components in (1000, 4000, 16000):
+            print("{:>6} components ({}): {:12,.0f} events/s".format(
+                num_components,
+                "aligned clocks" if aligned else "random offsets",
+                measure(num_components, aligned)))